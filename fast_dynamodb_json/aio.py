@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""
+asyncio API, the polars work runs in a thread executor so it doesn't block
+the event loop. See :func:`adeserialize` and :func:`adeserialize_pages`.
+"""
+
+import typing as T
+import asyncio
+import functools
+from concurrent.futures import Executor
+
+from .typehint import T_ITEM, T_SIMPLE_SCHEMA
+from .compiled import CompiledSchema, compile_schema
+from .deserialize import deserialize
+from .output import OutputEnum
+
+
+async def adeserialize(
+    records: T.Iterable[T_ITEM],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    paths: T.Optional[T.Iterable[str]] = None,
+    output: str = OutputEnum.dicts,
+    presence_col: T.Optional[str] = None,
+    executor: T.Optional[Executor] = None,
+):
+    """
+    The async version of :func:`~fast_dynamodb_json.deserialize.deserialize`,
+    it runs in ``executor`` (the default executor of the event loop if None).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor,
+        functools.partial(
+            deserialize,
+            records=list(records),
+            simple_schema=compile_schema(simple_schema),
+            paths=paths,
+            output=output,
+            presence_col=presence_col,
+        ),
+    )
+
+
+async def adeserialize_pages(
+    pages: T.AsyncIterable[T.Dict[str, T.Any]],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    target_rows: int = 10000,
+    paths: T.Optional[T.Iterable[str]] = None,
+    output: str = OutputEnum.dicts,
+    executor: T.Optional[Executor] = None,
+) -> T.AsyncIterator[T.Any]:
+    """
+    Consume the pages of an async ``Scan`` or ``Query`` paginator, for
+    example the one of aiobotocore, accumulate the ``Items`` of the pages
+    until there are at least ``target_rows`` items, and yield the result of
+    deserializing each batch. Example::
+
+        paginator = client.get_paginator("scan")
+        async for df in adeserialize_pages(
+            paginator.paginate(TableName="my-table"),
+            simple_schema,
+            output="polars",
+        ):
+            ...
+
+    A batch is deserialized in ``executor`` while the next pages are being
+    fetched, so the network IO overlaps with the polars work and the event
+    loop is never blocked by it.
+
+    :param pages: Async iterable of the page dict, each has an ``Items`` key.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param target_rows: Min number of items per batch, except the last one.
+    :param paths: see :func:`~fast_dynamodb_json.deserialize.deserialize`.
+    :param output: see :func:`~fast_dynamodb_json.deserialize.deserialize`,
+        the output type of each batch.
+    :param executor: The executor to run the polars work, the default
+        executor of the event loop if None.
+    """
+    loop = asyncio.get_running_loop()
+    compiled_schema = compile_schema(simple_schema)
+    if paths is not None:
+        paths = tuple(paths)
+
+    def submit(items: T.List[T_ITEM]) -> asyncio.Future:
+        return loop.run_in_executor(
+            executor,
+            functools.partial(
+                deserialize,
+                records=items,
+                simple_schema=compiled_schema,
+                paths=paths,
+                output=output,
+            ),
+        )
+
+    pending = None
+    items = list()
+    async for page in pages:
+        items.extend(page.get("Items", []))
+        if len(items) >= target_rows:
+            future = submit(items)
+            items = list()
+            if pending is not None:
+                yield await pending
+            pending = future
+    if items:
+        future = submit(items)
+        if pending is not None:
+            yield await pending
+        pending = future
+    if pending is not None:
+        yield await pending
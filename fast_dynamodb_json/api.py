@@ -20,7 +20,51 @@ from .schema import Null
 from .schema import Set
 from .schema import List
 from .schema import Struct
+from .schema import select_paths
+from .compiled import CompiledSchema
+from .compiled import compile_schema
+from .infer import infer_schema
+from .infer import infer_schema_from_items
 from .deserialize import deserialize
 from .deserialize import deserialize_df
+from .deserialize import deserialize_lazy
 from .serialize import serialize
 from .serialize import serialize_df
+from .serialize import serialize_lazy
+from .export import ExportDataFile
+from .export import ExportManifest
+from .export import read_dynamodb_export
+from .export import read_incremental_export
+from .export import compact_incremental_export
+from .stream import deserialize_stream_records
+from .stream import deserialize_stream_df
+from .stream import deserialize_kinesis_records
+from .deserialize import deserialize_to_arrow
+from .serialize import serialize_to_arrow
+from .deserialize import iter_deserialize
+from .serialize import iter_serialize
+from .serialize import serialize_to_ndjson
+from .size import get_item_size_selector
+from .batch import BatchWriteRequests
+from .batch import build_batch_write_requests
+from .size import get_capacity_unit_selectors
+from .size import item_size
+from .serialize import NullPolicyEnum
+from .serialize import to_dicts
+from .deserialize import PresenceEnum
+from .deserialize import get_presence_selector
+from .parallel import deserialize_parallel
+from .pipeline import Stage
+from .pipeline import run_pipeline
+from .pipeline import deserialize_files
+from .aio import adeserialize
+from .aio import adeserialize_pages
+from .pages import PageBatch
+from .pages import deserialize_pages
+from .scan import SegmentMetrics
+from .scan import ParallelScanResult
+from .scan import iter_scan_pages
+from .scan import parallel_scan
+from .bulk import TokenBucket
+from .bulk import BulkWriteStats
+from .bulk import BulkWriter
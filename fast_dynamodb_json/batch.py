@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+"""
+Build the `BatchWriteItem <https://docs.aws.amazon.com/amazondynamodb/latest/APIReference/API_BatchWriteItem.html>`_
+requests from regular Python dict data. See :func:`build_batch_write_requests`
+for more details.
+"""
+
+import json
+import typing as T
+import dataclasses
+
+import polars as pl
+
+from .typehint import T_ITEM, T_JSON, T_SIMPLE_SCHEMA
+from .compiled import CompiledSchema, compile_schema
+from .serialize import NullPolicyEnum, serialize, serialize_df, to_dicts
+from .size import WCU_UNIT, get_item_size_selector
+from .export import get_key_schema
+
+MAX_ITEMS_PER_REQUEST = 25
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+MAX_ITEM_SIZE = 400 * 1024
+
+
+@dataclasses.dataclass
+class BatchWriteRequests:
+    """
+    The result of :func:`build_batch_write_requests`.
+
+    :param requests: List of the keyword arguments of
+        ``boto3.client("dynamodb").batch_write_item``, each has at most
+        ``MAX_ITEMS_PER_REQUEST`` put / delete requests and at most
+        ``MAX_REQUEST_SIZE`` bytes of items.
+    :param oversized_items: The DynamoDB JSON items larger than
+        ``MAX_ITEM_SIZE``, they are not in any request.
+    :param wcus: The estimated write capacity units of each request, the
+        sum of the WCU of its items. A delete is estimated by the size of
+        the key, because the size of the deleted item is unknown.
+    """
+
+    requests: T.List[T.Dict[str, T.Any]] = dataclasses.field(default_factory=list)
+    oversized_items: T.List[T_JSON] = dataclasses.field(default_factory=list)
+    wcus: T.List[int] = dataclasses.field(default_factory=list)
+
+
+def _serialize_with_size(
+    records_or_df: T.Union[T.Iterable[T_ITEM], pl.DataFrame],
+    compiled_schema: CompiledSchema,
+    data_col: str,
+    null_policy: str,
+) -> T.Tuple[T.List[T_JSON], T.List[int]]:
+    if isinstance(records_or_df, pl.DataFrame):
+        df = serialize_df(
+            df=records_or_df.select(data_col),
+            simple_schema=compiled_schema,
+            data_col=data_col,
+            null_policy=null_policy,
+        )
+    else:
+        df = serialize(
+            records_or_df,
+            compiled_schema,
+            output="polars",
+            null_policy=null_policy,
+        )
+    sizes = df.select(
+        get_item_size_selector(compiled_schema, null_policy=null_policy)
+    )
+    return to_dicts(df, null_policy), sizes.to_series().to_list()
+
+
+def _get_key(
+    entry: T.Dict[str, T.Any],
+    key_attributes: T.Sequence[str],
+) -> str:
+    if "PutRequest" in entry:
+        item = entry["PutRequest"]["Item"]
+    else:
+        item = entry["DeleteRequest"]["Key"]
+    return json.dumps([item.get(name) for name in key_attributes], sort_keys=True)
+
+
+def _dedupe_entries(
+    entries: T.List[T.Tuple[T.Dict[str, T.Any], int]],
+    key_attributes: T.Sequence[str],
+) -> T.List[T.Tuple[T.Dict[str, T.Any], int]]:
+    """
+    Keep the last put / delete request of each primary key, in the original
+    order.
+    """
+    last = {_get_key(entry, key_attributes): i for i, (entry, _) in enumerate(entries)}
+    if len(last) == len(entries):
+        return entries
+    keep = set(last.values())
+    return [entry for i, entry in enumerate(entries) if i in keep]
+
+
+def build_batch_write_requests(
+    records_or_df: T.Union[T.Iterable[T_ITEM], pl.DataFrame],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    table_name: str,
+    deletes: T.Optional[T.Union[T.Iterable[T_ITEM], pl.DataFrame]] = None,
+    key_attributes: T.Optional[T.Sequence[str]] = None,
+    data_col: str = "Data",
+    null_policy: str = NullPolicyEnum.default,
+) -> BatchWriteRequests:
+    """
+    Serialize the data once, compute the DynamoDB item size of each item
+    with polars expressions (see :mod:`fast_dynamodb_json.size`), then pack
+    the items into ``BatchWriteItem`` requests that respect the limits of
+    25 items and 16MB per request. Items larger than 400KB can't be written,
+    they are returned in ``oversized_items`` instead. Example::
+
+        res = build_batch_write_requests(records, simple_schema, "my-table")
+        for kwargs in res.requests:
+            dynamodb_client.batch_write_item(**kwargs)
+
+    :param records_or_df: List of regular Python dict data to put, or a
+        polars DataFrame with a column of it, see
+        :func:`~fast_dynamodb_json.serialize.serialize_df`.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param table_name: The DynamoDB table name.
+    :param deletes: List of the primary keys (regular Python dict) to delete,
+        or a polars DataFrame with a column of it.
+    :param key_attributes: The name of the partition key and the sort key
+        (if any) of the table, required if ``deletes`` is given. If it is
+        given, only the last put / delete of each primary key is kept,
+        because DynamoDB rejects a request that has the same key twice.
+        The deletes come after the puts.
+    :param data_col: Name of the column that contains regular Python dict
+        data, only used if the input is a DataFrame.
+    :param null_policy: How to serialize a null attribute, see
+        :class:`~fast_dynamodb_json.serialize.NullPolicyEnum`. ``"omit"``
+        also makes the items smaller.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    entries = list()
+    oversized_items = list()
+    items, sizes = _serialize_with_size(
+        records_or_df, compiled_schema, data_col, null_policy
+    )
+    for item, size in zip(items, sizes):
+        if size > MAX_ITEM_SIZE:
+            oversized_items.append(item)
+        else:
+            entries.append(({"PutRequest": {"Item": item}}, size))
+    if deletes is not None:
+        if key_attributes is None:
+            raise ValueError("key_attributes is required to delete items")
+        key_schema = compile_schema(get_key_schema(compiled_schema, key_attributes))
+        keys, sizes = _serialize_with_size(
+            deletes, key_schema, data_col, NullPolicyEnum.default
+        )
+        for key, size in zip(keys, sizes):
+            entries.append(({"DeleteRequest": {"Key": key}}, size))
+
+    if key_attributes is not None:
+        entries = _dedupe_entries(entries, key_attributes)
+
+    requests = list()
+    wcus = list()
+    batch = list()
+    batch_size = 0
+    batch_wcu = 0
+    for entry, size in entries:
+        if len(batch) == MAX_ITEMS_PER_REQUEST or batch_size + size > MAX_REQUEST_SIZE:
+            requests.append({"RequestItems": {table_name: batch}})
+            wcus.append(batch_wcu)
+            batch = list()
+            batch_size = 0
+            batch_wcu = 0
+        batch.append(entry)
+        batch_size += size
+        batch_wcu += max(1, (size + WCU_UNIT - 1) // WCU_UNIT)
+    if batch:
+        requests.append({"RequestItems": {table_name: batch}})
+        wcus.append(batch_wcu)
+    return BatchWriteRequests(
+        requests=requests,
+        oversized_items=oversized_items,
+        wcus=wcus,
+    )
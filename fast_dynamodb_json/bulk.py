@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+
+"""
+Bulk load regular Python dict data into a DynamoDB table with
+``BatchWriteItem``, under a write capacity budget. See :class:`BulkWriter`
+for more details.
+"""
+
+import time
+import random
+import typing as T
+import threading
+import dataclasses
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    Future,
+    wait,
+    FIRST_COMPLETED,
+)
+
+import polars as pl
+
+from .typehint import T_ITEM, T_SIMPLE_SCHEMA
+from .compiled import CompiledSchema, compile_schema
+from .serialize import NullPolicyEnum
+from .batch import build_batch_write_requests
+from .utils import iter_chunks
+
+
+class TokenBucket:
+    """
+    A thread safe token bucket rate limiter. The bucket is refilled with
+    ``rate`` tokens per second, up to ``capacity`` tokens.
+
+    :meth:`acquire` takes the tokens immediately, and sleeps until the bucket
+    is paid back if it goes negative. So a request larger than the
+    ``capacity`` never blocks forever, and concurrent callers wait in turn.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: T.Optional[float] = None,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be a positive number, got {rate}")
+        if capacity is None:
+            capacity = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take the tokens, block until they are available.
+
+        :return: Seconds waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._last) * self.rate,
+            )
+            self._last = now
+            self._tokens -= tokens
+            wait_seconds = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait_seconds:
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+
+@dataclasses.dataclass
+class BulkWriteStats:
+    """
+    The statistics of a :class:`BulkWriter`.
+
+    :param n_requests: Number of ``batch_write_item`` calls, including retries.
+    :param written: Number of put / delete requests processed by DynamoDB.
+    :param retried: Number of put / delete requests sent again because they
+        were returned in ``UnprocessedItems``.
+    :param failed: Number of put / delete requests still unprocessed after
+        ``max_retries`` retries, and items larger than 400KB.
+    :param wcu: The estimated write capacity units consumed.
+    :param throttled_seconds: Seconds waited for the rate limiter and the
+        retry backoff.
+    :param failed_items: The failed put / delete requests, for example
+        ``{"PutRequest": {"Item": {...}}}``.
+    """
+
+    n_requests: int = dataclasses.field(default=0)
+    written: int = dataclasses.field(default=0)
+    retried: int = dataclasses.field(default=0)
+    failed: int = dataclasses.field(default=0)
+    wcu: int = dataclasses.field(default=0)
+    throttled_seconds: float = dataclasses.field(default=0.0)
+    failed_items: T.List[T.Dict[str, T.Any]] = dataclasses.field(
+        default_factory=list,
+        repr=False,
+    )
+
+
+class BulkWriter:
+    """
+    Serialize the data in chunks with
+    :func:`~fast_dynamodb_json.batch.build_batch_write_requests`, and send
+    the ``BatchWriteItem`` requests on a thread pool. Each request waits for
+    its estimated write capacity units from a :class:`TokenBucket`, the
+    ``UnprocessedItems`` are sent again with exponential backoff and
+    jitter. Example::
+
+        writer = BulkWriter(
+            client,
+            "my-table",
+            simple_schema,
+            max_wcu_per_sec=1000,
+            concurrency=8,
+        )
+        stats = writer.write(records)
+        print(stats.written, stats.retried, stats.failed)
+
+    Errors raised by the client, for example
+    ``ProvisionedThroughputExceededException`` after the botocore retries,
+    are raised by :meth:`write` and :meth:`delete`.
+
+    :param client: The ``boto3.client("dynamodb")``, it is thread safe and
+        shared by all threads.
+    :param table_name: The DynamoDB table name.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param max_wcu_per_sec: The write capacity units budget per second,
+        no limit if None.
+    :param concurrency: Number of threads to send the requests.
+    :param max_retries: Max number of retries of the unprocessed items of a
+        request, they are counted as failed after that.
+    :param base_delay: Seconds to wait before the first retry, it doubles
+        on every retry.
+    :param max_delay: Max seconds to wait before a retry.
+    :param chunk_size: Number of items to serialize at a time.
+    :param key_attributes: The name of the partition key and the sort key
+        (if any) of the table, required by :meth:`delete`. If it is given,
+        only the last item of each primary key in a chunk is written, see
+        :func:`~fast_dynamodb_json.batch.build_batch_write_requests`. The
+        requests are sent concurrently, so the same key in different chunks
+        is written in any order.
+    :param data_col: Name of the column that contains regular Python dict
+        data, only used if the input is a DataFrame.
+    :param null_policy: see :class:`~fast_dynamodb_json.serialize.NullPolicyEnum`.
+    """
+
+    def __init__(
+        self,
+        client,
+        table_name: str,
+        simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+        max_wcu_per_sec: T.Optional[float] = None,
+        concurrency: int = 4,
+        max_retries: int = 8,
+        base_delay: float = 0.05,
+        max_delay: float = 5.0,
+        chunk_size: int = 10000,
+        key_attributes: T.Optional[T.Sequence[str]] = None,
+        data_col: str = "Data",
+        null_policy: str = NullPolicyEnum.default,
+    ):
+        if concurrency < 1:
+            raise ValueError(
+                f"concurrency must be a positive integer, got {concurrency}"
+            )
+        self.client = client
+        self.table_name = table_name
+        self.compiled_schema = compile_schema(simple_schema)
+        self.rate_limiter = (
+            None if max_wcu_per_sec is None else TokenBucket(max_wcu_per_sec)
+        )
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.chunk_size = chunk_size
+        self.key_attributes = key_attributes
+        self.data_col = data_col
+        self.null_policy = null_policy
+        self.stats = BulkWriteStats()
+        self._lock = threading.Lock()
+
+    def _update_stats(self, **kwargs):
+        with self._lock:
+            for key, value in kwargs.items():
+                if key == "failed_items":
+                    self.stats.failed_items.extend(value)
+                else:
+                    setattr(self.stats, key, getattr(self.stats, key) + value)
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        The "full jitter" exponential backoff delay of the retry.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def _send(self, entries: T.List[T.Dict[str, T.Any]], wcu: int):
+        """
+        Send one ``BatchWriteItem`` request, and retry its unprocessed items.
+        """
+        attempt = 0
+        while True:
+            throttled_seconds = 0.0
+            if self.rate_limiter is not None:
+                throttled_seconds = self.rate_limiter.acquire(wcu)
+            res = self.client.batch_write_item(
+                RequestItems={self.table_name: entries}
+            )
+            unprocessed = res.get("UnprocessedItems", {}).get(self.table_name, [])
+            self._update_stats(
+                n_requests=1,
+                written=len(entries) - len(unprocessed),
+                wcu=wcu,
+                throttled_seconds=throttled_seconds,
+            )
+            if not unprocessed:
+                return
+            if attempt >= self.max_retries:
+                self._update_stats(
+                    failed=len(unprocessed),
+                    failed_items=unprocessed,
+                )
+                return
+            delay = self._backoff(attempt)
+            self._update_stats(retried=len(unprocessed), throttled_seconds=delay)
+            time.sleep(delay)
+            # estimate the WCU of the unprocessed items by their share
+            wcu = max(1, -(-wcu * len(unprocessed) // len(entries)))
+            entries = unprocessed
+            attempt += 1
+
+    def _iter_chunks(
+        self,
+        records_or_df: T.Union[T.Iterable[T_ITEM], pl.DataFrame],
+    ) -> T.Iterator[T.Union[T.List[T_ITEM], pl.DataFrame]]:
+        if isinstance(records_or_df, pl.DataFrame):
+            return records_or_df.iter_slices(self.chunk_size)
+        return iter_chunks(records_or_df, self.chunk_size)
+
+    def _write(
+        self,
+        records_or_df: T.Union[T.Iterable[T_ITEM], pl.DataFrame],
+        delete: bool,
+    ) -> BulkWriteStats:
+        max_pending = self.concurrency * 2
+        pending: T.Set[Future] = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                for chunk in self._iter_chunks(records_or_df):
+                    if delete:
+                        res = build_batch_write_requests(
+                            [],
+                            self.compiled_schema,
+                            self.table_name,
+                            deletes=chunk,
+                            key_attributes=self.key_attributes,
+                            data_col=self.data_col,
+                        )
+                    else:
+                        res = build_batch_write_requests(
+                            chunk,
+                            self.compiled_schema,
+                            self.table_name,
+                            key_attributes=self.key_attributes,
+                            data_col=self.data_col,
+                            null_policy=self.null_policy,
+                        )
+                    if res.oversized_items:
+                        self._update_stats(
+                            failed=len(res.oversized_items),
+                            failed_items=[
+                                {"PutRequest": {"Item": item}}
+                                for item in res.oversized_items
+                            ],
+                        )
+                    for request, wcu in zip(res.requests, res.wcus):
+                        # backpressure, don't serialize too far ahead of the writes
+                        while len(pending) >= max_pending:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                future.result()
+                        entries = request["RequestItems"][self.table_name]
+                        pending.add(executor.submit(self._send, entries, wcu))
+                for future in pending:
+                    future.result()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+        return self.stats
+
+    def write(
+        self,
+        records_or_df: T.Union[T.Iterable[T_ITEM], pl.DataFrame],
+    ) -> BulkWriteStats:
+        """
+        Put the items.
+
+        :param records_or_df: Iterable of regular Python dict data, it is
+            consumed lazily, or a polars DataFrame with a column of it, see
+            :func:`~fast_dynamodb_json.serialize.serialize_df`.
+
+        :return: The :class:`BulkWriteStats` accumulated by this writer.
+        """
+        return self._write(records_or_df, delete=False)
+
+    def delete(
+        self,
+        keys_or_df: T.Union[T.Iterable[T_ITEM], pl.DataFrame],
+    ) -> BulkWriteStats:
+        """
+        Delete the items by primary key, ``key_attributes`` is required.
+
+        :param keys_or_df: Iterable of the primary keys (regular Python dict),
+            or a polars DataFrame with a column of it.
+
+        :return: The :class:`BulkWriteStats` accumulated by this writer.
+        """
+        if self.key_attributes is None:
+            raise ValueError("key_attributes is required to delete items")
+        return self._write(keys_or_df, delete=True)
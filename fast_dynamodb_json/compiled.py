@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compile a ``simple_schema`` once and reuse the polars dtypes and expressions.
+
+Building the polars expression tree for a schema is pure Python work that
+walks the whole schema recursively. For small batches it can cost more than
+actually running the expressions. :func:`compile_schema` does this work once
+and keeps the result in a process wide LRU cache keyed by the structure of the
+schema, so repeat calls with an equivalent schema skip it completely.
+
+Example::
+
+    compiled_schema = compile_schema(simple_schema)
+    df = deserialize_df(df, compiled_schema)
+"""
+
+import typing as T
+import threading
+import dataclasses
+from collections import OrderedDict
+
+import polars as pl
+
+from .typehint import (
+    T_SIMPLE_SCHEMA,
+    T_POLARS_SCHEMA,
+)
+from .schema import Null, select_paths
+
+
+T_SCHEMA_KEY = T.Tuple[T.Tuple[str, str], ...]
+
+
+def get_schema_key(simple_schema: T_SIMPLE_SCHEMA) -> T_SCHEMA_KEY:
+    """
+    Get a hashable key that represents the structure of the schema. Two schema
+    with the same attribute names, types and ``default_for_null`` values
+    have the same key. It is cheap because the
+    :attr:`~fast_dynamodb_json.schema.BaseType.fingerprint` of each type
+    is computed only once.
+    """
+    return tuple((name, dtype.fingerprint) for name, dtype in simple_schema.items())
+
+
+@dataclasses.dataclass
+class CompiledSchema:
+    """
+    The prebuilt polars dtypes and selectors of a ``simple_schema``.
+
+    Don't create it directly, use :func:`compile_schema` instead.
+
+    :param simple_schema: A copy of the original schema, so changing the
+        original dict later won't change the cached entry.
+    :param key: The structural key of the schema, see :func:`get_schema_key`.
+    :param polars_schema: ``{name: dtype.to_polars()}``, the polars schema
+        of the regular Python dict data.
+    :param dynamodb_json_polars_schema: ``{name: dtype.to_dynamodb_json_polars()}``,
+        the polars schema of the DynamoDB JSON data.
+    :param polars_struct: The polars dtype of the column that contains
+        regular Python dict data.
+    :param dynamodb_json_polars_struct: The polars dtype of the column that
+        contains DynamoDB JSON data.
+    """
+
+    simple_schema: T_SIMPLE_SCHEMA = dataclasses.field()
+    key: T_SCHEMA_KEY = dataclasses.field()
+    polars_schema: T_POLARS_SCHEMA = dataclasses.field()
+    dynamodb_json_polars_schema: T_POLARS_SCHEMA = dataclasses.field()
+    polars_struct: pl.Struct = dataclasses.field(repr=False)
+    dynamodb_json_polars_struct: pl.Struct = dataclasses.field(repr=False)
+    _serialize_selectors: T.Dict[
+        T.Tuple[str, str], T.List[pl.Expr]
+    ] = dataclasses.field(
+        default_factory=dict,
+        repr=False,
+    )
+    _deserialize_selectors: T.Dict[str, T.Dict[str, pl.Expr]] = dataclasses.field(
+        default_factory=dict,
+        repr=False,
+    )
+    _selected: T.Dict[T.Tuple[str, ...], "CompiledSchema"] = dataclasses.field(
+        default_factory=dict,
+        repr=False,
+    )
+
+    @classmethod
+    def from_simple_schema(
+        cls,
+        simple_schema: T_SIMPLE_SCHEMA,
+        key: T.Optional[T_SCHEMA_KEY] = None,
+    ):
+        simple_schema = dict(simple_schema)
+        if key is None:
+            key = get_schema_key(simple_schema)
+        polars_schema = {k: v.to_polars() for k, v in simple_schema.items()}
+        dynamodb_json_polars_schema = {
+            k: v.to_dynamodb_json_polars() for k, v in simple_schema.items()
+        }
+        return cls(
+            simple_schema=simple_schema,
+            key=key,
+            polars_schema=polars_schema,
+            dynamodb_json_polars_schema=dynamodb_json_polars_schema,
+            polars_struct=pl.Struct(polars_schema),
+            dynamodb_json_polars_struct=pl.Struct(dynamodb_json_polars_schema),
+        )
+
+    def get_serialize_selectors(
+        self,
+        data_col: str = "Data",
+        null_policy: str = "default",
+    ) -> T.List[pl.Expr]:
+        """
+        Get the polars expressions that serialize the ``data_col`` column
+        into DynamoDB JSON columns. They are built only once per ``data_col``
+        and ``null_policy``, see :class:`~fast_dynamodb_json.serialize.NullPolicyEnum`.
+        """
+        key = (data_col, null_policy)
+        try:
+            return self._serialize_selectors[key]
+        except KeyError:
+            from .serialize import get_selector, NullPolicyEnum
+
+            selectors = list()
+            for name, dtype in self.simple_schema.items():
+                node = pl.col(data_col).struct.field(name)
+                selector = get_selector(name=name, dtype=dtype, node=node)
+                if selector is None:  # pragma: no cover
+                    continue
+                if null_policy != NullPolicyEnum.default and not isinstance(
+                    dtype, Null
+                ):
+                    # keep the null attribute as a null DynamoDB JSON value
+                    selector = pl.when(node.is_not_null()).then(selector).alias(name)
+                selectors.append(selector)
+            self._serialize_selectors[key] = selectors
+            return selectors
+
+    def get_deserialize_selector_mapping(
+        self,
+        dynamodb_json_col: str = "Item",
+    ) -> T.Dict[str, pl.Expr]:
+        """
+        Get the polars expression that deserializes each attribute in the
+        ``dynamodb_json_col`` column, keyed by attribute name. They are built
+        only once per ``dynamodb_json_col``.
+        """
+        try:
+            return self._deserialize_selectors[dynamodb_json_col]
+        except KeyError:
+            from .deserialize import _get_selector
+
+            selectors = dict()
+            for name, dtype in self.simple_schema.items():
+                selector = _get_selector(
+                    name,
+                    dtype=dtype,
+                    node=pl.col(dynamodb_json_col).struct.field(name),
+                )
+                if selector is not None:
+                    selectors[name] = selector
+            self._deserialize_selectors[dynamodb_json_col] = selectors
+            return selectors
+
+    def get_deserialize_selectors(
+        self,
+        dynamodb_json_col: str = "Item",
+    ) -> T.List[pl.Expr]:
+        """
+        Get the polars expressions that deserialize the ``dynamodb_json_col``
+        column into regular columns. They are built only once per
+        ``dynamodb_json_col``.
+        """
+        return list(self.get_deserialize_selector_mapping(dynamodb_json_col).values())
+
+    def get_deserialize_struct_selector(
+        self,
+        dynamodb_json_col: str,
+        alias: T.Optional[str] = None,
+    ) -> pl.Expr:
+        """
+        Get a polars expression that deserializes the ``dynamodb_json_col``
+        column into a single struct column (instead of one column per
+        attribute). The struct is null if the DynamoDB JSON data is null,
+        for example, the ``NewImage`` of a deleted item.
+        """
+        if alias is None:
+            alias = dynamodb_json_col
+        selectors = self.get_deserialize_selectors(dynamodb_json_col)
+        return (
+            pl.when(pl.col(dynamodb_json_col).is_not_null())
+            .then(pl.struct(*selectors))
+            .alias(alias)
+        )
+
+    def select_paths(self, paths: T.Iterable[str]) -> "CompiledSchema":
+        """
+        Get the :class:`CompiledSchema` of the schema that only has the given
+        attribute paths, see :func:`~fast_dynamodb_json.schema.select_paths`.
+        It is built only once per ``paths``.
+        """
+        paths = tuple(paths)
+        try:
+            return self._selected[paths]
+        except KeyError:
+            compiled_schema = compile_schema(select_paths(self.simple_schema, paths))
+            self._selected[paths] = compiled_schema
+            return compiled_schema
+
+
+class SchemaCache:
+    """
+    A thread safe LRU cache of :class:`CompiledSchema`, keyed by
+    :func:`get_schema_key`. The least recently used entry is evicted
+    when there are more than ``maxsize`` entries.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: T.OrderedDict[T_SCHEMA_KEY, CompiledSchema] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, simple_schema: T_SIMPLE_SCHEMA) -> CompiledSchema:
+        key = get_schema_key(simple_schema)
+        with self._lock:
+            try:
+                compiled_schema = self._data[key]
+                self._data.move_to_end(key)
+                self.hits += 1
+                return compiled_schema
+            except KeyError:
+                self.misses += 1
+        compiled_schema = CompiledSchema.from_simple_schema(simple_schema, key=key)
+        with self._lock:
+            self._data[key] = compiled_schema
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return compiled_schema
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+schema_cache = SchemaCache()
+
+
+def compile_schema(
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+) -> CompiledSchema:
+    """
+    Get the :class:`CompiledSchema` of the ``simple_schema`` from the cache,
+    compile it if it is not in the cache yet. If it is already a
+    :class:`CompiledSchema`, return it as it is.
+    """
+    if isinstance(simple_schema, CompiledSchema):
+        return simple_schema
+    return schema_cache.get(simple_schema)
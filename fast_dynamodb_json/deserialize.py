@@ -24,6 +24,13 @@ from .schema import (
     List,
     Struct,
 )
+from .compiled import CompiledSchema, compile_schema
+from .output import OutputEnum, to_output
+from .utils import iter_chunks
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+    import pyarrow as pa
 
 
 def _get_selector(
@@ -125,10 +132,116 @@ def _get_selector(
         return None
 
 
+T_FRAME = T.TypeVar("T_FRAME", pl.DataFrame, pl.LazyFrame)
+
+
+class PresenceEnum:
+    """
+    The presence of an attribute in a DynamoDB JSON item, see
+    :func:`get_presence_selector`.
+
+    - ``missing``: the attribute is not in the item.
+    - ``null``: the attribute is in the item, but it doesn't have a value of
+        the expected type, for example ``{"NULL": true}``.
+    - ``value``: the attribute has a value.
+    """
+
+    missing = 0
+    null = 1
+    value = 2
+
+
+def get_presence_selector(
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    dynamodb_json_col: str = "Item",
+    alias: str = "Presence",
+) -> pl.Expr:
+    """
+    Get a polars expression that computes the presence of each top level
+    attribute from the raw DynamoDB JSON column, a struct of
+    :class:`PresenceEnum` codes (``Int8``) keyed by attribute name. It
+    keeps the difference between a missing attribute and a ``NULL``
+    attribute, both are null after deserialization.
+
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param dynamodb_json_col: Name of the column that contains DynamoDB json data.
+    :param alias: Name of the output column.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    missing = pl.lit(PresenceEnum.missing, dtype=pl.Int8)
+    null = pl.lit(PresenceEnum.null, dtype=pl.Int8)
+    value = pl.lit(PresenceEnum.value, dtype=pl.Int8)
+    fields = list()
+    for name, dtype in compiled_schema.simple_schema.items():
+        raw = pl.col(dynamodb_json_col).struct.field(name)
+        if isinstance(dtype, Null):
+            expr = pl.when(raw.is_null()).then(missing).otherwise(null)
+        else:
+            # the DynamoDB JSON struct of a type has only one field, e.g. "S"
+            tag = dtype.to_dynamodb_json_polars().fields[0].name
+            expr = (
+                pl.when(raw.is_null())
+                .then(missing)
+                .when(raw.struct.field(tag).is_null())
+                .then(null)
+                .otherwise(value)
+            )
+        fields.append(expr.alias(name))
+    return pl.struct(*fields).alias(alias)
+
+
+def _get_compiled_schema(
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    paths: T.Optional[T.Iterable[str]] = None,
+) -> CompiledSchema:
+    compiled_schema = compile_schema(simple_schema)
+    if paths is not None:
+        compiled_schema = compiled_schema.select_paths(paths)
+    return compiled_schema
+
+
+def _deserialize_frame(
+    frame: T_FRAME,
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    dynamodb_json_col: str,
+    paths: T.Optional[T.Iterable[str]] = None,
+    filter: T.Optional[pl.Expr] = None,
+    presence_col: T.Optional[str] = None,
+) -> T_FRAME:
+    if filter is not None:
+        # only deserialize the attributes used in the predicate, filter the
+        # rows, then drop them, so the other selectors only run on the
+        # rows that survive.
+        selector_mapping = compile_schema(
+            simple_schema
+        ).get_deserialize_selector_mapping(dynamodb_json_col)
+        names = [
+            name
+            for name in dict.fromkeys(filter.meta.root_names())
+            if name in selector_mapping
+        ]
+        frame = (
+            frame.with_columns(*[selector_mapping[name] for name in names])
+            .filter(filter)
+            .drop(names)
+        )
+    compiled_schema = _get_compiled_schema(simple_schema, paths)
+    selectors = compiled_schema.get_deserialize_selectors(dynamodb_json_col)
+    if presence_col is not None:
+        selectors = selectors + [
+            get_presence_selector(compiled_schema, dynamodb_json_col, presence_col)
+        ]
+    return frame.with_columns(*selectors).drop(dynamodb_json_col)
+
+
 def deserialize_df(
     df: pl.DataFrame,
-    simple_schema: T_SIMPLE_SCHEMA,
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
     dynamodb_json_col: str = "Item",
+    paths: T.Optional[T.Iterable[str]] = None,
+    filter: T.Optional[pl.Expr] = None,
+    presence_col: T.Optional[str] = None,
 ) -> pl.DataFrame:
     """
     similar to :func:`deserialize`, but work with polars DataFrame.
@@ -161,9 +274,25 @@ def deserialize_df(
             },
         )
 
-    :param simple_schema: Schema of the data.
+    :param simple_schema: Schema of the data, or the :class:`~fast_dynamodb_json.compiled.CompiledSchema`
+        of it. The selectors are built only once per schema, see
+        :func:`~fast_dynamodb_json.compiled.compile_schema`.
     :param dynamodb_json_col: Name of the column that contains DynamoDB json data.
         for example: "Item".
+    :param paths: Only deserialize these attribute paths, for example
+        ``["OrderID", "ShippingAddress.City", "Items[].Price"]``, see
+        :func:`~fast_dynamodb_json.schema.select_paths`. The other attributes
+        and nested fields are never parsed, cast or decoded, and are not
+        in the output.
+    :param filter: Only keep the rows that match this polars predicate. It
+        is written against the deserialized attributes, for example
+        ``pl.col("Status") == "Shipped"``. The attributes it uses are
+        deserialized first to filter the rows, then the other attributes are
+        only deserialized for the rows that survive. It can use attributes
+        that are not in ``paths``.
+    :param presence_col: If given, add a struct column with this name that
+        tells whether each attribute is missing, ``NULL`` or has a value,
+        see :func:`get_presence_selector`.
 
     :return: polars DataFrame with columns of the data. Sample dataframe::
 
@@ -175,24 +304,104 @@ def deserialize_df(
         |     |     |                    |                  |
         +-----+-----+--------------------+------------------+
     """
-    selectors = []
-    for name, dtype in simple_schema.items():
-        # print(f"--- expr of field({name!r}) ---")
-        selector = _get_selector(
-            name,
-            dtype=dtype,
-            node=pl.col(dynamodb_json_col).struct.field(name),
+    return _deserialize_frame(
+        frame=df,
+        simple_schema=simple_schema,
+        dynamodb_json_col=dynamodb_json_col,
+        paths=paths,
+        filter=filter,
+        presence_col=presence_col,
+    )
+
+
+def deserialize_lazy(
+    lf: pl.LazyFrame,
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    dynamodb_json_col: str = "Item",
+    paths: T.Optional[T.Iterable[str]] = None,
+    filter: T.Optional[pl.Expr] = None,
+    presence_col: T.Optional[str] = None,
+) -> pl.LazyFrame:
+    """
+    similar to :func:`deserialize_df`, but work with polars LazyFrame. It only
+    adds the selectors to the query plan, nothing is computed until you
+    collect it. So it can be used with the streaming engine to process
+    data that doesn't fit in memory. Example::
+
+        import polars as pl
+
+        (
+            pl.scan_ndjson(
+                "path/to/*.json.gz",
+                schema={"Item": compile_schema(simple_schema).dynamodb_json_polars_struct},
+            )
+            .pipe(deserialize_lazy, simple_schema)
+            .sink_parquet("path/to/data.parquet")
         )
-        # print(selector)
-        if selector is not None:
-            selectors.append(selector)
-    return df.with_columns(*selectors).drop(dynamodb_json_col)
+
+    :param lf: polars LazyFrame with a column of DynamoDB json data.
+    :param simple_schema: Schema of the data, or the :class:`~fast_dynamodb_json.compiled.CompiledSchema`
+        of it.
+    :param dynamodb_json_col: Name of the column that contains DynamoDB json data.
+    :param paths: Only deserialize these attribute paths, for example
+        ``["OrderID", "ShippingAddress.City", "Items[].Price"]``, see
+        :func:`~fast_dynamodb_json.schema.select_paths`. The other attributes
+        and nested fields are never parsed, cast or decoded, and are not
+        in the output.
+    :param filter: Only keep the rows that match this polars predicate. It
+        is written against the deserialized attributes, for example
+        ``pl.col("Status") == "Shipped"``. The attributes it uses are
+        deserialized first to filter the rows, then the other attributes are
+        only deserialized for the rows that survive. It can use attributes
+        that are not in ``paths``.
+    :param presence_col: If given, add a struct column with this name that
+        tells whether each attribute is missing, ``NULL`` or has a value,
+        see :func:`get_presence_selector`.
+
+    :return: polars LazyFrame with columns of the data.
+    """
+    return _deserialize_frame(
+        frame=lf,
+        simple_schema=simple_schema,
+        dynamodb_json_col=dynamodb_json_col,
+        paths=paths,
+        filter=filter,
+        presence_col=presence_col,
+    )
+
+
+def _deserialize_records(
+    records: T.Iterable[T_ITEM],
+    compiled_schema: CompiledSchema,
+    presence_col: T.Optional[str] = None,
+) -> pl.DataFrame:
+    tmp_col = "Item"
+    df = pl.DataFrame(
+        [{tmp_col: record} for record in records],
+        schema={tmp_col: compiled_schema.dynamodb_json_polars_struct},
+        strict=False,
+    )
+    # print(df.to_dicts()) # for debug only
+    return _deserialize_frame(
+        frame=df,
+        simple_schema=compiled_schema,
+        dynamodb_json_col=tmp_col,
+        presence_col=presence_col,
+    )
 
 
 def deserialize(
     records: T.Iterable[T_ITEM],
-    simple_schema: T_SIMPLE_SCHEMA,
-) -> T.List[T_JSON]:
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    paths: T.Optional[T.Iterable[str]] = None,
+    output: str = OutputEnum.dicts,
+    presence_col: T.Optional[str] = None,
+) -> T.Union[
+    T.List[T_JSON],
+    pl.DataFrame,
+    "pa.Table",
+    T.Dict[str, T.Union["np.ndarray", T.List[T.Any]]],
+]:
     """
     Convert DynamoDB json dict into regular Python dict.
 
@@ -230,7 +439,19 @@ def deserialize(
             }),
         }
 
-    :return: List of python dict data. Example::
+    :param paths: Only deserialize these attribute paths, for example
+        ``["OrderID", "ShippingAddress.City", "Items[].Price"]``, see
+        :func:`~fast_dynamodb_json.schema.select_paths`. The other attributes
+        and nested fields are never parsed, cast or decoded, and are not
+        in the output.
+    :param output: ``"dicts"`` (default), ``"polars"``, ``"arrow"`` or
+        ``"columns"``, see :func:`~fast_dynamodb_json.output.to_output`.
+        The other modes skip the Python object creation of ``to_dicts()``.
+    :param presence_col: If given, add a key with this name to each record,
+        that tells whether each attribute is missing, ``NULL`` or has a value,
+        see :func:`get_presence_selector`.
+
+    :return: List of python dict data (for ``output="dicts"``). Example::
 
         result = [
             {
@@ -245,16 +466,65 @@ def deserialize(
             ...
         ]
     """
-    tmp_col = "Item"
-    dynamodb_json_polars_schema = {
-        k: vtype.to_dynamodb_json_polars() for k, vtype in simple_schema.items()
-    }
-    # print(f"{dynamodb_json_polars_schema = }") # for debug only
-    df = pl.DataFrame(
-        [{tmp_col: record} for record in records],
-        schema={tmp_col: pl.Struct(dynamodb_json_polars_schema)},
-        strict=False,
+    compiled_schema = _get_compiled_schema(simple_schema, paths)
+    df = _deserialize_records(records, compiled_schema, presence_col)
+    return to_output(df, output)
+
+
+def deserialize_to_arrow(
+    records: T.Iterable[T_ITEM],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    paths: T.Optional[T.Iterable[str]] = None,
+) -> "pa.Table":
+    """
+    Shortcut of :func:`deserialize` with ``output="arrow"``, convert DynamoDB
+    json dict into ``pyarrow.Table`` without copying the polars buffers.
+
+    It requires ``pyarrow`` to be installed.
+    """
+    return deserialize(
+        records=records,
+        simple_schema=simple_schema,
+        paths=paths,
+        output=OutputEnum.arrow,
     )
-    # print(df.to_dicts()) # for debug only
-    df = deserialize_df(df=df, simple_schema=simple_schema, dynamodb_json_col=tmp_col)
-    return df.to_dicts()
+
+
+def iter_deserialize(
+    records: T.Iterable[T_ITEM],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    chunk_size: int = 10000,
+    paths: T.Optional[T.Iterable[str]] = None,
+    output: str = OutputEnum.dicts,
+    per_row: bool = False,
+) -> T.Iterator[T.Union[T.List[T_JSON], T_JSON, pl.DataFrame, "pa.Table"]]:
+    """
+    Similar to :func:`deserialize`, but pull ``chunk_size`` records at a time
+    from ``records`` and yield the result of each chunk. ``records`` can be
+    a generator, for example the items of a paginated scan, the peak memory
+    is bounded by the chunk size instead of the total number of records.
+    Example::
+
+        for df in iter_deserialize(
+            records, simple_schema, chunk_size=10000, output="polars",
+        ):
+            ...
+
+    :param records: Iterable of DynamoDB json dict.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param chunk_size: Number of records to deserialize at a time.
+    :param paths: see :func:`deserialize`.
+    :param output: see :func:`deserialize`, the output type of each chunk.
+    :param per_row: Yield each python dict instead of a list of them per chunk,
+        only works with ``output="dicts"``.
+    """
+    if per_row and output != OutputEnum.dicts:
+        raise ValueError("per_row=True only works with output='dicts'")
+    compiled_schema = _get_compiled_schema(simple_schema, paths)
+    for chunk in iter_chunks(records, chunk_size):
+        result = to_output(_deserialize_records(chunk, compiled_schema), output)
+        if per_row:
+            yield from result
+        else:
+            yield result
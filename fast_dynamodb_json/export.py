@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+
+"""
+Read the DynamoDB export to S3 data, after it is downloaded to a local folder
+(or mounted). The folder structure of an export looks like::
+
+    ${export_dir}/
+    ${export_dir}/manifest-summary.json
+    ${export_dir}/manifest-files.json
+    ${export_dir}/data/
+    ${export_dir}/data/${random_id_1}.json.gz
+    ${export_dir}/data/${random_id_2}.json.gz
+    ...
+
+Where ``${export_dir}`` is ``${s3_prefix}/AWSDynamoDB/${export_id}/``. Each line
+of the data file of a full export is an item in DynamoDB JSON, wrapped in
+``{"Item": ...}``. Each line of the data file of an incremental export is a
+change of an item::
+
+    {
+        "Metadata": {"WriteTimestampMicros": {"N": "1722632920672000"}},
+        "Keys": {"pk": {"S": "pk1"}},
+        "NewImage": {"pk": {"S": "pk1"}, ...}, # missing if the item is deleted
+        "OldImage": {"pk": {"S": "pk1"}, ...}, # missing if the item is created
+    }
+
+See :func:`read_dynamodb_export`, :func:`read_incremental_export` and
+:func:`compact_incremental_export` for more details.
+"""
+
+import typing as T
+import json
+import dataclasses
+from pathlib import Path
+
+import polars as pl
+
+from .typehint import T_SIMPLE_SCHEMA
+from .compiled import CompiledSchema, compile_schema
+from .deserialize import deserialize_lazy
+
+T_PATH = T.Union[str, Path]
+
+MANIFEST_SUMMARY = "manifest-summary.json"
+MANIFEST_FILES = "manifest-files.json"
+DATA_DIR = "data"
+ITEM_COL = "Item"
+METADATA_COL = "Metadata"
+WRITE_TIMESTAMP_MICROS_COL = "WriteTimestampMicros"
+KEYS_COL = "Keys"
+NEW_IMAGE_COL = "NewImage"
+OLD_IMAGE_COL = "OldImage"
+
+FULL_EXPORT = "FULL_EXPORT"
+INCREMENTAL_EXPORT = "INCREMENTAL_EXPORT"
+DYNAMODB_JSON = "DYNAMODB_JSON"
+
+
+@dataclasses.dataclass
+class ExportDataFile:
+    """
+    A line of the ``manifest-files.json``.
+
+    :param data_file_s3_key: The S3 key of the data file, for example
+        ``AWSDynamoDB/${export_id}/data/${random_id}.json.gz``.
+    :param item_count: Number of items in the data file.
+    :param md5_checksum: The base64 encoded md5 of the data file.
+    :param etag: The S3 etag of the data file.
+    """
+
+    data_file_s3_key: str = dataclasses.field()
+    item_count: int = dataclasses.field()
+    md5_checksum: T.Optional[str] = dataclasses.field(default=None)
+    etag: T.Optional[str] = dataclasses.field(default=None)
+
+    @classmethod
+    def from_dict(cls, dct: T.Dict[str, T.Any]):
+        return cls(
+            data_file_s3_key=dct["dataFileS3Key"],
+            item_count=dct["itemCount"],
+            md5_checksum=dct.get("md5Checksum"),
+            etag=dct.get("etag"),
+        )
+
+    @property
+    def basename(self) -> str:
+        return self.data_file_s3_key.split("/")[-1]
+
+
+@dataclasses.dataclass
+class ExportManifest:
+    """
+    The ``manifest-summary.json`` and ``manifest-files.json`` of an export.
+
+    :param summary: The content of ``manifest-summary.json``, for example
+        ``{"exportArn": ..., "itemCount": ..., "outputFormat": "DYNAMODB_JSON", ...}``.
+    :param data_files: The lines of ``manifest-files.json``.
+    """
+
+    summary: T.Dict[str, T.Any] = dataclasses.field()
+    data_files: T.List[ExportDataFile] = dataclasses.field()
+
+    @classmethod
+    def read(cls, export_dir: T_PATH):
+        """
+        Read the manifest files from the export folder.
+        """
+        export_dir = Path(export_dir)
+        summary = json.loads((export_dir / MANIFEST_SUMMARY).read_text())
+        data_files = [
+            ExportDataFile.from_dict(json.loads(line))
+            for line in (export_dir / MANIFEST_FILES).read_text().splitlines()
+            if line.strip()
+        ]
+        return cls(summary=summary, data_files=data_files)
+
+    @property
+    def export_type(self) -> T.Optional[str]:
+        """
+        ``FULL_EXPORT`` or ``INCREMENTAL_EXPORT``.
+        """
+        return self.summary.get("exportType")
+
+    @property
+    def output_format(self) -> T.Optional[str]:
+        """
+        ``DYNAMODB_JSON`` or ``ION``.
+        """
+        return self.summary.get("outputFormat")
+
+    @property
+    def item_count(self) -> int:
+        return sum(data_file.item_count for data_file in self.data_files)
+
+    def get_data_file_paths(self, export_dir: T_PATH) -> T.List[Path]:
+        """
+        Get the local paths of the data files in the export folder.
+        """
+        dir_data = Path(export_dir) / DATA_DIR
+        return [dir_data / data_file.basename for data_file in self.data_files]
+
+
+def get_data_file_paths(export_dir: T_PATH) -> T.List[Path]:
+    """
+    Get the local paths of the data files of an export. It uses the
+    ``manifest-files.json`` if it exists, otherwise all the ``*.json.gz``
+    files in the ``data`` folder.
+    """
+    export_dir = Path(export_dir)
+    if (export_dir / MANIFEST_FILES).exists():
+        paths = ExportManifest.read(export_dir).get_data_file_paths(export_dir)
+    else:
+        paths = sorted((export_dir / DATA_DIR).glob("*.json.gz"))
+    if len(paths) == 0:
+        raise FileNotFoundError(f"no data file found in {export_dir}")
+    return paths
+
+
+def _check_export(export_dir: T_PATH, export_type: str):
+    """
+    Check the ``exportType`` and ``outputFormat`` in the
+    ``manifest-summary.json`` (if it exists), otherwise the data files would
+    be parsed into all null rows silently.
+    """
+    path = Path(export_dir) / MANIFEST_SUMMARY
+    if not path.exists():
+        return
+    summary = json.loads(path.read_text())
+    if summary.get("exportType") != export_type:
+        raise ValueError(
+            f"{export_dir} is a {summary.get('exportType')}, "
+            f"expected {export_type}"
+        )
+    if summary.get("outputFormat") != DYNAMODB_JSON:
+        raise ValueError(
+            f"the output format of {export_dir} is "
+            f"{summary.get('outputFormat')}, only {DYNAMODB_JSON} is supported"
+        )
+
+
+def _get_scan_schema(
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    paths: T.Optional[T.Iterable[str]] = None,
+    filter: T.Optional[pl.Expr] = None,
+) -> CompiledSchema:
+    """
+    Get the schema to parse the data file with. With ``paths``, only the
+    selected attributes (and the attributes used by ``filter``) are parsed.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    if paths is None:
+        return compiled_schema
+    paths = list(paths)
+    if filter is not None:
+        paths.extend(
+            name
+            for name in filter.meta.root_names()
+            if name in compiled_schema.simple_schema
+        )
+    return compiled_schema.select_paths(paths)
+
+
+def read_dynamodb_export(
+    export_dir: T_PATH,
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    lazy: bool = False,
+    paths: T.Optional[T.Iterable[str]] = None,
+    filter: T.Optional[pl.Expr] = None,
+) -> T.Union[pl.DataFrame, pl.LazyFrame]:
+    """
+    Read and deserialize all the data files of a DynamoDB export to S3 (in
+    ``DYNAMODB_JSON`` format) in a local folder. The gzip data files are read
+    in parallel by polars, and deserialized by
+    :func:`~fast_dynamodb_json.deserialize.deserialize_lazy`.
+
+    Example::
+
+        df = read_dynamodb_export(
+            "./exports/AWSDynamoDB/01722632920672-dd1ec76a/",
+            simple_schema,
+        )
+
+        # convert to parquet with bounded memory
+        read_dynamodb_export(
+            "./exports/AWSDynamoDB/01722632920672-dd1ec76a/",
+            simple_schema,
+            lazy=True,
+        ).sink_parquet("orders.parquet")
+
+    :param export_dir: The export folder that has the ``manifest-summary.json``,
+        ``manifest-files.json`` and ``data/`` folder.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param lazy: Return a polars LazyFrame if True, otherwise collect it
+        into a DataFrame.
+    :param paths: Only read these attribute paths, see
+        :func:`~fast_dynamodb_json.deserialize.deserialize_df`.
+    :param filter: Only keep the rows that match this polars predicate, see
+        :func:`~fast_dynamodb_json.deserialize.deserialize_df`.
+
+    :return: polars DataFrame or LazyFrame with columns of the data.
+
+    :raises ValueError: If the ``manifest-summary.json`` says it is not a
+        ``FULL_EXPORT`` in ``DYNAMODB_JSON`` format.
+    """
+    _check_export(export_dir, FULL_EXPORT)
+    scan_schema = _get_scan_schema(simple_schema, paths=paths, filter=filter)
+    lf = pl.scan_ndjson(
+        get_data_file_paths(export_dir),
+        schema={ITEM_COL: scan_schema.dynamodb_json_polars_struct},
+    )
+    lf = deserialize_lazy(
+        lf,
+        simple_schema=scan_schema,
+        dynamodb_json_col=ITEM_COL,
+        paths=paths,
+        filter=filter,
+    )
+    if lazy:
+        return lf
+    return lf.collect()
+
+
+def get_key_schema(
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    key_attributes: T.Sequence[str],
+) -> T_SIMPLE_SCHEMA:
+    """
+    Get the schema of the primary key attributes.
+    """
+    simple_schema = compile_schema(simple_schema).simple_schema
+    return {name: simple_schema[name] for name in key_attributes}
+
+
+def read_incremental_export(
+    export_dir: T_PATH,
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    key_attributes: T.Sequence[str],
+    lazy: bool = False,
+) -> T.Union[pl.DataFrame, pl.LazyFrame]:
+    """
+    Read and deserialize all the data files of a DynamoDB incremental export
+    to S3 (in ``DYNAMODB_JSON`` format) in a local folder. The ``Keys``,
+    ``NewImage`` and ``OldImage`` are deserialized with the same
+    ``simple_schema`` in one pass.
+
+    :param export_dir: The export folder that has the ``manifest-summary.json``,
+        ``manifest-files.json`` and ``data/`` folder.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param key_attributes: The name of the partition key and the sort key
+        (if any) of the table, for example ``["pk", "sk"]``.
+    :param lazy: Return a polars LazyFrame if True, otherwise collect it
+        into a DataFrame.
+
+    :return: polars DataFrame or LazyFrame with four columns:
+
+        - ``WriteTimestampMicros``: Int64, when the change happened.
+        - ``Keys``: Struct of the key attributes.
+        - ``NewImage``: Struct of all attributes, null if the item is deleted.
+        - ``OldImage``: Struct of all attributes, null if the item is created
+            or the export doesn't have old image.
+
+    :raises ValueError: If the ``manifest-summary.json`` says it is not an
+        ``INCREMENTAL_EXPORT`` in ``DYNAMODB_JSON`` format.
+    """
+    _check_export(export_dir, INCREMENTAL_EXPORT)
+    compiled_schema = compile_schema(simple_schema)
+    key_schema = compile_schema(get_key_schema(compiled_schema, key_attributes))
+    lf = pl.scan_ndjson(
+        get_data_file_paths(export_dir),
+        schema={
+            METADATA_COL: pl.Struct(
+                {WRITE_TIMESTAMP_MICROS_COL: pl.Struct({"N": pl.Utf8()})}
+            ),
+            KEYS_COL: key_schema.dynamodb_json_polars_struct,
+            NEW_IMAGE_COL: compiled_schema.dynamodb_json_polars_struct,
+            OLD_IMAGE_COL: compiled_schema.dynamodb_json_polars_struct,
+        },
+    ).select(
+        pl.col(METADATA_COL)
+        .struct.field(WRITE_TIMESTAMP_MICROS_COL)
+        .struct.field("N")
+        .cast(pl.Int64)
+        .alias(WRITE_TIMESTAMP_MICROS_COL),
+        key_schema.get_deserialize_struct_selector(KEYS_COL),
+        compiled_schema.get_deserialize_struct_selector(NEW_IMAGE_COL),
+        compiled_schema.get_deserialize_struct_selector(OLD_IMAGE_COL),
+    )
+    if lazy:
+        return lf
+    return lf.collect()
+
+
+T_FRAME = T.TypeVar("T_FRAME", pl.DataFrame, pl.LazyFrame)
+
+
+def compact_incremental_export(
+    base: T_FRAME,
+    changes: T.Union[T_FRAME, T.Iterable[T_FRAME]],
+    key_attributes: T.Sequence[str],
+) -> T_FRAME:
+    """
+    Apply the changes of one or many incremental exports onto a full export,
+    to get the latest snapshot of the table without doing a new full export.
+
+    For each primary key, only the latest change (by ``WriteTimestampMicros``)
+    is used. If the item is deleted, it is removed from the base, otherwise
+    the ``NewImage`` replaces the item in the base (or is added). Everything
+    is done with vectorized anti join and concat.
+
+    Example::
+
+        base = read_dynamodb_export(full_export_dir, simple_schema)
+        changes = [
+            read_incremental_export(export_dir, simple_schema, ["pk"])
+            for export_dir in incremental_export_dirs
+        ]
+        snapshot = compact_incremental_export(base, changes, ["pk"])
+
+    :param base: The deserialized full export, see :func:`read_dynamodb_export`.
+    :param changes: The deserialized incremental export(s), see
+        :func:`read_incremental_export`.
+    :param key_attributes: The name of the partition key and the sort key
+        (if any) of the table, for example ``["pk", "sk"]``.
+
+    :return: The latest snapshot, it has the same columns as ``base``.
+    """
+    if isinstance(changes, (pl.DataFrame, pl.LazyFrame)):
+        changes = [changes]
+    key_attributes = list(key_attributes)
+    latest = (
+        pl.concat(list(changes), how="vertical")
+        .with_columns(
+            *[
+                pl.col(KEYS_COL).struct.field(name).alias(name)
+                for name in key_attributes
+            ]
+        )
+        .sort(WRITE_TIMESTAMP_MICROS_COL, maintain_order=True)
+        .unique(subset=key_attributes, keep="last", maintain_order=True)
+    )
+    upserts = (
+        latest.filter(pl.col(NEW_IMAGE_COL).is_not_null())
+        .select(NEW_IMAGE_COL)
+        .unnest(NEW_IMAGE_COL)
+    )
+    return pl.concat(
+        [
+            base.join(
+                latest.select(key_attributes),
+                on=key_attributes,
+                how="anti",
+            ),
+            upserts,
+        ],
+        how="diagonal_relaxed",
+    )
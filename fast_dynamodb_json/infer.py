@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+
+"""
+Infer the ``simple_schema`` from sample data.
+
+See :func:`infer_schema` and :func:`infer_schema_from_items` for more details.
+"""
+
+import typing as T
+import decimal
+import itertools
+
+import polars as pl
+
+from .typehint import (
+    T_ITEM,
+    T_JSON,
+    T_SIMPLE_SCHEMA,
+)
+from .schema import (
+    DATA_TYPE,
+    Integer,
+    Float,
+    String,
+    Binary,
+    Bool,
+    Null,
+    Set,
+    List,
+    Struct,
+)
+
+FLOAT_PATTERN = r"[.eE]"
+
+
+def _infer_type(
+    dtype: pl.DataType,
+    node: pl.Expr,
+    path: str,
+    is_float: T.Dict[str, T.Union[pl.Expr, bool]],
+    collect: bool,
+    wrap: T.Callable[[pl.Expr], pl.Expr] = lambda expr: expr,
+) -> DATA_TYPE:
+    """
+    Convert the polars dtype of a DynamoDB JSON value, for example
+    ``pl.Struct({"S": pl.Utf8(), "NULL": pl.Boolean()})``, into a schema type.
+
+    The ``N`` values can only be told apart by scanning the data. When
+    ``collect`` is True, it only collects a polars expression per ``N``
+    value into ``is_float`` (keyed by ``path``), so that all of them can
+    be evaluated in one pass. When ``collect`` is False, ``is_float`` has
+    to be the evaluated result.
+
+    :param dtype: The polars dtype of the DynamoDB JSON value.
+    :param node: The polars expression to access the DynamoDB JSON value.
+    :param path: The path of the value, for example ``a.b[]``, for error message.
+    :param wrap: When the value is inside of a list, ``node`` is relative to
+        the list element, this function wraps a boolean expression on the
+        element into a boolean expression on the top level row.
+    """
+    # the value is always empty, for example, the element of an empty list
+    if not isinstance(dtype, pl.Struct):
+        return Null()
+
+    fields = {field.name: field.dtype for field in dtype.fields}
+    tags = [tag for tag in fields if tag != "NULL"]
+    if len(tags) == 0:
+        return Null()
+    if len(tags) > 1:
+        raise ValueError(
+            f"attribute {path!r} has more than one type: {tags}, "
+            f"it cannot be described by a simple schema."
+        )
+    tag = tags[0]
+    # fmt: off
+    # the N values are always empty (for example, ``{"NS": []}``) are Integer
+    if tag == "N":
+        if collect and fields["N"] == pl.Utf8():
+            is_float[path] = wrap(node.struct.field("N").str.contains(FLOAT_PATTERN)).any().alias(path)
+        return Float() if is_float.get(path) is True else Integer()
+    elif tag == "NS":
+        if collect and fields["NS"].inner == pl.Utf8():
+            expr = node.struct.field("NS").list.eval(pl.element().str.contains(FLOAT_PATTERN)).list.any()
+            is_float[path] = wrap(expr).any().alias(path)
+        return Set(Float() if is_float.get(path) is True else Integer())
+    elif tag == "S":
+        return String()
+    elif tag == "B":
+        return Binary()
+    elif tag == "BOOL":
+        return Bool()
+    elif tag == "SS":
+        return Set(String())
+    elif tag == "BS":
+        return Set(Binary())
+    elif tag == "L":
+        def wrap_list(expr: pl.Expr) -> pl.Expr:
+            return wrap(node.struct.field("L").list.eval(expr).list.any())
+
+        itype = _infer_type(
+            dtype=fields["L"].inner,
+            node=pl.element(),
+            path=f"{path}[]",
+            is_float=is_float,
+            collect=collect,
+            wrap=wrap_list,
+        )
+        return List(itype)
+    elif tag == "M":
+        types = dict()
+        for field in fields["M"].fields:
+            types[field.name] = _infer_type(
+                dtype=field.dtype,
+                node=node.struct.field("M").struct.field(field.name),
+                path=f"{path}.{field.name}",
+                is_float=is_float,
+                collect=collect,
+                wrap=wrap,
+            )
+        return Struct(types)
+    else:  # pragma: no cover
+        raise NotImplementedError(f"unknown DynamoDB type {tag!r} of attribute {path!r}")
+    # fmt: on
+
+
+def infer_schema(
+    records_or_df: T.Union[T.Iterable[T_JSON], pl.DataFrame],
+    sample: T.Optional[int] = 1000,
+    dynamodb_json_col: str = "Item",
+) -> T_SIMPLE_SCHEMA:
+    """
+    Infer the ``simple_schema`` from a sample of DynamoDB JSON data, so it can
+    be used by :func:`~fast_dynamodb_json.deserialize.deserialize` and
+    :func:`~fast_dynamodb_json.deserialize.deserialize_df`.
+
+    It let polars figure out the union of all type tags (``S``, ``N``,
+    ``L``, ``M``, ...) of each attribute, then scans all ``N`` values in
+    one vectorized pass to tell :class:`~fast_dynamodb_json.schema.Integer`
+    from :class:`~fast_dynamodb_json.schema.Float`. There is no per item
+    Python recursion.
+
+    Example::
+
+        records = [
+            {"pk": {"S": "pk1"}, "price": {"N": "9.99"}, "tags": {"SS": ["a"]}},
+            {"pk": {"S": "pk2"}, "price": {"N": "10"}, "qty": {"N": "3"}},
+        ]
+        infer_schema(records)
+        # {
+        #     "pk": String(),
+        #     "price": Float(),
+        #     "tags": Set(String()),
+        #     "qty": Integer(),
+        # }
+
+    .. note::
+
+        An attribute that is always ``{"NULL": true}`` is inferred as
+        :class:`~fast_dynamodb_json.schema.Null`, and so is the element of a
+        list that is always empty. An attribute that has more than one type
+        (for example, ``S`` in one item and ``N`` in another) raises
+        :class:`ValueError`.
+
+    :param records_or_df: List of DynamoDB JSON data, or a polars DataFrame
+        with a column of DynamoDB JSON data, the column can be a struct
+        or a JSON string.
+    :param sample: Only use the first N records, use all records if None.
+    :param dynamodb_json_col: Name of the column that contains DynamoDB json data,
+        only used when ``records_or_df`` is a DataFrame.
+
+    :return: The inferred schema.
+    """
+    if isinstance(records_or_df, pl.DataFrame):
+        df = records_or_df.select(dynamodb_json_col)
+        if sample is not None:
+            df = df.head(sample)
+        if df.schema[dynamodb_json_col] == pl.Utf8():
+            df = (
+                df.get_column(dynamodb_json_col)
+                .str.json_decode(infer_schema_length=None)
+                .to_frame()
+            )
+    else:
+        if sample is not None:
+            records_or_df = itertools.islice(records_or_df, sample)
+        df = pl.DataFrame(
+            [{dynamodb_json_col: record} for record in records_or_df],
+            infer_schema_length=None,
+        )
+    if dynamodb_json_col not in df.schema:  # no data at all
+        return dict()
+    dtype = df.schema[dynamodb_json_col]
+    if not isinstance(dtype, pl.Struct):
+        return dict()
+
+    is_float = dict()
+    kwargs_list = [
+        dict(
+            dtype=field.dtype,
+            node=pl.col(dynamodb_json_col).struct.field(field.name),
+            path=field.name,
+            is_float=is_float,
+        )
+        for field in dtype.fields
+    ]
+    for kwargs in kwargs_list:
+        _infer_type(collect=True, **kwargs)
+    if is_float:
+        row = df.select(*is_float.values()).row(0, named=True)
+        is_float.update({k: bool(v) for k, v in row.items()})
+    return {
+        field.name: _infer_type(collect=False, **kwargs)
+        for field, kwargs in zip(dtype.fields, kwargs_list)
+    }
+
+
+def _join_path(path: str, key: str) -> str:
+    return f"{path}.{key}" if path else key
+
+
+def _merge_type(
+    type1: DATA_TYPE,
+    type2: DATA_TYPE,
+    path: str,
+) -> DATA_TYPE:
+    """
+    Merge two types of the same attribute into one type that can
+    hold both of them. :class:`~fast_dynamodb_json.schema.Null` means
+    "unknown" and can be merged with anything.
+    """
+    if type1 == type2:
+        return type1
+    if isinstance(type1, Null):
+        return type2
+    if isinstance(type2, Null):
+        return type1
+    if {type1.__class__, type2.__class__} == {Integer, Float}:
+        return Float()
+    if isinstance(type1, Set) and isinstance(type2, Set):
+        return Set(_merge_type(type1.itype, type2.itype, f"{path}[]"))
+    if isinstance(type1, List) and isinstance(type2, List):
+        return List(_merge_type(type1.itype, type2.itype, f"{path}[]"))
+    if isinstance(type1, Struct) and isinstance(type2, Struct):
+        types = dict(type1.types)
+        for key, vtype in type2.types.items():
+            if key in types:
+                types[key] = _merge_type(types[key], vtype, _join_path(path, key))
+            else:
+                types[key] = vtype
+        return Struct(types)
+    raise ValueError(
+        f"attribute {path!r} has more than one type: "
+        f"{type1.__class__.__name__} and {type2.__class__.__name__}, "
+        f"it cannot be described by a simple schema."
+    )
+
+
+def _infer_value_type(value: T.Any, path: str) -> DATA_TYPE:
+    """
+    Get the type of a regular Python value.
+    """
+    if value is None:
+        return Null()
+    elif isinstance(value, bool):  # bool is a subclass of int
+        return Bool()
+    elif isinstance(value, int):
+        return Integer()
+    elif isinstance(value, float):
+        return Float()
+    elif isinstance(value, decimal.Decimal):  # boto3 returns number as Decimal
+        return Integer() if value == value.to_integral_value() else Float()
+    elif isinstance(value, str):
+        return String()
+    elif isinstance(value, (bytes, bytearray)):
+        return Binary()
+    elif isinstance(value, (set, frozenset)):
+        itype = Null()
+        for v in value:
+            itype = _merge_type(itype, _infer_value_type(v, f"{path}[]"), f"{path}[]")
+        return Set(itype)
+    elif isinstance(value, (list, tuple)):
+        itype = Null()
+        for v in value:
+            itype = _merge_type(itype, _infer_value_type(v, f"{path}[]"), f"{path}[]")
+        return List(itype)
+    elif isinstance(value, dict):
+        return Struct(
+            {k: _infer_value_type(v, _join_path(path, k)) for k, v in value.items()}
+        )
+    else:
+        raise TypeError(
+            f"attribute {path!r} has unsupported type {value.__class__.__name__!r}"
+        )
+
+
+def _finalize_type(dtype: DATA_TYPE) -> DATA_TYPE:
+    """
+    A set that is always empty doesn't have element type, use String for it.
+    """
+    if isinstance(dtype, Set):
+        if isinstance(dtype.itype, Null):
+            return Set(String())
+        return dtype
+    elif isinstance(dtype, List):
+        return List(_finalize_type(dtype.itype))
+    elif isinstance(dtype, Struct):
+        return Struct({k: _finalize_type(v) for k, v in dtype.types.items()})
+    else:
+        return dtype
+
+
+def infer_schema_from_items(
+    items: T.Iterable[T_ITEM],
+    sample: T.Optional[int] = 1000,
+) -> T_SIMPLE_SCHEMA:
+    """
+    Infer the ``simple_schema`` from a sample of regular Python dict data,
+    so it can be used by :func:`~fast_dynamodb_json.serialize.serialize` and
+    :func:`~fast_dynamodb_json.serialize.serialize_df`.
+
+    The type mapping is:
+
+    - ``None``: :class:`~fast_dynamodb_json.schema.Null`, if the attribute
+        is always ``None``.
+    - ``bool``: :class:`~fast_dynamodb_json.schema.Bool`
+    - ``int``: :class:`~fast_dynamodb_json.schema.Integer`
+    - ``float``: :class:`~fast_dynamodb_json.schema.Float`, an attribute
+        that has both ``int`` and ``float`` values is also ``Float``.
+    - ``decimal.Decimal``: ``Integer`` if it is integral, otherwise ``Float``.
+    - ``str``: :class:`~fast_dynamodb_json.schema.String`
+    - ``bytes``: :class:`~fast_dynamodb_json.schema.Binary`
+    - ``set``, ``frozenset``: :class:`~fast_dynamodb_json.schema.Set`,
+        ``Set(String())`` if it is always empty.
+    - ``list``, ``tuple``: :class:`~fast_dynamodb_json.schema.List`,
+        ``List(Null())`` if it is always empty.
+    - ``dict``: :class:`~fast_dynamodb_json.schema.Struct`, with the union
+        of keys of all values.
+
+    An attribute that has more than one type raises :class:`ValueError`.
+
+    The returned schema is hashable (see
+    :attr:`~fast_dynamodb_json.schema.BaseType.fingerprint`), infer it once
+    per job and reuse it for all the batches, the compiled selectors are
+    cached by :func:`~fast_dynamodb_json.compiled.compile_schema`.
+
+    :param items: List of regular Python dict data.
+    :param sample: Only use the first N items, use all items if None.
+
+    :return: The inferred schema.
+    """
+    if sample is not None:
+        items = itertools.islice(items, sample)
+    struct = Struct({})
+    for item in items:
+        struct = _merge_type(struct, _infer_value_type(item, ""), "")
+    return {
+        name: _finalize_type(dtype) for name, dtype in struct.types.items()
+    }
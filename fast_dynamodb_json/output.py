@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""
+Convert the polars DataFrame result of
+:func:`~fast_dynamodb_json.deserialize.deserialize` and
+:func:`~fast_dynamodb_json.serialize.serialize` to the requested output.
+
+``to_dicts()`` creates one Python object per value, it is usually the most
+expensive part of the conversion. If the downstream consumer can read polars
+or Arrow data (Parquet writers, DuckDB, Flight, ...), use ``output="polars"``
+or ``output="arrow"`` to skip it. For column oriented consumers (feature
+engineering, numpy based code), use ``output="columns"``.
+"""
+
+import typing as T
+
+import polars as pl
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+    import pyarrow as pa
+
+
+class OutputEnum:
+    dicts = "dicts"
+    polars = "polars"
+    arrow = "arrow"
+    columns = "columns"
+
+
+def to_arrow(df: pl.DataFrame) -> "pa.Table":
+    """
+    Convert polars DataFrame to ``pyarrow.Table``. The Arrow buffers are
+    shared with polars, the data is not copied. Use ``Table.to_batches()``
+    if you need ``pyarrow.RecordBatch``.
+
+    It requires ``pyarrow`` to be installed.
+    """
+    return df.to_arrow()
+
+
+def to_columns(
+    df: pl.DataFrame,
+) -> T.Dict[str, T.Union["np.ndarray", T.List[T.Any]]]:
+    """
+    Convert polars DataFrame to a dict of column name and column values.
+
+    - ``Integer`` and ``Float`` columns without null are returned as
+        read-only numpy arrays, which are views of the polars buffers, the
+        values are never boxed into Python objects. ``Bool`` columns without
+        null are also numpy arrays, but they are copied, because polars
+        stores booleans as bits.
+    - The other columns, and the numeric columns that have null, are
+        returned as list of Python objects.
+
+    It requires ``numpy`` to be installed if there is any numeric column.
+    """
+    columns = dict()
+    for series in df.iter_columns():
+        dtype = series.dtype
+        if (
+            dtype.is_integer() or dtype.is_float() or dtype == pl.Boolean
+        ) and series.null_count() == 0:
+            columns[series.name] = series.to_numpy()
+        else:
+            columns[series.name] = series.to_list()
+    return columns
+
+
+def to_output(
+    df: pl.DataFrame,
+    output: str = OutputEnum.dicts,
+) -> T.Union[T.List[T.Dict[str, T.Any]], pl.DataFrame, "pa.Table"]:
+    """
+    Convert polars DataFrame to the given output.
+
+    :param df: the polars DataFrame.
+    :param output: one of ``"dicts"`` (list of Python dict), ``"polars"``
+        (the polars DataFrame as it is) and ``"arrow"`` (``pyarrow.Table``,
+        see :func:`to_arrow`) and ``"columns"`` (dict of column name and
+        numpy array or list, see :func:`to_columns`).
+    """
+    if output == OutputEnum.dicts:
+        return df.to_dicts()
+    elif output == OutputEnum.polars:
+        return df
+    elif output == OutputEnum.arrow:
+        return to_arrow(df)
+    elif output == OutputEnum.columns:
+        return to_columns(df)
+    else:
+        raise ValueError(
+            f"invalid output {output!r}, must be one of "
+            f"{OutputEnum.dicts!r}, {OutputEnum.polars!r}, "
+            f"{OutputEnum.arrow!r}, {OutputEnum.columns!r}"
+        )
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""
+Deserialize the pages of a ``Scan`` or ``Query`` paginator in batches. See
+:func:`deserialize_pages` for more details.
+"""
+
+import typing as T
+import dataclasses
+
+from .typehint import T_ITEM, T_JSON, T_SIMPLE_SCHEMA
+from .compiled import CompiledSchema, compile_schema
+from .deserialize import deserialize
+from .output import OutputEnum
+
+
+@dataclasses.dataclass
+class PageBatch:
+    """
+    A batch of pages, the result of :func:`deserialize_pages`.
+
+    :param data: The deserialized items of the pages, the type depends on
+        ``output``.
+    :param last_evaluated_key: The ``LastEvaluatedKey`` of the last page of
+        the batch. All the items up to this key are in this batch and the
+        previous batches, pass it as ``ExclusiveStartKey`` to resume the scan
+        or query after this batch. None if it is the last batch.
+    :param n_pages: Number of pages in the batch.
+    :param count: Sum of the ``Count`` of the pages.
+    :param scanned_count: Sum of the ``ScannedCount`` of the pages.
+    """
+
+    data: T.Any = dataclasses.field()
+    last_evaluated_key: T.Optional[T_JSON] = dataclasses.field(default=None)
+    n_pages: int = dataclasses.field(default=0)
+    count: int = dataclasses.field(default=0)
+    scanned_count: int = dataclasses.field(default=0)
+
+    @property
+    def is_last(self) -> bool:
+        """
+        True if there is no more page after this batch.
+        """
+        return self.last_evaluated_key is None
+
+
+def deserialize_pages(
+    pages: T.Iterable[T.Dict[str, T.Any]],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    target_rows: int = 10000,
+    paths: T.Optional[T.Iterable[str]] = None,
+    output: str = OutputEnum.dicts,
+) -> T.Iterator[PageBatch]:
+    """
+    Consume the pages of a ``Scan`` or ``Query`` paginator, accumulate the
+    ``Items`` of the pages until there are at least ``target_rows`` items,
+    then deserialize them at once. A page has at most 1MB of data, creating
+    a DataFrame for each page costs more than the deserialization itself.
+    Example::
+
+        paginator = dynamodb_client.get_paginator("scan")
+        for batch in deserialize_pages(
+            paginator.paginate(TableName="my-table"),
+            simple_schema,
+            target_rows=100000,
+            output="polars",
+        ):
+            batch.data.write_parquet(...)
+            save_checkpoint(batch.last_evaluated_key)
+
+    It works with any iterator of page dict, each has ``Items`` and
+    optionally ``Count``, ``ScannedCount`` and ``LastEvaluatedKey``.
+
+    :param pages: Iterable of the page dict.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param target_rows: Min number of items per batch, except the last one.
+    :param paths: see :func:`~fast_dynamodb_json.deserialize.deserialize`.
+    :param output: see :func:`~fast_dynamodb_json.deserialize.deserialize`,
+        the type of :attr:`PageBatch.data`.
+
+    :return: Iterator of :class:`PageBatch`.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    if paths is not None:
+        paths = tuple(paths)
+
+    items: T.List[T_ITEM] = list()
+    batch = PageBatch(data=None)
+
+    def flush(batch: PageBatch, items: T.List[T_ITEM]) -> PageBatch:
+        batch.data = deserialize(
+            records=items,
+            simple_schema=compiled_schema,
+            paths=paths,
+            output=output,
+        )
+        return batch
+
+    for page in pages:
+        items.extend(page.get("Items", []))
+        batch.last_evaluated_key = page.get("LastEvaluatedKey")
+        batch.n_pages += 1
+        batch.count += page.get("Count", len(page.get("Items", [])))
+        batch.scanned_count += page.get("ScannedCount", 0)
+        if len(items) >= target_rows:
+            yield flush(batch, items)
+            items = list()
+            batch = PageBatch(data=None)
+    if batch.n_pages:
+        yield flush(batch, items)
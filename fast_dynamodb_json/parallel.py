@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""
+Deserialize a large number of records with a pool of processes. See
+:func:`deserialize_parallel` for more details.
+"""
+
+import io
+import os
+import typing as T
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import polars as pl
+
+from .typehint import T_ITEM, T_JSON, T_SIMPLE_SCHEMA
+from .compiled import CompiledSchema, compile_schema
+from .deserialize import _deserialize_records, _get_compiled_schema
+from .output import OutputEnum, to_output
+from .utils import iter_chunks
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+    import pyarrow as pa
+
+
+def _deserialize_to_ipc(
+    records: T.List[T_ITEM],
+    simple_schema: T_SIMPLE_SCHEMA,
+    paths: T.Optional[T.Tuple[str, ...]],
+) -> bytes:
+    """
+    Run in the worker process, deserialize a chunk of records and return the
+    result in Arrow IPC format.
+    """
+    compiled_schema = _get_compiled_schema(simple_schema, paths)
+    df = _deserialize_records(records, compiled_schema)
+    buffer = io.BytesIO()
+    df.write_ipc(buffer)
+    return buffer.getvalue()
+
+
+def deserialize_parallel(
+    records: T.Iterable[T_ITEM],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    workers: T.Optional[int] = None,
+    chunk_size: int = 50000,
+    paths: T.Optional[T.Iterable[str]] = None,
+    output: str = OutputEnum.polars,
+    mp_context: T.Optional[multiprocessing.context.BaseContext] = None,
+) -> T.Union[
+    T.List[T_JSON],
+    pl.DataFrame,
+    "pa.Table",
+    T.Dict[str, T.Union["np.ndarray", T.List[T.Any]]],
+]:
+    """
+    Similar to :func:`~fast_dynamodb_json.deserialize.deserialize`, but split
+    the records into chunks and deserialize them in a pool of processes.
+    The ``DataFrame`` construction from Python dict is single threaded and
+    holds the GIL, processes are the only way to scale it with the number
+    of CPU.
+
+    Each worker compiles the schema once (see
+    :func:`~fast_dynamodb_json.compiled.compile_schema`) and sends the
+    result back in Arrow IPC format, not as pickled dict. The results are
+    concatenated in the order of the records.
+
+    At most ``2 * workers`` chunks are in flight, the records are pulled
+    from ``records`` lazily, and the result of each chunk is read as soon
+    as it is its turn. So a large iterable is never pickled up front.
+
+    :param records: Iterable of DynamoDB json dict.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it. Only the
+        ``simple_schema`` is sent to the workers.
+    :param workers: Number of processes, default is the number of CPU.
+    :param chunk_size: Number of records per task.
+    :param paths: see :func:`~fast_dynamodb_json.deserialize.deserialize`.
+    :param output: ``"polars"`` (default), ``"arrow"``, ``"columns"`` or
+        ``"dicts"``, see :func:`~fast_dynamodb_json.output.to_output`.
+        ``"dicts"`` converts the result in the main process with a single
+        thread, avoid it if you can.
+    :param mp_context: The multiprocessing context of the process pool,
+        default is ``spawn``, because polars is not fork safe.
+    """
+    simple_schema = compile_schema(simple_schema).simple_schema
+    if paths is not None:
+        paths = tuple(paths)
+    if mp_context is None:
+        mp_context = multiprocessing.get_context("spawn")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    max_pending = 2 * workers
+    dfs = list()
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        for chunk in iter_chunks(records, chunk_size):
+            # backpressure, read the oldest result before submitting more
+            if len(pending) >= max_pending:
+                dfs.append(pl.read_ipc(io.BytesIO(pending.popleft().result())))
+            pending.append(
+                executor.submit(_deserialize_to_ipc, chunk, simple_schema, paths)
+            )
+        while pending:
+            dfs.append(pl.read_ipc(io.BytesIO(pending.popleft().result())))
+    if dfs:
+        df = pl.concat(dfs, how="vertical", rechunk=False)
+    else:
+        df = _deserialize_records([], _get_compiled_schema(simple_schema, paths))
+    return to_output(df, output)
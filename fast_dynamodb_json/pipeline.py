@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+
+"""
+A multi stage thread pool pipeline to process many DynamoDB JSON data files,
+for example the ``data/*.json.gz`` files of a DynamoDB export::
+
+    read -> decompress -> parse -> deserialize -> write
+
+Each stage has its own worker threads and a bounded input queue. File IO,
+gzip decompression and polars all release the GIL, so while file N is being
+deserialized, file N + 1 is decompressed and file N + 2 is read. The bounded
+queues apply backpressure: a fast stage blocks instead of piling up data in
+memory when the next stage is slow.
+
+See :func:`deserialize_files` and :func:`run_pipeline` for more details.
+"""
+
+import io
+import gzip
+import queue
+import typing as T
+import threading
+import dataclasses
+from pathlib import Path
+
+import polars as pl
+
+from .typehint import T_SIMPLE_SCHEMA
+from .compiled import CompiledSchema, compile_schema
+from .deserialize import deserialize_df
+
+
+@dataclasses.dataclass
+class Stage:
+    """
+    A stage of the pipeline.
+
+    :param func: The function to process one item, its return value is the
+        input of the next stage.
+    :param workers: Number of worker threads of this stage.
+    :param name: Name of the stage, for debugging.
+    """
+
+    func: T.Callable[[T.Any], T.Any] = dataclasses.field()
+    workers: int = dataclasses.field(default=1)
+    name: str = dataclasses.field(default="")
+
+
+class _Stop:
+    """
+    The marker that tells a worker there is no more input.
+    """
+
+
+@dataclasses.dataclass
+class _Failure:
+    """
+    The exception raised by a stage, it skips the following stages and is
+    raised by the consumer.
+    """
+
+    error: BaseException = dataclasses.field()
+
+
+_STOP = _Stop()
+
+
+def _put(q: queue.Queue, item: T.Any, stop_event: threading.Event) -> bool:
+    """
+    Put the item in the bounded queue, give up if the pipeline is stopped.
+    """
+    while not stop_event.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(q: queue.Queue, stop_event: threading.Event) -> T.Any:
+    """
+    Get an item from the queue, return the stop marker if the pipeline
+    is stopped.
+    """
+    while not stop_event.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    return _STOP
+
+
+def run_pipeline(
+    inputs: T.Iterable[T.Any],
+    stages: T.Sequence[Stage],
+    queue_size: int = 2,
+    ordered: bool = True,
+) -> T.Iterator[T.Any]:
+    """
+    Run the ``inputs`` through the ``stages``, and yield the output of the
+    last stage. Example::
+
+        for df in run_pipeline(
+            paths,
+            stages=[
+                Stage(Path.read_bytes, workers=2),
+                Stage(gzip.decompress, workers=2),
+                Stage(parse, workers=1),
+            ],
+        ):
+            ...
+
+    :param inputs: The input of the first stage.
+    :param stages: The stages, see :class:`Stage`.
+    :param queue_size: Max number of items waiting in front of each stage.
+    :param ordered: Yield the output in the order of the inputs if True,
+        otherwise as soon as they are done.
+
+    If any stage or the ``inputs`` iterator raises, the exception is raised
+    by this generator and the pipeline is stopped.
+
+    The bounded queues apply backpressure in both modes. In ordered mode,
+    the items done ahead of a slow item are buffered until it is done, at
+    most ``queue_size * (len(stages) + 1) + total workers`` items are fed
+    but not yielded yet, so the memory is bounded too.
+    """
+    if not stages:
+        raise ValueError("stages can't be empty")
+    stop_event = threading.Event()
+    queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+    output_queue = queue.Queue(maxsize=queue_size)
+    queues.append(output_queue)
+    n_consumers = [stage.workers for stage in stages] + [1]
+
+    # in ordered mode, the finished items wait in the buffer of the consumer
+    # until all the items before them are done. Limit the number of items
+    # that are fed but not yielded yet, so the buffer is bounded too.
+    max_pending = queue_size * (len(stages) + 1) + sum(
+        stage.workers for stage in stages
+    )
+    pending = threading.Semaphore(max_pending)
+
+    def acquire() -> bool:
+        while not stop_event.is_set():
+            if pending.acquire(timeout=0.1):
+                return True
+        return False
+
+    def feed():
+        n_fed = 0
+        try:
+            for item in inputs:
+                if ordered and not acquire():
+                    return
+                if not _put(queues[0], (n_fed, item), stop_event):
+                    return
+                n_fed += 1
+        except BaseException as e:
+            # forward the error of the input iterator to the consumer
+            if not _put(queues[0], (n_fed, _Failure(e)), stop_event):
+                return
+        for _ in range(n_consumers[0]):
+            _put(queues[0], _STOP, stop_event)
+
+    def work(i: int, stage: Stage, counter: T.List[int], lock: threading.Lock):
+        in_queue, out_queue = queues[i], queues[i + 1]
+        while True:
+            entry = _get(in_queue, stop_event)
+            if entry is _STOP:
+                break
+            index, item = entry
+            if not isinstance(item, _Failure):
+                try:
+                    item = stage.func(item)
+                except BaseException as e:
+                    item = _Failure(e)
+            if not _put(out_queue, (index, item), stop_event):
+                return
+        # the last worker of the stage tells the next stage to stop
+        with lock:
+            counter[0] -= 1
+            is_last = counter[0] == 0
+        if is_last:
+            for _ in range(n_consumers[i + 1]):
+                _put(out_queue, _STOP, stop_event)
+
+    threads = [threading.Thread(target=feed, daemon=True)]
+    for i, stage in enumerate(stages):
+        if stage.workers < 1:
+            raise ValueError(f"workers of stage {i} must be a positive integer")
+        counter, lock = [stage.workers], threading.Lock()
+        for _ in range(stage.workers):
+            threads.append(
+                threading.Thread(
+                    target=work,
+                    args=(i, stage, counter, lock),
+                    name=f"{stage.name or 'stage'}-{i}",
+                    daemon=True,
+                )
+            )
+    for thread in threads:
+        thread.start()
+
+    try:
+        buffer = dict()
+        next_index = 0
+        while True:
+            entry = output_queue.get()
+            if entry is _STOP:
+                break
+            index, item = entry
+            if isinstance(item, _Failure):
+                raise item.error
+            if ordered:
+                buffer[index] = item
+                while next_index in buffer:
+                    pending.release()
+                    yield buffer.pop(next_index)
+                    next_index += 1
+            else:
+                yield item
+    finally:
+        stop_event.set()
+
+
+def _decompress(data: bytes, path: Path) -> bytes:
+    if path.suffix == ".gz":
+        return gzip.decompress(data)
+    return data
+
+
+def deserialize_files(
+    paths: T.Iterable[T.Union[str, Path]],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    write: T.Optional[T.Callable[[Path, pl.DataFrame], T.Any]] = None,
+    dynamodb_json_col: str = "Item",
+    read_workers: int = 2,
+    decompress_workers: int = 2,
+    parse_workers: int = 1,
+    deserialize_workers: int = 1,
+    write_workers: int = 1,
+    queue_size: int = 2,
+    ordered: bool = True,
+) -> T.Iterator[T.Tuple[Path, T.Any]]:
+    """
+    Read, decompress, parse and deserialize many newline delimited DynamoDB
+    JSON files (``.json`` or ``.json.gz``), where each line is
+    ``{"Item": {...}}``, with :func:`run_pipeline`. Example::
+
+        def write(path, df):
+            df.write_parquet(dir_parquet / path.name.replace(".json.gz", ".parquet"))
+
+        for path, _ in deserialize_files(
+            get_data_file_paths(export_dir),
+            simple_schema,
+            write=write,
+        ):
+            print(f"done {path}")
+
+    :param paths: The data files.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param write: Optional function that takes the path of the data file and
+        the deserialized DataFrame. It runs as the last stage.
+    :param dynamodb_json_col: The key of the DynamoDB JSON item in each line.
+    :param read_workers: Number of threads to read the files.
+    :param decompress_workers: Number of threads to decompress the files.
+    :param parse_workers: Number of threads to parse the JSON.
+    :param deserialize_workers: Number of threads to deserialize.
+    :param write_workers: Number of threads to call ``write``.
+    :param queue_size: see :func:`run_pipeline`.
+    :param ordered: see :func:`run_pipeline`.
+
+    :return: Iterator of ``(path, result)``, the ``result`` is the return
+        value of ``write``, or the deserialized DataFrame if ``write`` is None.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    schema = {dynamodb_json_col: compiled_schema.dynamodb_json_polars_struct}
+
+    def read(path: T.Union[str, Path]):
+        path = Path(path)
+        return path, path.read_bytes()
+
+    def decompress(args: T.Tuple[Path, bytes]):
+        path, data = args
+        return path, _decompress(data, path)
+
+    def parse(args: T.Tuple[Path, bytes]):
+        path, data = args
+        return path, pl.read_ndjson(io.BytesIO(data), schema=schema)
+
+    def deserialize(args: T.Tuple[Path, pl.DataFrame]):
+        path, df = args
+        return path, deserialize_df(df, compiled_schema, dynamodb_json_col)
+
+    stages = [
+        Stage(read, workers=read_workers, name="read"),
+        Stage(decompress, workers=decompress_workers, name="decompress"),
+        Stage(parse, workers=parse_workers, name="parse"),
+        Stage(deserialize, workers=deserialize_workers, name="deserialize"),
+    ]
+    if write is not None:
+
+        def write_stage(args: T.Tuple[Path, pl.DataFrame]):
+            path, df = args
+            return path, write(path, df)
+
+        stages.append(Stage(write_stage, workers=write_workers, name="write"))
+
+    return run_pipeline(paths, stages, queue_size=queue_size, ordered=ordered)
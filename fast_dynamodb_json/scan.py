@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""
+Read a whole DynamoDB table with parallel ``Scan``. See
+:func:`parallel_scan` for more details.
+"""
+
+import time
+import typing as T
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
+import polars as pl
+
+from .typehint import T_SIMPLE_SCHEMA
+from .compiled import CompiledSchema, compile_schema
+from .pages import deserialize_pages
+from .output import OutputEnum
+
+
+@dataclasses.dataclass
+class SegmentMetrics:
+    """
+    The throughput of a ``Scan`` segment.
+
+    :param segment: The segment number.
+    :param n_pages: Number of pages.
+    :param count: Number of items returned.
+    :param scanned_count: Number of items scanned, before ``FilterExpression``.
+    :param elapsed: Seconds to scan and deserialize the segment.
+    """
+
+    segment: int = dataclasses.field()
+    n_pages: int = dataclasses.field(default=0)
+    count: int = dataclasses.field(default=0)
+    scanned_count: int = dataclasses.field(default=0)
+    elapsed: float = dataclasses.field(default=0.0)
+
+    @property
+    def items_per_second(self) -> float:
+        if self.elapsed:
+            return self.count / self.elapsed
+        return 0.0
+
+
+@dataclasses.dataclass
+class ParallelScanResult:
+    """
+    The result of :func:`parallel_scan`.
+
+    :param df: The deserialized items of all segments.
+    :param metrics: The metrics of each segment, in the order of segment.
+    """
+
+    df: pl.DataFrame = dataclasses.field()
+    metrics: T.List[SegmentMetrics] = dataclasses.field(default_factory=list)
+
+
+def iter_scan_pages(
+    client,
+    table_name: str,
+    segment: T.Optional[int] = None,
+    total_segments: T.Optional[int] = None,
+    **scan_kwargs,
+) -> T.Iterator[T.Dict[str, T.Any]]:
+    """
+    Call the ``scan`` API until there is no ``LastEvaluatedKey``, and yield
+    each page.
+    """
+    kwargs = dict(TableName=table_name, **scan_kwargs)
+    if total_segments is not None:
+        kwargs["Segment"] = segment
+        kwargs["TotalSegments"] = total_segments
+    while True:
+        page = client.scan(**kwargs)
+        yield page
+        if "LastEvaluatedKey" not in page:
+            break
+        kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+
+def parallel_scan(
+    client,
+    table_name: str,
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    total_segments: int = 4,
+    max_workers: T.Optional[int] = None,
+    target_rows: int = 100000,
+    paths: T.Optional[T.Iterable[str]] = None,
+    scan_kwargs: T.Optional[T.Dict[str, T.Any]] = None,
+) -> ParallelScanResult:
+    """
+    Scan the whole table with ``total_segments`` parallel segments, each
+    segment runs in a thread and deserializes its pages into polars
+    DataFrame in batches of ``target_rows`` (see
+    :func:`~fast_dynamodb_json.pages.deserialize_pages`). The DataFrames of
+    all segments are concatenated once at the end, without copying.
+    Example::
+
+        import boto3
+        from botocore.config import Config
+
+        # one client shared by all threads, with enough connections
+        client = boto3.client(
+            "dynamodb",
+            config=Config(max_pool_connections=total_segments),
+        )
+        res = parallel_scan(client, "my-table", simple_schema, total_segments=16)
+        res.df.write_parquet("my-table.parquet")
+
+    :param client: The ``boto3.client("dynamodb")``, it is thread safe and
+        shared by all segments.
+    :param table_name: The DynamoDB table name.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param total_segments: Number of segments.
+    :param max_workers: Number of threads, default is ``total_segments``.
+    :param target_rows: see :func:`~fast_dynamodb_json.pages.deserialize_pages`.
+    :param paths: see :func:`~fast_dynamodb_json.deserialize.deserialize`.
+    :param scan_kwargs: Additional arguments of the ``scan`` API, for example
+        ``FilterExpression`` or ``ConsistentRead``.
+
+    :return: see :class:`ParallelScanResult`.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    if paths is not None:
+        paths = tuple(paths)
+    if scan_kwargs is None:
+        scan_kwargs = dict()
+    if max_workers is None:
+        max_workers = total_segments
+
+    def scan_segment(
+        segment: int,
+    ) -> T.Tuple[T.List[pl.DataFrame], SegmentMetrics]:
+        start = time.perf_counter()
+        metrics = SegmentMetrics(segment=segment)
+        dfs = list()
+        for batch in deserialize_pages(
+            iter_scan_pages(
+                client,
+                table_name,
+                segment=segment,
+                total_segments=total_segments,
+                **scan_kwargs,
+            ),
+            compiled_schema,
+            target_rows=target_rows,
+            paths=paths,
+            output=OutputEnum.polars,
+        ):
+            dfs.append(batch.data)
+            metrics.n_pages += batch.n_pages
+            metrics.count += batch.count
+            metrics.scanned_count += batch.scanned_count
+        metrics.elapsed = time.perf_counter() - start
+        return dfs, metrics
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(scan_segment, range(total_segments)))
+
+    # each segment has at least one batch, even if the table is empty
+    dfs = [df for segment_dfs, _ in results for df in segment_dfs]
+    return ParallelScanResult(
+        df=pl.concat(dfs, how="vertical", rechunk=False),
+        metrics=[metrics for _, metrics in results],
+    )
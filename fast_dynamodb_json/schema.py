@@ -2,18 +2,105 @@
 
 """
 A simple schema definition system for DynamoDB item.
+
+All the types are immutable and hashable, so they can be used as the key of
+a cache, see :attr:`BaseType.fingerprint`.
 """
 
 import typing as T
+import hashlib
 import dataclasses
+from types import MappingProxyType
 
 import polars as pl
 
 from .sentinel import NOTHING
 
+# NOTHING is encoded with this fixed token in the fingerprint, so changing the
+# repr of the sentinel won't change the fingerprint of the types.
+_NOTHING_TOKEN = "Sentinel('NOTHING')"
+
+
+def _freeze(value: T.Any) -> T.Any:
+    """
+    Convert the list and dict in the value to tuple and read only
+    ``MappingProxyType``, recursively. A set is converted to a sorted tuple,
+    so its order doesn't depend on ``PYTHONHASHSEED``.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    elif isinstance(value, (set, frozenset)):
+        try:
+            values = sorted(value)
+        except TypeError:
+            values = sorted(value, key=repr)
+        return tuple(_freeze(v) for v in values)
+    elif isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _thaw(value: T.Any) -> T.Any:
+    """
+    The reverse of :func:`_freeze`, convert the value back to list and dict.
+    """
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    elif isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(frozen=True, eq=False)
 class BaseType:
+    """
+    The base class of all types. Two types are equal if they have the same
+    :attr:`fingerprint`.
+    """
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        A stable hash of the type, including the nested types and the
+        ``default_for_null`` values. It is computed only once, and it is
+        the same across processes (unlike the builtin :func:`hash` of ``str``).
+        """
+        try:
+            return self.__dict__["_fingerprint"]
+        except KeyError:
+            parts = list()
+            for field in dataclasses.fields(self):
+                value = getattr(self, field.name)
+                if isinstance(value, BaseType):
+                    value = value.fingerprint
+                elif isinstance(self, Struct) and field.name == "types":
+                    value = ", ".join(
+                        f"{k!r}: {v.fingerprint}" for k, v in value.items()
+                    )
+                elif value is NOTHING:
+                    value = _NOTHING_TOKEN
+                else:
+                    value = repr(_thaw(value))
+                parts.append(f"{field.name}={value}")
+            source = f"{self.__class__.__name__}({', '.join(parts)})"
+            fingerprint = hashlib.sha256(source.encode("utf-8")).hexdigest()
+            object.__setattr__(self, "_fingerprint", fingerprint)
+            return fingerprint
+
+    def __reduce__(self):
+        # the read only MappingProxyType can't be pickled, the fields are
+        # frozen again in __post_init__
+        args = tuple(_thaw(getattr(self, f.name)) for f in dataclasses.fields(self))
+        return (self.__class__, args)
+
+    def __eq__(self, other) -> bool:
+        if self.__class__ is not other.__class__:
+            return NotImplemented
+        return self.fingerprint == other.fingerprint
+
+    def __hash__(self) -> int:
+        return hash(self.fingerprint)
+
     def to_polars(self) -> T.Union[
         pl.Int64,
         pl.Float64,
@@ -33,7 +120,7 @@ class BaseType:
 DATA_TYPE = T.TypeVar("DATA_TYPE", bound=BaseType)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, eq=False)
 class Integer(BaseType):
     """
     :param default_for_null: The default value for null for serialization.
@@ -48,7 +135,7 @@ class Integer(BaseType):
         return pl.Struct({"N": pl.Utf8()})
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, eq=False)
 class Float(BaseType):
     """
     :param default_for_null: The default value for null for serialization
@@ -67,7 +154,7 @@ DEFAULT_NULL_STRING = ""
 DEFAULT_NULL_BINARY = b""
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, eq=False)
 class String(BaseType):
     """
     :param default_for_null: The default value for null for serialization.
@@ -82,7 +169,7 @@ class String(BaseType):
         return pl.Struct({"S": pl.Utf8()})
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, eq=False)
 class Binary(BaseType):
     """
     :param default_for_null: The default value for null for serialization.
@@ -97,7 +184,7 @@ class Binary(BaseType):
         return pl.Struct({"B": pl.Utf8()})
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, eq=False)
 class Bool(BaseType):
     """
     :param default_for_null: The default value for null for serialization
@@ -112,7 +199,7 @@ class Bool(BaseType):
         return pl.Struct({"BOOL": pl.Boolean()})
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, eq=False)
 class Null(BaseType):
     """
     :param default_for_null: The default value for null for serialization
@@ -127,7 +214,7 @@ class Null(BaseType):
         return pl.Struct({"NULL": pl.Boolean()})
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, eq=False)
 class Set(BaseType):
     """
     Example::
@@ -139,14 +226,17 @@ class Set(BaseType):
         })
 
     :param itype: The type of the elements in the set.
+    :param default_for_null: The default value for null for serialization,
+        it is stored as a tuple.
     """
 
     itype: BaseType = dataclasses.field(default=NOTHING)
-    default_for_null: T.Any = dataclasses.field(default_factory=list)
+    default_for_null: T.Any = dataclasses.field(default=())
 
     def __post_init__(self):
         if self.itype is NOTHING:
             raise ValueError("itype is required for Set")
+        object.__setattr__(self, "default_for_null", _freeze(self.default_for_null))
 
     def to_polars(self) -> pl.List:
         return pl.List(self.itype.to_polars())
@@ -165,7 +255,7 @@ class Set(BaseType):
         return pl.Struct({field: pl.List(pl.Utf8())})
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, eq=False)
 class List(BaseType):
     """
     Example::
@@ -177,14 +267,18 @@ class List(BaseType):
         })
 
     :param itype: The type of the elements in the list.
+    :param default_for_null: The default value for null for serialization,
+        it is stored as a tuple, the nested dict is stored as a read only
+        ``MappingProxyType``.
     """
 
     itype: BaseType = dataclasses.field(default=NOTHING)
-    default_for_null: T.Any = dataclasses.field(default_factory=list)
+    default_for_null: T.Any = dataclasses.field(default=())
 
     def __post_init__(self):
         if self.itype is NOTHING:  # pragma: no cover
             raise ValueError("itype is required for List")
+        object.__setattr__(self, "default_for_null", _freeze(self.default_for_null))
 
     def to_polars(self) -> pl.List:
         return pl.List(self.itype.to_polars())
@@ -193,7 +287,7 @@ class List(BaseType):
         return pl.Struct({"L": pl.List(self.itype.to_dynamodb_json_polars())})
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, eq=False)
 class Struct(BaseType):
     """
     Example:
@@ -212,14 +306,17 @@ class Struct(BaseType):
             })
         }),
 
-    :param types: The types of the fields in the struct.
+    :param types: The types of the fields in the struct. It is copied into a
+        read only ``MappingProxyType``, so changing the original dict later
+        won't change the struct, and the struct can't be changed in place.
     """
 
-    types: T.Dict[str, BaseType] = dataclasses.field(default=NOTHING)
+    types: T.Mapping[str, BaseType] = dataclasses.field(default=NOTHING)
 
     def __post_init__(self):
         if self.types is NOTHING:  # pragma: no cover
             raise ValueError("types is required for Struct")
+        object.__setattr__(self, "types", MappingProxyType(dict(self.types)))
 
     def to_polars(self) -> pl.Struct:
         return pl.Struct({k: v.to_polars() for k, v in self.types.items()})
@@ -232,3 +329,101 @@ class Struct(BaseType):
                 )
             }
         )
+
+
+def _parse_path(path: str) -> T.List[str]:
+    """
+    Parse a path like ``Items[].Price`` into ``["Items", "[]", "Price"]``.
+    """
+    tokens = list()
+    for part in path.split("."):
+        name = part
+        n_list = 0
+        while name.endswith("[]"):
+            name = name[:-2]
+            n_list += 1
+        if not name:
+            raise ValueError(f"invalid path {path!r}")
+        tokens.append(name)
+        tokens.extend(["[]"] * n_list)
+    return tokens
+
+
+def _select_types(
+    types: T.Dict[str, BaseType],
+    tokens_list: T.List[T.List[str]],
+    path: str,
+) -> T.Dict[str, BaseType]:
+    names = {tokens[0] for tokens in tokens_list}
+    for name in names:
+        if name not in types:
+            raise ValueError(f"attribute {name!r} not found in {path or 'schema'!r}")
+    new_types = dict()
+    for name, dtype in types.items():  # keep the original order
+        if name in names:
+            new_types[name] = _select_type(
+                dtype=dtype,
+                tokens_list=[tokens[1:] for tokens in tokens_list if tokens[0] == name],
+                path=f"{path}.{name}" if path else name,
+            )
+    return new_types
+
+
+def _select_type(
+    dtype: BaseType,
+    tokens_list: T.List[T.List[str]],
+    path: str,
+) -> BaseType:
+    # the whole value is selected
+    if any(len(tokens) == 0 for tokens in tokens_list):
+        return dtype
+    if isinstance(dtype, List):
+        if any(tokens[0] != "[]" for tokens in tokens_list):
+            raise ValueError(f"{path!r} is a List, use '{path}[]' to select into it")
+        itype = _select_type(
+            dtype=dtype.itype,
+            tokens_list=[tokens[1:] for tokens in tokens_list],
+            path=f"{path}[]",
+        )
+        return dataclasses.replace(dtype, itype=itype)
+    elif isinstance(dtype, Struct):
+        return Struct(_select_types(dtype.types, tokens_list, path))
+    else:
+        raise ValueError(
+            f"{path!r} is a {dtype.__class__.__name__}, it cannot be selected into"
+        )
+
+
+def select_paths(
+    simple_schema: T.Dict[str, BaseType],
+    paths: T.Iterable[str],
+) -> T.Dict[str, BaseType]:
+    """
+    Get a smaller schema that only has the given attribute paths. Nested
+    struct and list are pruned to the selected fields, other attributes
+    are removed. The order of attributes is always the same as the
+    original schema.
+
+    Example::
+
+        simple_schema = {
+            "OrderID": String(),
+            "Status": String(),
+            "ShippingAddress": Struct({"City": String(), "ZipCode": String()}),
+            "Items": List(Struct({"Name": String(), "Price": Float()})),
+        }
+        select_paths(simple_schema, ["OrderID", "ShippingAddress.City", "Items[].Price"])
+        # {
+        #     "OrderID": String(),
+        #     "ShippingAddress": Struct({"City": String()}),
+        #     "Items": List(Struct({"Price": Float()})),
+        # }
+
+    :param simple_schema: Schema of the data.
+    :param paths: List of attribute paths. Use ``.`` to access the field of
+        a struct, and ``[]`` to access the element of a list.
+    """
+    tokens_list = [_parse_path(path) for path in paths]
+    if len(tokens_list) == 0:
+        raise ValueError("paths cannot be empty")
+    return _select_types(simple_schema, tokens_list, "")
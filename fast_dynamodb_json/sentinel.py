@@ -62,4 +62,4 @@ def make_sentinel(name="_MISSING", var_name=None):  # pragma: no cover
     return Sentinel()
 
 
-NOTHING = make_sentinel(name="NOTHING")
+NOTHING = make_sentinel(name="NOTHING", var_name="NOTHING")
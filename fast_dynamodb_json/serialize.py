@@ -4,7 +4,12 @@
 See :func:`serialize` and :func:`serialize_df` for more details.
 """
 
+import io
 import typing as T
+import contextlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
 import polars as pl
 
 from .typehint import (
@@ -13,6 +18,7 @@ from .typehint import (
     T_SIMPLE_SCHEMA,
 )
 from .schema import (
+    _thaw,
     DATA_TYPE,
     Integer,
     Float,
@@ -24,6 +30,64 @@ from .schema import (
     List,
     Struct,
 )
+from .compiled import CompiledSchema, compile_schema
+from .sentinel import NOTHING
+from .output import OutputEnum, to_output
+from .utils import iter_chunks, compress
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+    import pyarrow as pa
+
+
+class NullPolicyEnum:
+    """
+    How to serialize a top level attribute which value is null.
+
+    - ``default``: fill it with the ``default_for_null`` of the type, for
+        example ``{"S": ""}``. The attribute is always in the item.
+    - ``omit``: drop the attribute from the item, so sparse items stay small.
+    - ``null``: serialize it as ``{"NULL": true}``.
+
+    With ``omit`` and ``null``, the null attribute is a null value in the
+    :func:`serialize_df` output, it is dropped or replaced when the
+    DataFrame is converted to dict, see :func:`to_dicts`. The nested values
+    in ``List`` and ``Struct`` always use ``default_for_null``.
+
+    A null value of a type without ``default_for_null``, for example
+    ``Integer()``, ``Float()`` or ``Bool()``, is serialized as
+    ``{"NULL": true}`` by :func:`to_dicts` and :func:`serialize_to_ndjson`,
+    at the top level and in ``List`` and ``Struct``. A null element of a
+    ``Set`` is dropped, because a set can't have ``NULL``.
+    """
+
+    default = "default"
+    omit = "omit"
+    null = "null"
+
+
+def _check_null_policy(null_policy: str):
+    if null_policy not in (
+        NullPolicyEnum.default,
+        NullPolicyEnum.omit,
+        NullPolicyEnum.null,
+    ):
+        raise ValueError(
+            f"invalid null_policy {null_policy!r}, must be one of "
+            f"{NullPolicyEnum.default!r}, {NullPolicyEnum.omit!r}, "
+            f"{NullPolicyEnum.null!r}"
+        )
+
+
+def _fill_null(expr: pl.Expr, default_for_null: T.Any) -> pl.Expr:
+    """
+    Fill null with ``default_for_null``, keep the null as it is if the
+    type doesn't have a default value. Then the DynamoDB JSON value is
+    ``{"N": null}``, it is replaced by ``{"NULL": true}`` in :func:`to_dicts`.
+    """
+    if default_for_null is NOTHING:
+        return expr
+    return expr.fill_null(_thaw(default_for_null))
 
 
 def get_selector(
@@ -46,56 +110,56 @@ def get_selector(
     # fmt: off
     if isinstance(dtype, Integer):
         if is_set:
-            return pl.element().fill_null(dtype.default_for_null).cast(pl.Utf8())
+            return _fill_null(pl.element(), dtype.default_for_null).cast(pl.Utf8())
         elif is_list:
             return pl.struct(
-                pl.element().fill_null(dtype.default_for_null).cast(pl.Utf8()).alias("N")
+                _fill_null(pl.element(), dtype.default_for_null).cast(pl.Utf8()).alias("N")
             )
         else:
             return pl.struct(
-                node.fill_null(dtype.default_for_null).cast(pl.Utf8).alias("N")
+                _fill_null(node, dtype.default_for_null).cast(pl.Utf8).alias("N")
             ).alias(name)
     elif isinstance(dtype, Float):
         if is_set:
-            return pl.element().fill_null(dtype.default_for_null).cast(pl.Utf8())
+            return _fill_null(pl.element(), dtype.default_for_null).cast(pl.Utf8())
         elif is_list:
             return pl.struct(
-                pl.element().fill_null(dtype.default_for_null).cast(pl.Utf8()).alias("N")
+                _fill_null(pl.element(), dtype.default_for_null).cast(pl.Utf8()).alias("N")
             )
         else:
             return pl.struct(
-                node.fill_null(pl.lit(dtype.default_for_null)).cast(pl.Utf8).alias("N")
+                _fill_null(node, dtype.default_for_null).cast(pl.Utf8).alias("N")
             ).alias(name)
     elif isinstance(dtype, String):
         if is_set:
-            return pl.element().fill_null(dtype.default_for_null)
+            return _fill_null(pl.element(), dtype.default_for_null)
         elif is_list:
             return pl.struct(
-                pl.element().fill_null(dtype.default_for_null).alias("S")
+                _fill_null(pl.element(), dtype.default_for_null).alias("S")
             )
         else:
             return pl.struct(
-                node.fill_null(pl.lit(dtype.default_for_null)).alias("S")
+                _fill_null(node, dtype.default_for_null).alias("S")
             ).alias(name)
     elif isinstance(dtype, Binary):
         if is_set:
-            return pl.element().fill_null(dtype.default_for_null).bin.encode("base64").cast(pl.Utf8())
+            return _fill_null(pl.element(), dtype.default_for_null).bin.encode("base64").cast(pl.Utf8())
         elif is_list:
             return pl.struct(
-                pl.element().fill_null(dtype.default_for_null).bin.encode("base64").cast(pl.Utf8).alias("B")
+                _fill_null(pl.element(), dtype.default_for_null).bin.encode("base64").cast(pl.Utf8).alias("B")
             )
         else:
             return pl.struct(
-                node.fill_null(pl.lit(dtype.default_for_null)).bin.encode("base64").cast(pl.Utf8).alias("B")
+                _fill_null(node, dtype.default_for_null).bin.encode("base64").cast(pl.Utf8).alias("B")
             ).alias(name)
     elif isinstance(dtype, Bool):
         if is_list:
             return pl.struct(
-                pl.element().fill_null(dtype.default_for_null).alias("BOOL")
+                _fill_null(pl.element(), dtype.default_for_null).alias("BOOL")
             )
         else:
             return pl.struct(
-                node.fill_null(pl.lit(dtype.default_for_null)).alias("BOOL")
+                _fill_null(node, dtype.default_for_null).alias("BOOL")
             ).alias(name)
     elif isinstance(dtype, Null):
         if is_list:
@@ -122,9 +186,11 @@ def get_selector(
         else:# pragma: no cover
             raise NotImplementedError
         expr = get_selector(name=None, dtype=dtype.itype, node=pl.element(), is_set=True)
-        final_expr = pl.struct(
-            node.fill_null(dtype.default_for_null).list.eval(expr).alias(field)
-        )
+        value = _fill_null(node, dtype.default_for_null)
+        if dtype.itype.default_for_null is NOTHING:
+            # a set can't have NULL element
+            value = value.list.drop_nulls()
+        final_expr = pl.struct(value.list.eval(expr).alias(field))
         if name:
             final_expr = final_expr.alias(name)
         return final_expr
@@ -135,7 +201,7 @@ def get_selector(
     elif isinstance(dtype, List):
         expr = get_selector(name=None, dtype=dtype.itype, node=pl.element(), is_list=True)
         final_expr = pl.struct(
-            node.fill_null(dtype.default_for_null).list.eval(expr).alias("L")
+            _fill_null(node, dtype.default_for_null).list.eval(expr).alias("L")
         )
         if name:
             final_expr = final_expr.alias(name)
@@ -161,8 +227,9 @@ def get_selector(
 
 def serialize_df(
     df: pl.DataFrame,
-    simple_schema: T_SIMPLE_SCHEMA,
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
     data_col: str = "Data",
+    null_policy: str = NullPolicyEnum.default,
 ) -> pl.DataFrame:
     """
     similar to :func:`serialize`, but work with polars DataFrame.
@@ -188,9 +255,14 @@ def serialize_df(
             },
         )
 
-    :param simple_schema: Schema of the data.
-    :param dynamodb_json_col: Name of the column that contains regular Python dict data.
+    :param simple_schema: Schema of the data, or the :class:`~fast_dynamodb_json.compiled.CompiledSchema`
+        of it. The selectors are built only once per schema, see
+        :func:`~fast_dynamodb_json.compiled.compile_schema`.
+    :param data_col: Name of the column that contains regular Python dict data.
         for example: "Data".
+    :param null_policy: ``"default"``, ``"omit"`` or ``"null"``, see
+        :class:`NullPolicyEnum`. With ``"omit"`` and ``"null"``, the null
+        attributes are null in the output, use :func:`to_dicts` to convert it.
 
     :return: polars DataFrame with columns of the DynamoDB JSON data. Sample dataframe::
 
@@ -202,26 +274,267 @@ def serialize_df(
         |              |              |                                         |                                           |
         +--------------+--------------+-----------------------------------------+-------------------------------------------+
     """
-    selectors = []
-
-    for name, dtype in simple_schema.items():
-        # print(f"--- expr of field({name!r}) ---")
-        selector = get_selector(
-            name=name,
-            dtype=dtype,
-            node=pl.col(data_col).struct.field(name),
+    _check_null_policy(null_policy)
+    compiled_schema = compile_schema(simple_schema)
+    selectors = compiled_schema.get_serialize_selectors(data_col, null_policy)
+    return df.with_columns(*selectors).drop(data_col)
+
+
+def serialize_lazy(
+    lf: pl.LazyFrame,
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    data_col: str = "Data",
+    null_policy: str = NullPolicyEnum.default,
+) -> pl.LazyFrame:
+    """
+    similar to :func:`serialize_df`, but work with polars LazyFrame. It only
+    adds the selectors to the query plan, nothing is computed until you
+    collect it. So it can be used with the streaming engine to process
+    data that doesn't fit in memory. Example::
+
+        import polars as pl
+
+        (
+            pl.scan_parquet("path/to/data.parquet")
+            .select(pl.struct(pl.all()).alias("Data"))
+            .pipe(serialize_lazy, simple_schema)
+            .sink_ndjson("path/to/data.json")
         )
-        # print(selector)
-        if selector is not None:
-            selectors.append(selector)
 
-    return df.with_columns(*selectors).drop(data_col)
+    :param lf: polars LazyFrame with a column of regular Python dict data.
+    :param simple_schema: Schema of the data, or the :class:`~fast_dynamodb_json.compiled.CompiledSchema`
+        of it.
+    :param data_col: Name of the column that contains regular Python dict data.
+    :param null_policy: see :func:`serialize_df`.
 
+    :return: polars LazyFrame with columns of the DynamoDB JSON data.
+    """
+    _check_null_policy(null_policy)
+    compiled_schema = compile_schema(simple_schema)
+    selectors = compiled_schema.get_serialize_selectors(data_col, null_policy)
+    return lf.with_columns(*selectors).drop(data_col)
 
-def serialize(
+
+def _to_output(
+    df: pl.DataFrame,
+    output: str,
+    null_policy: str,
+):
+    if output == OutputEnum.dicts:
+        return to_dicts(df, null_policy)
+    return to_output(df, output)
+
+
+def _has_set(dtype: DATA_TYPE) -> bool:
+    if isinstance(dtype, Set):
+        return True
+    elif isinstance(dtype, List):
+        return _has_set(dtype.itype)
+    elif isinstance(dtype, Struct):
+        return any(_has_set(vtype) for vtype in dtype.types.values())
+    return False
+
+
+def _convert_sets(value: T.Any, dtype: DATA_TYPE) -> T.Any:
+    """
+    Convert the Python ``set`` and ``frozenset`` of the ``Set`` attributes to
+    sorted list, recursively. polars doesn't accept ``set``, it would become
+    null silently.
+    """
+    if value is None:
+        return value
+    if isinstance(dtype, Set):
+        if isinstance(value, (set, frozenset)):
+            try:
+                return sorted(value)
+            except TypeError:  # pragma: no cover
+                return list(value)
+        return value
+    elif isinstance(dtype, List):
+        return [_convert_sets(v, dtype.itype) for v in value]
+    elif isinstance(dtype, Struct):
+        return _convert_record_sets(value, dtype.types)
+    return value  # pragma: no cover
+
+
+def _convert_record_sets(
+    record: T_ITEM,
+    types: T.Mapping[str, DATA_TYPE],
+) -> T_ITEM:
+    record = dict(record)
+    for name, dtype in types.items():
+        if _has_set(dtype) and name in record:
+            record[name] = _convert_sets(record[name], dtype)
+    return record
+
+
+def _serialize_records(
     records: T.Iterable[T_ITEM],
-    simple_schema: T_SIMPLE_SCHEMA,
+    compiled_schema: CompiledSchema,
+    null_policy: str = NullPolicyEnum.default,
+) -> pl.DataFrame:
+    data_col = "Data"
+    simple_schema = compiled_schema.simple_schema
+    set_types = {
+        name: dtype for name, dtype in simple_schema.items() if _has_set(dtype)
+    }
+    if set_types:
+        records = (_convert_record_sets(record, set_types) for record in records)
+    df = pl.DataFrame(
+        [{data_col: record} for record in records],
+        schema={data_col: compiled_schema.polars_struct},
+        strict=False,
+    )
+    # print(df.to_dicts()) # for debug only
+    return serialize_df(
+        df=df,
+        simple_schema=compiled_schema,
+        data_col=data_col,
+        null_policy=null_policy,
+    )
+
+
+_TYPE_FIELDS = ("S", "N", "B", "BOOL", "NULL", "SS", "NS", "BS", "L", "M")
+
+
+def _get_null_value_selector(
+    dtype: pl.DataType,
+    node: pl.Expr,
+) -> pl.Expr:
+    """
+    Get a polars expression that tells whether the serialized DynamoDB JSON
+    value, or any nested value in it, is a null value of a type without
+    ``default_for_null``, for example ``{"N": null}``. The polars ``dtype``
+    of the value tells its DynamoDB JSON type, so no schema is needed.
+    """
+    ((field, field_dtype),) = [(f.name, f.dtype) for f in dtype.fields]
+    value = node.struct.field(field)
+    conditions = [node.is_not_null() & value.is_null()]
+    if field == "L":
+        element = _get_null_value_selector(field_dtype.inner, pl.element())
+        conditions.append(value.list.eval(element).list.any())
+    elif field == "M":
+        for f in field_dtype.fields:
+            conditions.append(
+                _get_null_value_selector(f.dtype, value.struct.field(f.name))
+            )
+    return pl.any_horizontal(*conditions).fill_null(False)
+
+
+def _fix_null_value(value: T.Optional[T_JSON]) -> T.Optional[T_JSON]:
+    """
+    Replace the ``{"N": None}`` like DynamoDB JSON value by
+    ``{"NULL": True}``, recursively.
+    """
+    if value is None:  # an attribute dropped by the null policy
+        return value
+    ((field, v),) = value.items()
+    if v is None:
+        return {"NULL": True}
+    elif field == "L":
+        return {"L": [_fix_null_value(element) for element in v]}
+    elif field == "M":
+        return {"M": {key: _fix_null_value(element) for key, element in v.items()}}
+    else:
+        return value
+
+
+def _fix_null_items(
+    df: pl.DataFrame,
+    items: T.List[T_JSON],
 ) -> T.List[T_JSON]:
+    """
+    Fix the items that have a null value of a type without
+    ``default_for_null``, only these items are visited in Python.
+    """
+    selectors = [
+        _get_null_value_selector(dtype, pl.col(name))
+        for name, dtype in df.schema.items()
+        if isinstance(dtype, pl.Struct)
+    ]
+    if not selectors:
+        return items
+    flags = df.select(pl.any_horizontal(*selectors).alias("flag")).to_series()
+    for index in flags.arg_true().to_list():
+        items[index] = {
+            name: _fix_null_value(value) for name, value in items[index].items()
+        }
+    return items
+
+
+def _fix_null_json(data: bytes) -> bytes:
+    """
+    Same as :func:`_fix_null_items`, but work with the newline delimited JSON
+    written by polars. ``{"N":null}`` can't be in a JSON string, where the
+    double quotes are escaped.
+    """
+    for field in _TYPE_FIELDS:
+        data = data.replace(b'{"%s":null}' % field.encode(), b'{"NULL":true}')
+    return data
+
+
+def to_dicts(
+    df: pl.DataFrame,
+    null_policy: str = NullPolicyEnum.omit,
+) -> T.List[T_JSON]:
+    """
+    Convert the output of :func:`serialize_df` to a list of DynamoDB JSON
+    dict. A null attribute is dropped from the item (``"omit"``) or
+    replaced by ``{"NULL": True}`` (``"null"``).
+
+    The rows are grouped by the set of non null attributes, each group is
+    converted with only its attributes, then the items are put back in the
+    original order. Sparse items usually have only a few distinct sets of
+    attributes, so there is no Python pass to clean up each item.
+
+    A null value of a type without ``default_for_null``, for example
+    ``{"N": None}``, is replaced by ``{"NULL": True}``, only the items that
+    have it are visited in Python.
+    """
+    _check_null_policy(null_policy)
+    if null_policy == NullPolicyEnum.default:
+        return _fix_null_items(df, df.to_dicts())
+    columns = df.columns
+    # a "0" / "1" string of the presence of each attribute
+    mask = df.select(
+        pl.concat_str(
+            [pl.col(name).is_not_null().cast(pl.Int8).cast(pl.Utf8) for name in columns]
+        ).alias("mask")
+    )
+    groups = (
+        mask.with_row_index("index")
+        .group_by("mask", maintain_order=True)
+        .agg("index")
+    )
+    items = [None] * df.height
+    for key, indices in groups.iter_rows():
+        if null_policy == NullPolicyEnum.omit:
+            selectors = [name for name, flag in zip(columns, key) if flag == "1"]
+        else:
+            selectors = [
+                (
+                    pl.col(name)
+                    if flag == "1"
+                    else pl.struct(pl.lit(True).alias("NULL")).alias(name)
+                )
+                for name, flag in zip(columns, key)
+            ]
+        for index, item in zip(indices, df[indices].select(selectors).to_dicts()):
+            items[index] = item
+    return _fix_null_items(df, items)
+
+
+def serialize(
+    records: T.Iterable[T_ITEM],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    output: str = OutputEnum.dicts,
+    null_policy: str = NullPolicyEnum.default,
+) -> T.Union[
+    T.List[T_JSON],
+    pl.DataFrame,
+    "pa.Table",
+    T.Dict[str, T.Union["np.ndarray", T.List[T.Any]]],
+]:
     """
     Convert regular Python dict data to DynamoDB JSON dict.
 
@@ -252,7 +565,13 @@ def serialize(
             }),
         }
 
-    :return: List of DynamoDB JSON data. Example::
+    :param output: ``"dicts"`` (default), ``"polars"``, ``"arrow"`` or
+        ``"columns"``, see :func:`~fast_dynamodb_json.output.to_output`.
+        The other modes skip the Python object creation of ``to_dicts()``.
+    :param null_policy: ``"default"``, ``"omit"`` or ``"null"``, how to
+        serialize a null attribute, see :class:`NullPolicyEnum`.
+
+    :return: List of DynamoDB JSON data (for ``output="dicts"``). Example::
 
         result = [
             {
@@ -274,14 +593,141 @@ def serialize(
             ...
         ]
     """
-    data_col = "Data"
-    polars_schema = {k: vtype.to_polars() for k, vtype in simple_schema.items()}
-    # print(f"{polars_schema = }") # for debug only
-    df = pl.DataFrame(
-        [{data_col: record} for record in records],
-        schema={data_col: pl.Struct(polars_schema)},
-        strict=False,
+    compiled_schema = compile_schema(simple_schema)
+    df = _serialize_records(records, compiled_schema, null_policy)
+    return _to_output(df, output, null_policy)
+
+
+def serialize_to_arrow(
+    records: T.Iterable[T_ITEM],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+) -> "pa.Table":
+    """
+    Shortcut of :func:`serialize` with ``output="arrow"``, convert regular
+    Python dict data into ``pyarrow.Table`` of DynamoDB JSON without copying
+    the polars buffers.
+
+    It requires ``pyarrow`` to be installed.
+    """
+    return serialize(
+        records=records,
+        simple_schema=simple_schema,
+        output=OutputEnum.arrow,
     )
-    # print(df.to_dicts()) # for debug only
-    df = serialize_df(df=df, simple_schema=simple_schema, data_col=data_col)
-    return df.to_dicts()
+
+
+def iter_serialize(
+    records: T.Iterable[T_ITEM],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    chunk_size: int = 10000,
+    output: str = OutputEnum.dicts,
+    per_row: bool = False,
+    null_policy: str = NullPolicyEnum.default,
+) -> T.Iterator[T.Union[T.List[T_JSON], T_JSON, pl.DataFrame, "pa.Table"]]:
+    """
+    Similar to :func:`serialize`, but pull ``chunk_size`` records at a time
+    from ``records`` and yield the result of each chunk. The peak memory is
+    bounded by the chunk size instead of the total number of records.
+
+    :param records: Iterable of regular Python dict data.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param chunk_size: Number of records to serialize at a time.
+    :param output: see :func:`serialize`, the output type of each chunk.
+    :param per_row: Yield each DynamoDB JSON dict instead of a list of them per
+        chunk, only works with ``output="dicts"``.
+    :param null_policy: see :func:`serialize`.
+    """
+    if per_row and output != OutputEnum.dicts:
+        raise ValueError("per_row=True only works with output='dicts'")
+    compiled_schema = compile_schema(simple_schema)
+    for chunk in iter_chunks(records, chunk_size):
+        df = _serialize_records(chunk, compiled_schema, null_policy)
+        result = _to_output(df, output, null_policy)
+        if per_row:
+            yield from result
+        else:
+            yield result
+
+
+def serialize_to_ndjson(
+    records_or_df: T.Union[T.Iterable[T_ITEM], pl.DataFrame],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    file: T.Optional[T.Union[str, Path, T.BinaryIO]] = None,
+    wrap_item: bool = True,
+    compression: T.Optional[str] = None,
+    data_col: str = "Data",
+    chunk_size: int = 100000,
+    max_workers: T.Optional[int] = None,
+) -> T.Optional[bytes]:
+    """
+    Serialize data to newline delimited DynamoDB JSON with the native polars
+    JSON writer, without creating the Python dict and ``json.dumps`` them
+    one by one. It is the format of the
+    `DynamoDB import from S3 <https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/S3DataImport.Format.html>`_.
+    Example::
+
+        serialize_to_ndjson(
+            records,
+            simple_schema,
+            file="data.json.gz",
+            compression="gzip",
+        )
+
+    :param records_or_df: List of regular Python dict data, or a polars
+        DataFrame with a column of regular Python dict data, see
+        :func:`serialize_df`.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param file: Path or binary file object to write to. If None, return the
+        bytes.
+    :param wrap_item: Wrap each line as ``{"Item": {...}}``, which is
+        required by DynamoDB import from S3.
+    :param compression: None, ``"gzip"`` or ``"zstd"``, see
+        :func:`~fast_dynamodb_json.utils.compress`.
+    :param data_col: Name of the column that contains regular Python dict
+        data, only used if ``records_or_df`` is a DataFrame. The other
+        columns are ignored.
+    :param chunk_size: Number of rows per compressed chunk. The chunks are
+        written and compressed in parallel threads, and concatenated in order.
+    :param max_workers: Max number of threads to compress the chunks.
+
+    :return: The bytes if ``file`` is None, otherwise None.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    if isinstance(records_or_df, pl.DataFrame):
+        # only the serialized attributes are written, not the other columns
+        df = serialize_df(
+            df=records_or_df.select(data_col),
+            simple_schema=compiled_schema,
+            data_col=data_col,
+        )
+    else:
+        df = _serialize_records(records_or_df, compiled_schema)
+    if wrap_item:
+        df = df.select(pl.struct(pl.all()).alias("Item"))
+
+    def write_chunk(chunk: pl.DataFrame) -> bytes:
+        buffer = io.BytesIO()
+        chunk.write_ndjson(buffer)
+        return compress(_fix_null_json(buffer.getvalue()), compression)
+
+    with contextlib.ExitStack() as stack:
+        if file is None:
+            f = io.BytesIO()
+        elif isinstance(file, (str, Path)):
+            f = stack.enter_context(open(file, "wb"))
+        else:
+            f = file
+        if compression is None:
+            f.write(write_chunk(df))
+        else:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers))
+            for data in executor.map(
+                write_chunk,
+                df.iter_slices(n_rows=chunk_size),
+            ):
+                f.write(data)
+        if file is None:
+            return f.getvalue()
+    return None
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compute the DynamoDB item size of the serialized DynamoDB JSON columns with
+polars expressions, following the
+`item size rules <https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/CapacityUnitCalculations.html>`_:
+
+- String: the number of UTF-8 bytes.
+- Number: 1 byte per two significant digits, plus 1 byte, plus 1 byte if
+    negative. Leading and trailing zeros are trimmed.
+- Binary: the number of raw bytes.
+- Boolean and Null: 1 byte.
+- Set: the sum of the size of the elements.
+- List and Map: 3 bytes of overhead, plus 1 byte per element, plus the size
+    of the elements, the name of the Map keys are counted too.
+- Attribute: the number of UTF-8 bytes of the name plus the size of the value.
+
+A top level attribute which value is null is dropped (``null_policy="omit"``)
+and adds nothing to the item size, or is ``{"NULL": true}``
+(``null_policy="null"``) and counts as 1 byte, see
+:class:`~fast_dynamodb_json.serialize.NullPolicyEnum`. A null value of a type
+without ``default_for_null``, for example ``{"N": null}``, is serialized as
+``{"NULL": true}`` and counts as 1 byte too.
+
+The `capacity units <https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/provisioned-capacity-mode.html>`_
+are derived from the item size, see :func:`item_size`.
+"""
+
+import typing as T
+
+import polars as pl
+
+from .typehint import T_SIMPLE_SCHEMA
+from .schema import (
+    DATA_TYPE,
+    Integer,
+    Float,
+    String,
+    Binary,
+    Bool,
+    Null,
+    Set,
+    List,
+    Struct,
+)
+from .compiled import CompiledSchema, compile_schema
+from .serialize import NullPolicyEnum
+
+T_FRAME = T.TypeVar("T_FRAME", pl.DataFrame, pl.LazyFrame)
+
+ITEM_SIZE_COL = "ItemSize"
+RCU_COL = "ReadCapacityUnits"
+WCU_COL = "WriteCapacityUnits"
+
+RCU_UNIT = 4 * 1024
+WCU_UNIT = 1024
+
+
+def _number_size(expr: pl.Expr) -> pl.Expr:
+    """
+    Size of the number in the ``N`` string, e.g. ``"-123.450"``, ``"1e+20"``.
+    """
+    digits = (
+        expr.str.replace(r"[eE].*$", "")
+        .str.replace_all(r"[^0-9]", "")
+        .str.strip_chars("0")
+        .str.len_bytes()
+        .cast(pl.Int64)
+    )
+    return (digits + 1) // 2 + 1 + expr.str.starts_with("-").cast(pl.Int64)
+
+
+def _binary_size(expr: pl.Expr) -> pl.Expr:
+    """
+    Size of the raw bytes of the base64 encoded ``B`` string.
+    """
+    return (
+        expr.str.len_bytes().cast(pl.Int64) // 4 * 3
+        - expr.str.count_matches("=").cast(pl.Int64)
+    )
+
+
+def _string_size(expr: pl.Expr) -> pl.Expr:
+    return expr.str.len_bytes().cast(pl.Int64)
+
+
+def _when_not_null(
+    value: pl.Expr,
+    size: T.Union[pl.Expr, int],
+) -> pl.Expr:
+    if isinstance(size, int):
+        size = pl.lit(size, dtype=pl.Int64)
+    return pl.when(value.is_not_null()).then(size)
+
+
+def _leaf_size(
+    node: pl.Expr,
+    field: str,
+    get_size: T.Callable[[pl.Expr], pl.Expr],
+) -> pl.Expr:
+    """
+    Size of a scalar value, a null value such as ``{"N": null}`` is
+    serialized as ``{"NULL": true}``, which is 1 byte.
+    """
+    value = node.struct.field(field)
+    return _when_not_null(
+        node,
+        pl.when(value.is_not_null()).then(get_size(value)).otherwise(1),
+    )
+
+
+def get_value_size_selector(
+    dtype: DATA_TYPE,
+    node: pl.Expr,
+) -> pl.Expr:
+    """
+    Get a polars expression that computes the size in bytes of a serialized
+    DynamoDB JSON value, for example ``{"S": "hello"}``, without the
+    attribute name. The result is null if the value is null.
+
+    :param dtype: The type of the value.
+    :param node: The polars expression of the DynamoDB JSON value.
+    """
+    # fmt: off
+    if isinstance(dtype, (Integer, Float)):
+        return _leaf_size(node, "N", _number_size)
+    elif isinstance(dtype, String):
+        return _leaf_size(node, "S", _string_size)
+    elif isinstance(dtype, Binary):
+        return _leaf_size(node, "B", _binary_size)
+    elif isinstance(dtype, Bool):
+        return _when_not_null(node, 1)
+    elif isinstance(dtype, Null):
+        return _when_not_null(node.struct.field("NULL"), 1)
+    elif isinstance(dtype, Set):
+        if isinstance(dtype.itype, String):
+            field, size = "SS", _string_size(pl.element())
+        elif isinstance(dtype.itype, (Integer, Float)):
+            field, size = "NS", _number_size(pl.element())
+        elif isinstance(dtype.itype, Binary):
+            field, size = "BS", _binary_size(pl.element())
+        else:  # pragma: no cover
+            raise NotImplementedError
+        value = node.struct.field(field)
+        return _when_not_null(value, value.list.eval(size).list.sum())
+    elif isinstance(dtype, List):
+        value = node.struct.field("L")
+        size = get_value_size_selector(dtype.itype, pl.element()).fill_null(0) + 1
+        return _when_not_null(value, 3 + value.list.eval(size).list.sum())
+    elif isinstance(dtype, Struct):
+        value = node.struct.field("M")
+        sizes = [
+            _when_not_null(
+                value.struct.field(key),
+                get_value_size_selector(vtype, value.struct.field(key))
+                + (len(key.encode("utf-8")) + 1),
+            )
+            for key, vtype in dtype.types.items()
+        ]
+        return _when_not_null(value, 3 + pl.sum_horizontal(*sizes))
+    else:  # pragma: no cover
+        raise NotImplementedError
+    # fmt: on
+
+
+def get_item_size_selector(
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    alias: str = ITEM_SIZE_COL,
+    null_policy: str = NullPolicyEnum.default,
+) -> pl.Expr:
+    """
+    Get a polars expression that computes the DynamoDB item size in bytes of
+    each row, from the serialized DynamoDB JSON columns, the output of
+    :func:`~fast_dynamodb_json.serialize.serialize_df`.
+
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param alias: Name of the output column.
+    :param null_policy: The ``null_policy`` used to serialize the data, a
+        null attribute is 1 byte with ``"null"``, and absent otherwise.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    sizes = list()
+    for name, dtype in compiled_schema.simple_schema.items():
+        size = get_value_size_selector(dtype, pl.col(name))
+        if null_policy == NullPolicyEnum.null:
+            # the null attribute is {"NULL": true}
+            size = size.fill_null(1)
+        sizes.append(size + len(name.encode("utf-8")))
+    return pl.sum_horizontal(*sizes).alias(alias)
+
+
+def get_capacity_unit_selectors(
+    size_col: str = ITEM_SIZE_COL,
+) -> T.List[pl.Expr]:
+    """
+    Get the polars expressions that compute the read and write capacity
+    units of an item from its size in bytes:
+
+    - ``ReadCapacityUnits``: strongly consistent read, 1 unit per 4KB,
+        rounded up. An eventually consistent read costs half of it, a
+        transactional read costs twice of it.
+    - ``WriteCapacityUnits``: standard write, 1 unit per 1KB, rounded up.
+        A transactional write costs twice of it.
+    """
+    size = pl.col(size_col)
+    return [
+        ((size + RCU_UNIT - 1) // RCU_UNIT).alias(RCU_COL),
+        ((size + WCU_UNIT - 1) // WCU_UNIT).alias(WCU_COL),
+    ]
+
+
+def item_size(
+    frame: T_FRAME,
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    data_col: str = "Data",
+    null_policy: str = NullPolicyEnum.default,
+) -> T_FRAME:
+    """
+    Compute the DynamoDB item size and capacity units of each row of regular
+    Python dict data, without creating any Python object. It works with
+    both DataFrame and LazyFrame, so sizing a large backfill is a
+    vectorized aggregation::
+
+        (
+            item_size(lf, simple_schema)
+            .select(pl.col("WriteCapacityUnits").sum())
+            .collect()
+        )
+
+    :param frame: polars DataFrame or LazyFrame with a column of regular
+        Python dict data, see :func:`~fast_dynamodb_json.serialize.serialize_df`.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param data_col: Name of the column that contains regular Python dict data.
+    :param null_policy: How the null attributes are serialized, see
+        :class:`~fast_dynamodb_json.serialize.NullPolicyEnum`.
+
+    :return: The frame where ``data_col`` is replaced by the ``ItemSize``,
+        ``ReadCapacityUnits`` and ``WriteCapacityUnits`` columns, see
+        :func:`get_capacity_unit_selectors`. The size is computed on the
+        serialized data, so the ``default_for_null`` values are counted.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    return (
+        frame.with_columns(
+            *compiled_schema.get_serialize_selectors(data_col, null_policy)
+        )
+        .drop(data_col)
+        .with_columns(
+            get_item_size_selector(compiled_schema, null_policy=null_policy)
+        )
+        .with_columns(*get_capacity_unit_selectors())
+        .drop(list(compiled_schema.simple_schema))
+    )
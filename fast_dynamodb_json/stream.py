@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+"""
+Deserialize the DynamoDB Streams records, for example, the
+``event["Records"]`` of a Lambda function triggered by DynamoDB Streams.
+A record looks like::
+
+    {
+        "eventID": "c4ca4238a0b923820dcc509a6f75849b",
+        "eventName": "MODIFY", # INSERT | MODIFY | REMOVE
+        "eventSource": "aws:dynamodb",
+        "dynamodb": {
+            "ApproximateCreationDateTime": 1479499740,
+            "Keys": {"pk": {"S": "pk1"}},
+            "NewImage": {"pk": {"S": "pk1"}, ...},
+            "OldImage": {"pk": {"S": "pk1"}, ...},
+            "SequenceNumber": "13021600000000001596893679",
+            "SizeBytes": 112,
+            "StreamViewType": "NEW_AND_OLD_IMAGES",
+        },
+        ...
+    }
+
+Tables that use Kinesis Data Streams for change data capture deliver the
+same record as a base64 encoded JSON payload (without ``SequenceNumber``),
+see :func:`deserialize_kinesis_records`.
+
+See :func:`deserialize_stream_records` for more details.
+"""
+
+import typing as T
+
+import polars as pl
+
+from .typehint import T_SIMPLE_SCHEMA
+from .compiled import CompiledSchema, compile_schema
+from .export import (
+    KEYS_COL,
+    NEW_IMAGE_COL,
+    OLD_IMAGE_COL,
+    get_key_schema,
+)
+
+EVENT_ID_COL = "eventID"
+EVENT_NAME_COL = "eventName"
+DYNAMODB_COL = "dynamodb"
+APPROXIMATE_CREATION_DATE_TIME_COL = "ApproximateCreationDateTime"
+SEQUENCE_NUMBER_COL = "SequenceNumber"
+SIZE_BYTES_COL = "SizeBytes"
+
+
+def get_stream_record_polars_schema(
+    compiled_schema: CompiledSchema,
+    key_schema: CompiledSchema,
+) -> T.Dict[str, pl.DataType]:
+    """
+    Get the polars schema of the DynamoDB Streams records.
+    """
+    return {
+        EVENT_ID_COL: pl.Utf8(),
+        EVENT_NAME_COL: pl.Utf8(),
+        DYNAMODB_COL: pl.Struct(
+            {
+                APPROXIMATE_CREATION_DATE_TIME_COL: pl.Float64(),
+                KEYS_COL: key_schema.dynamodb_json_polars_struct,
+                NEW_IMAGE_COL: compiled_schema.dynamodb_json_polars_struct,
+                OLD_IMAGE_COL: compiled_schema.dynamodb_json_polars_struct,
+                SEQUENCE_NUMBER_COL: pl.Utf8(),
+                SIZE_BYTES_COL: pl.Int64(),
+            }
+        ),
+    }
+
+
+def deserialize_stream_df(
+    df: pl.DataFrame,
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    key_attributes: T.Sequence[str],
+    latest_only: bool = False,
+) -> pl.DataFrame:
+    """
+    similar to :func:`deserialize_stream_records`, but work with polars
+    DataFrame that has the ``eventID``, ``eventName`` and ``dynamodb``
+    columns, see :func:`get_stream_record_polars_schema`.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    key_schema = compile_schema(get_key_schema(compiled_schema, key_attributes))
+    df = df.unnest(DYNAMODB_COL).select(
+        EVENT_ID_COL,
+        EVENT_NAME_COL,
+        SEQUENCE_NUMBER_COL,
+        APPROXIMATE_CREATION_DATE_TIME_COL,
+        SIZE_BYTES_COL,
+        key_schema.get_deserialize_struct_selector(KEYS_COL),
+        compiled_schema.get_deserialize_struct_selector(NEW_IMAGE_COL),
+        compiled_schema.get_deserialize_struct_selector(OLD_IMAGE_COL),
+    )
+    if latest_only:
+        # SequenceNumber is a string of up to 40 digits, it doesn't fit in
+        # Int64, compare by length first, then by string.
+        df = df.sort(
+            pl.col(SEQUENCE_NUMBER_COL).str.len_bytes(),
+            pl.col(SEQUENCE_NUMBER_COL),
+            maintain_order=True,
+        ).unique(subset=[KEYS_COL], keep="last", maintain_order=True)
+    return df
+
+
+def deserialize_stream_records(
+    records: T.Iterable[T.Dict[str, T.Any]],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    key_attributes: T.Sequence[str],
+    latest_only: bool = False,
+) -> pl.DataFrame:
+    """
+    Deserialize a batch of DynamoDB Streams records into one polars DataFrame
+    in one vectorized call, instead of calling
+    :func:`~fast_dynamodb_json.deserialize.deserialize` for each image of
+    each record.
+
+    Example::
+
+        def lambda_handler(event, context):
+            df = deserialize_stream_records(
+                event["Records"],
+                simple_schema,
+                key_attributes=["pk"],
+                latest_only=True,
+            )
+
+    :param records: List of DynamoDB Streams records.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param key_attributes: The name of the partition key and the sort key
+        (if any) of the table, for example ``["pk", "sk"]``.
+    :param latest_only: Only keep the latest record (by ``SequenceNumber``)
+        of each key if True.
+
+    :return: polars DataFrame with columns:
+
+        - ``eventID``: String.
+        - ``eventName``: String, ``INSERT``, ``MODIFY`` or ``REMOVE``.
+        - ``SequenceNumber``: String.
+        - ``ApproximateCreationDateTime``: Float64, the epoch seconds.
+        - ``SizeBytes``: Int64.
+        - ``Keys``: Struct of the key attributes.
+        - ``NewImage``: Struct of all attributes, null if it doesn't exist.
+        - ``OldImage``: Struct of all attributes, null if it doesn't exist.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    key_schema = compile_schema(get_key_schema(compiled_schema, key_attributes))
+    df = pl.DataFrame(
+        list(records),
+        schema=get_stream_record_polars_schema(compiled_schema, key_schema),
+        strict=False,
+    )
+    return deserialize_stream_df(
+        df=df,
+        simple_schema=compiled_schema,
+        key_attributes=key_attributes,
+        latest_only=latest_only,
+    )
+
+
+def deserialize_kinesis_records(
+    data: T.Union[T.Iterable[T.Union[bytes, str]], pl.Series],
+    simple_schema: T.Union[T_SIMPLE_SCHEMA, CompiledSchema],
+    key_attributes: T.Sequence[str],
+    latest_only: bool = False,
+) -> pl.DataFrame:
+    """
+    Deserialize a batch of Kinesis Data Streams records of a DynamoDB table
+    into one polars DataFrame. The base64 decoding and the JSON parsing are
+    done column-wise by polars, no Python dict is created per record.
+
+    Example::
+
+        def lambda_handler(event, context):
+            df = deserialize_kinesis_records(
+                [record["kinesis"]["data"] for record in event["Records"]],
+                simple_schema,
+                key_attributes=["pk"],
+                latest_only=True,
+            )
+
+    :param data: List of the base64 encoded payloads, ``bytes`` or ``str``,
+        or a polars Series of them.
+    :param simple_schema: Schema of the data, or the
+        :class:`~fast_dynamodb_json.compiled.CompiledSchema` of it.
+    :param key_attributes: The name of the partition key and the sort key
+        (if any) of the table, for example ``["pk", "sk"]``.
+    :param latest_only: Only keep the latest record of each key if True. Kinesis
+        records don't have ``SequenceNumber``, they are ordered by
+        ``ApproximateCreationDateTime``, then by the order in ``data``.
+
+    :return: polars DataFrame with the same columns as
+        :func:`deserialize_stream_records`, except ``SequenceNumber``.
+        ``ApproximateCreationDateTime`` is the epoch milliseconds.
+    """
+    compiled_schema = compile_schema(simple_schema)
+    key_schema = compile_schema(get_key_schema(compiled_schema, key_attributes))
+    if isinstance(data, pl.Series):
+        series = data
+    else:
+        data = list(data)
+        if data and isinstance(data[0], bytes):
+            dtype = pl.Binary
+        else:  # str, or an empty batch
+            dtype = pl.Utf8
+        series = pl.Series(data, dtype=dtype)
+    if series.dtype == pl.Binary:
+        series = series.bin.decode("base64")
+    else:
+        series = series.str.decode("base64")
+    df = (
+        series.cast(pl.Utf8)
+        .str.json_decode(
+            pl.Struct(get_stream_record_polars_schema(compiled_schema, key_schema))
+        )
+        .struct.unnest()
+    )
+    df = deserialize_stream_df(
+        df=df,
+        simple_schema=compiled_schema,
+        key_attributes=key_attributes,
+    ).drop(SEQUENCE_NUMBER_COL)
+    if latest_only:
+        df = df.sort(
+            APPROXIMATE_CREATION_DATE_TIME_COL,
+            maintain_order=True,
+        ).unique(subset=[KEYS_COL], keep="last", maintain_order=True)
+    return df
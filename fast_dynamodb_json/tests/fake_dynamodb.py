@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+Fake DynamoDB clients and paginators for testing, they return canned
+responses in the same shape as the boto3 / aiobotocore ``Scan``, ``Query``
+and ``BatchWriteItem`` response.
+"""
+
+import json
+import random
+import typing as T
+import asyncio
+import threading
+
+from ..typehint import T_JSON
+
+
+def make_pages(
+    items: T.List[T_JSON],
+    page_size: int,
+    key_attributes: T.Sequence[str] = ("pk",),
+) -> T.List[T.Dict[str, T.Any]]:
+    """
+    Split the DynamoDB JSON items into pages of ``page_size`` items, each
+    page has ``Items``, ``Count``, ``ScannedCount`` and, except the last one,
+    ``LastEvaluatedKey``.
+    """
+    pages = list()
+    for i in range(0, max(len(items), 1), page_size):
+        page_items = items[i : i + page_size]
+        page = {
+            "Items": page_items,
+            "Count": len(page_items),
+            "ScannedCount": len(page_items),
+        }
+        if i + page_size < len(items):
+            page["LastEvaluatedKey"] = {
+                name: page_items[-1][name] for name in key_attributes
+            }
+        pages.append(page)
+    return pages
+
+
+class FakeAsyncPaginator:
+    """
+    An async iterator of pages, it sleeps ``delay`` seconds before
+    returning each page to simulate the network latency.
+    """
+
+    def __init__(
+        self,
+        pages: T.List[T.Dict[str, T.Any]],
+        delay: float = 0,
+    ):
+        self.pages = pages
+        self.delay = delay
+
+    async def __aiter__(self):
+        for page in self.pages:
+            await asyncio.sleep(self.delay)
+            yield page
+
+
+class FakeDynamoDBClient:
+    """
+    A fake ``boto3.client("dynamodb")``.
+
+    - ``scan`` serves the ``items``, in pages of ``page_size`` items. The
+        items of segment ``i`` are ``items[i::TotalSegments]``.
+    - ``batch_write_item`` writes into ``table``, a dict keyed by the
+        primary key. Each put / delete request is randomly returned in
+        ``UnprocessedItems`` at ``unprocessed_rate``.
+    """
+
+    def __init__(
+        self,
+        items: T.Optional[T.List[T_JSON]] = None,
+        page_size: int = 100,
+        key_attributes: T.Sequence[str] = ("pk",),
+        unprocessed_rate: float = 0.0,
+        seed: T.Optional[int] = None,
+    ):
+        if items is None:
+            items = list()
+        self.items = items
+        self.page_size = page_size
+        self.key_attributes = key_attributes
+        self.unprocessed_rate = unprocessed_rate
+        self.scan_calls: T.List[T.Dict[str, T.Any]] = list()
+        self.table: T.Dict[str, T_JSON] = dict()
+        self.n_batch_write_calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def scan(self, **kwargs) -> T.Dict[str, T.Any]:
+        self.scan_calls.append(kwargs)
+        segment = kwargs.get("Segment", 0)
+        total_segments = kwargs.get("TotalSegments", 1)
+        pages = make_pages(
+            self.items[segment::total_segments],
+            page_size=self.page_size,
+            key_attributes=self.key_attributes,
+        )
+        start_key = kwargs.get("ExclusiveStartKey")
+        if start_key is None:
+            return pages[0]
+        for i, page in enumerate(pages):
+            if page.get("LastEvaluatedKey") == start_key:
+                return pages[i + 1]
+        raise ValueError(f"invalid ExclusiveStartKey {start_key}")
+
+    def _get_key(self, item: T_JSON) -> str:
+        return json.dumps([item[name] for name in self.key_attributes])
+
+    def batch_write_item(self, RequestItems: T.Dict[str, T.List[dict]]):
+        unprocessed_items = dict()
+        with self._lock:
+            self.n_batch_write_calls += 1
+            for table_name, entries in RequestItems.items():
+                unprocessed = list()
+                for entry in entries:
+                    if self._random.random() < self.unprocessed_rate:
+                        unprocessed.append(entry)
+                    elif "PutRequest" in entry:
+                        item = entry["PutRequest"]["Item"]
+                        self.table[self._get_key(item)] = item
+                    else:
+                        key = entry["DeleteRequest"]["Key"]
+                        self.table.pop(self._get_key(key), None)
+                if unprocessed:
+                    unprocessed_items[table_name] = unprocessed
+        return {"UnprocessedItems": unprocessed_items}
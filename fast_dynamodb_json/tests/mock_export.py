@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+Create a fake DynamoDB export to S3 folder for testing.
+"""
+
+import typing as T
+import json
+import gzip
+import shutil
+import base64
+import hashlib
+from pathlib import Path
+
+from ..typehint import T_JSON
+
+
+def _write_data_file(
+    path: Path,
+    lines: T.List[T.Dict[str, T.Any]],
+) -> T.Dict[str, T.Any]:
+    content = gzip.compress(
+        "".join(json.dumps(line) + "\n" for line in lines).encode("utf-8")
+    )
+    path.write_bytes(content)
+    return {
+        "itemCount": len(lines),
+        "md5Checksum": base64.b64encode(hashlib.md5(content).digest()).decode(),
+        "etag": hashlib.md5(content).hexdigest(),
+    }
+
+
+def create_export(
+    export_dir: Path,
+    lines: T.List[T.Dict[str, T.Any]],
+    n_files: int = 1,
+    export_type: str = "FULL_EXPORT",
+    export_id: str = "01722632920672-dd1ec76a",
+) -> Path:
+    """
+    Create an export folder with the manifest files and ``n_files`` gzip
+    data files, each line of the data file is one of the ``lines``.
+    """
+    if export_dir.exists():
+        shutil.rmtree(export_dir)
+    dir_data = export_dir / "data"
+    dir_data.mkdir(parents=True)
+    manifest_files = list()
+    for i in range(n_files):
+        basename = f"{i:026d}.json.gz"
+        manifest_file = _write_data_file(dir_data / basename, lines[i::n_files])
+        manifest_file["dataFileS3Key"] = f"AWSDynamoDB/{export_id}/data/{basename}"
+        manifest_files.append(manifest_file)
+    (export_dir / "manifest-files.json").write_text(
+        "".join(json.dumps(dct) + "\n" for dct in manifest_files)
+    )
+    summary = {
+        "version": "2020-06-30",
+        "exportArn": f"arn:aws:dynamodb:us-east-1:111122223333:table/orders/export/{export_id}",
+        "exportType": export_type,
+        "outputFormat": "DYNAMODB_JSON",
+        "itemCount": len(lines),
+        "manifestFilesS3Key": f"AWSDynamoDB/{export_id}/manifest-files.json",
+    }
+    (export_dir / "manifest-summary.json").write_text(json.dumps(summary))
+    return export_dir
+
+
+def create_full_export(
+    export_dir: Path,
+    records: T.List[T_JSON],
+    n_files: int = 1,
+) -> Path:
+    """
+    Create a full export folder of the DynamoDB JSON ``records``.
+    """
+    return create_export(
+        export_dir=export_dir,
+        lines=[{"Item": record} for record in records],
+        n_files=n_files,
+    )
+
+
+def create_incremental_export(
+    export_dir: Path,
+    changes: T.List[T.Tuple[int, T_JSON, T.Optional[T_JSON], T.Optional[T_JSON]]],
+    n_files: int = 1,
+) -> Path:
+    """
+    Create an incremental export folder. Each change is a tuple of
+    ``(write_timestamp_micros, keys, new_image, old_image)``, the image
+    is None if it doesn't exist.
+    """
+    lines = list()
+    for write_timestamp_micros, keys, new_image, old_image in changes:
+        line = {
+            "Metadata": {"WriteTimestampMicros": {"N": str(write_timestamp_micros)}},
+            "Keys": keys,
+        }
+        if new_image is not None:
+            line["NewImage"] = new_image
+        if old_image is not None:
+            line["OldImage"] = old_image
+        lines.append(line)
+    return create_export(
+        export_dir=export_dir,
+        lines=lines,
+        n_files=n_files,
+        export_type="INCREMENTAL_EXPORT",
+    )
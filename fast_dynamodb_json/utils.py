@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""
+Utility functions.
+"""
+
+import gzip
+import typing as T
+import itertools
+
+T_ELEMENT = T.TypeVar("T_ELEMENT")
+
+
+def iter_chunks(
+    iterable: T.Iterable[T_ELEMENT],
+    chunk_size: int,
+) -> T.Iterator[T.List[T_ELEMENT]]:
+    """
+    Lazily pull items from the iterable and yield them in lists of
+    ``chunk_size`` items, the last one may be shorter. Only one chunk is in
+    memory at a time.
+
+    >>> list(iter_chunks(range(5), 2))
+    [[0, 1], [2, 3], [4]]
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be a positive integer, got {chunk_size}")
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class CompressionEnum:
+    gzip = "gzip"
+    zstd = "zstd"
+
+
+def compress(
+    data: bytes,
+    compression: T.Optional[str] = None,
+) -> bytes:
+    """
+    Compress the bytes with ``gzip`` or ``zstd``, return as it is if
+    ``compression`` is None. ``zstd`` requires the ``zstandard`` package.
+
+    Multiple compressed chunks can be concatenated, the result is still a
+    valid ``gzip`` (multi members) or ``zstd`` (multi frames) file, so the
+    chunks can be compressed in parallel.
+    """
+    if compression is None:
+        return data
+    elif compression == CompressionEnum.gzip:
+        return gzip.compress(data)
+    elif compression == CompressionEnum.zstd:
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress(data)
+    else:
+        raise ValueError(
+            f"invalid compression {compression!r}, must be one of "
+            f"None, {CompressionEnum.gzip!r}, {CompressionEnum.zstd!r}"
+        )
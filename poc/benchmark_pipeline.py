@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compare the serial loop of ``test_dynamodb_export_data_to_datalake.py``
+(read -> deserialize -> write, one file after another) with
+:func:`fast_dynamodb_json.pipeline.deserialize_files`, on local fake export
+data files.
+
+Usage::
+
+    python poc/benchmark_pipeline.py
+"""
+
+import time
+import random
+import shutil
+
+import polars as pl
+
+from fast_dynamodb_json.api import (
+    Integer,
+    Float,
+    String,
+    Bool,
+    List,
+    Struct,
+    compile_schema,
+    deserialize_df,
+)
+from fast_dynamodb_json.paths import dir_tmp
+from fast_dynamodb_json.export import get_data_file_paths
+from fast_dynamodb_json.pipeline import deserialize_files
+from fast_dynamodb_json.tests.mock_export import create_full_export
+
+N_FILES = 8
+N_RECORDS = 200_000
+
+simple_schema = {
+    "OrderID": String(),
+    "CustomerID": String(),
+    "TotalAmount": Float(),
+    "Status": String(),
+    "ShippingAddress": Struct({"City": String(), "ZipCode": String()}),
+    "Items": List(
+        Struct({"ProductID": String(), "Price": Float(), "Quantity": Integer()})
+    ),
+    "GiftWrap": Bool(),
+}
+
+
+def make_record(i: int) -> dict:
+    return {
+        "OrderID": {"S": f"ORD-{i:09d}"},
+        "CustomerID": {"S": f"CUST-{random.randint(1, 10000):06d}"},
+        "TotalAmount": {"N": str(round(random.random() * 1000, 2))},
+        "Status": {"S": random.choice(["Shipped", "Pending", "Delivered"])},
+        "ShippingAddress": {
+            "M": {"City": {"S": "Seattle"}, "ZipCode": {"S": "98101"}}
+        },
+        "Items": {
+            "L": [
+                {
+                    "M": {
+                        "ProductID": {"S": f"PROD-{j:06d}"},
+                        "Price": {"N": "19.99"},
+                        "Quantity": {"N": "2"},
+                    }
+                }
+                for j in range(random.randint(1, 4))
+            ]
+        },
+        "GiftWrap": {"BOOL": random.random() > 0.5},
+    }
+
+
+export_dir = dir_tmp / "benchmark_pipeline" / "export"
+dir_parquet = dir_tmp / "benchmark_pipeline" / "parquet"
+print(f"create {N_FILES} files, {N_RECORDS} records in total ...")
+create_full_export(
+    export_dir, [make_record(i) for i in range(N_RECORDS)], n_files=N_FILES
+)
+paths = get_data_file_paths(export_dir)
+compiled_schema = compile_schema(simple_schema)
+pl_schema = {"Item": compiled_schema.dynamodb_json_polars_struct}
+
+
+def write(path, df):
+    df.write_parquet(dir_parquet / path.name.replace(".json.gz", ".parquet"))
+
+
+def reset():
+    shutil.rmtree(dir_parquet, ignore_errors=True)
+    dir_parquet.mkdir(parents=True)
+
+
+reset()
+start = time.perf_counter()
+for path in paths:
+    df = pl.read_ndjson(path, schema=pl_schema)
+    df = deserialize_df(df, compiled_schema)
+    write(path, df)
+serial = time.perf_counter() - start
+
+reset()
+start = time.perf_counter()
+for _ in deserialize_files(paths, compiled_schema, write=write):
+    pass
+pipeline = time.perf_counter() - start
+
+print(f"serial:   {serial:.3f}s")
+print(f"pipeline: {pipeline:.3f}s")
+print(f"speedup:  {serial / pipeline:.2f}x")
@@ -84,6 +84,7 @@ from fast_dynamodb_json.api import (
     List,
     Struct,
     deserialize_df,
+    deserialize_lazy,
 )
 from fast_dynamodb_json.vendor.polars_utils import pprint_df
 from fast_dynamodb_json.vendor.timer import DateTimeTimer
@@ -222,11 +223,14 @@ rprint(json.dumps(records[0], indent=4, sort_keys=True))
 print(len(records))
 
 with DateTimeTimer("use polars ...") as timer:
-    df = pl.scan_ndjson(
-        f"{dir_tmp}/*.json.gz",
-        schema=pl_schema,
-    ).collect()
-    df = deserialize_df(df, simple_schema)
+    df = (
+        pl.scan_ndjson(
+            f"{dir_tmp}/*.json.gz",
+            schema=pl_schema,
+        )
+        .pipe(deserialize_lazy, simple_schema)
+        .collect()
+    )
     records = df.to_dicts()
 elapse3 = timer.elapsed
 rprint(json.dumps(records[0], indent=4, sort_keys=True))
@@ -237,3 +241,17 @@ metrics = {
     "polars": elapse3,
 }
 print(metrics)
+
+# ------------------------------------------------------------------------------
+# Convert 7 file 1M records to parquet with bounded memory, the whole query
+# runs on the streaming engine, nothing is collected in memory.
+# ------------------------------------------------------------------------------
+with DateTimeTimer("use polars streaming ...") as timer:
+    (
+        pl.scan_ndjson(
+            f"{dir_tmp}/*.json.gz",
+            schema=pl_schema,
+        )
+        .pipe(deserialize_lazy, simple_schema)
+        .sink_parquet(dir_tmp.parent / "orders.parquet")
+    )
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from fast_dynamodb_json.schema import String, Integer
+from fast_dynamodb_json.aio import adeserialize, adeserialize_pages
+from fast_dynamodb_json.tests.fake_dynamodb import make_pages, FakeAsyncPaginator
+
+simple_schema = {"pk": String(), "n": Integer()}
+items = [{"pk": {"S": f"pk{i}"}, "n": {"N": str(i)}} for i in range(25)]
+
+
+def test_adeserialize():
+    records = asyncio.run(adeserialize(items[:2], simple_schema))
+    assert records == [{"pk": "pk0", "n": 0}, {"pk": "pk1", "n": 1}]
+
+
+def test_adeserialize_pages():
+    async def main(pages, **kwargs):
+        return [
+            batch
+            async for batch in adeserialize_pages(
+                FakeAsyncPaginator(pages, delay=0.001),
+                simple_schema,
+                **kwargs,
+            )
+        ]
+
+    pages = make_pages(items, page_size=4)
+    batches = asyncio.run(main(pages, target_rows=10))
+    assert [len(batch) for batch in batches] == [12, 12, 1]
+    assert [row["n"] for batch in batches for row in batch] == list(range(25))
+
+    dfs = asyncio.run(main(pages, target_rows=100, paths=["n"], output="polars"))
+    assert len(dfs) == 1
+    assert dfs[0].columns == ["n"]
+
+    assert asyncio.run(main(make_pages([], page_size=4))) == []
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.aio", preview=False)
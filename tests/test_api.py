@@ -19,10 +19,54 @@ def test():
     _ = api.Set
     _ = api.List
     _ = api.Struct
+    _ = api.select_paths
+    _ = api.CompiledSchema
+    _ = api.compile_schema
+    _ = api.infer_schema
+    _ = api.infer_schema_from_items
     _ = api.deserialize
     _ = api.deserialize_df
+    _ = api.deserialize_lazy
     _ = api.serialize
     _ = api.serialize_df
+    _ = api.serialize_lazy
+    _ = api.ExportDataFile
+    _ = api.ExportManifest
+    _ = api.read_dynamodb_export
+    _ = api.read_incremental_export
+    _ = api.compact_incremental_export
+    _ = api.deserialize_stream_records
+    _ = api.deserialize_stream_df
+    _ = api.deserialize_kinesis_records
+    _ = api.deserialize_to_arrow
+    _ = api.serialize_to_arrow
+    _ = api.iter_deserialize
+    _ = api.iter_serialize
+    _ = api.serialize_to_ndjson
+    _ = api.get_item_size_selector
+    _ = api.get_capacity_unit_selectors
+    _ = api.item_size
+    _ = api.NullPolicyEnum
+    _ = api.to_dicts
+    _ = api.PresenceEnum
+    _ = api.get_presence_selector
+    _ = api.deserialize_parallel
+    _ = api.Stage
+    _ = api.run_pipeline
+    _ = api.deserialize_files
+    _ = api.adeserialize
+    _ = api.adeserialize_pages
+    _ = api.PageBatch
+    _ = api.deserialize_pages
+    _ = api.SegmentMetrics
+    _ = api.ParallelScanResult
+    _ = api.iter_scan_pages
+    _ = api.parallel_scan
+    _ = api.TokenBucket
+    _ = api.BulkWriteStats
+    _ = api.BulkWriter
+    _ = api.BatchWriteRequests
+    _ = api.build_batch_write_requests
 
 
 if __name__ == "__main__":
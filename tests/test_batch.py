@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import polars as pl
+
+from fast_dynamodb_json.schema import String, Integer
+from fast_dynamodb_json.compiled import compile_schema
+from fast_dynamodb_json.batch import MAX_ITEM_SIZE, build_batch_write_requests
+
+simple_schema = {"pk": String(), "n": Integer(), "data": String()}
+
+
+def test_build_batch_write_requests():
+    records = [{"pk": f"pk{i}", "n": i, "data": "x"} for i in range(30)]
+    records.append({"pk": "big", "n": 0, "data": "x" * MAX_ITEM_SIZE})
+    res = build_batch_write_requests(
+        records,
+        simple_schema,
+        "my-table",
+        deletes=[{"pk": "pk100"}, {"pk": "pk101"}],
+        key_attributes=["pk"],
+    )
+    assert [len(req["RequestItems"]["my-table"]) for req in res.requests] == [25, 7]
+    assert res.requests[0]["RequestItems"]["my-table"][0] == {
+        "PutRequest": {
+            "Item": {"pk": {"S": "pk0"}, "n": {"N": "0"}, "data": {"S": "x"}}
+        }
+    }
+    assert res.requests[1]["RequestItems"]["my-table"][-1] == {
+        "DeleteRequest": {"Key": {"pk": {"S": "pk101"}}}
+    }
+    assert [item["pk"] for item in res.oversized_items] == [{"S": "big"}]
+    assert res.wcus == [25, 7]
+
+    # DataFrame input, 25 items of 300KB are still under the 16MB limit
+    df = pl.DataFrame(
+        {"Data": [{"pk": f"pk{i}", "n": i, "data": "x" * 300_000} for i in range(30)]},
+        schema={"Data": compile_schema(simple_schema).polars_struct},
+    )
+    res = build_batch_write_requests(df, simple_schema, "my-table")
+    assert [len(req["RequestItems"]["my-table"]) for req in res.requests] == [25, 5]
+    assert res.wcus == [25 * 293, 5 * 293]
+
+    res = build_batch_write_requests(
+        [{"pk": "pk1", "n": None, "data": "x"}],
+        simple_schema,
+        "my-table",
+        null_policy="omit",
+    )
+    assert res.requests[0]["RequestItems"]["my-table"][0] == {
+        "PutRequest": {"Item": {"pk": {"S": "pk1"}, "data": {"S": "x"}}}
+    }
+
+    with pytest.raises(ValueError):
+        build_batch_write_requests([], simple_schema, "my-table", deletes=[])
+
+
+def test_build_batch_write_requests_duplicated_keys():
+    # a request can't have the same key twice, the last one wins
+    records = [{"pk": f"pk{i % 10}", "n": i, "data": "x"} for i in range(30)]
+    res = build_batch_write_requests(
+        records,
+        simple_schema,
+        "my-table",
+        deletes=[{"pk": "pk0"}],
+        key_attributes=["pk"],
+    )
+    (request,) = res.requests
+    entries = request["RequestItems"]["my-table"]
+    assert len(entries) == 10
+    assert [entry["PutRequest"]["Item"]["n"] for entry in entries[:9]] == [
+        {"N": str(i)} for i in range(21, 30)
+    ]
+    assert entries[-1] == {"DeleteRequest": {"Key": {"pk": {"S": "pk0"}}}}
+    assert res.wcus == [10]
+
+    # without key_attributes, the keys are not checked
+    res = build_batch_write_requests(records, simple_schema, "my-table")
+    assert [len(req["RequestItems"]["my-table"]) for req in res.requests] == [25, 5]
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.batch", preview=False)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import pytest
+import polars as pl
+
+from fast_dynamodb_json.schema import String, Integer
+from fast_dynamodb_json.compiled import compile_schema
+from fast_dynamodb_json.batch import MAX_ITEM_SIZE
+from fast_dynamodb_json.bulk import TokenBucket, BulkWriter
+from fast_dynamodb_json.tests.fake_dynamodb import FakeDynamoDBClient
+
+simple_schema = {"pk": String(), "n": Integer()}
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=1000)
+    assert bucket.acquire(1000) == 0
+    start = time.perf_counter()
+    assert bucket.acquire(100) > 0
+    assert time.perf_counter() - start >= 0.05
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_bulk_writer():
+    client = FakeDynamoDBClient(unprocessed_rate=0.3, seed=1)
+    writer = BulkWriter(
+        client,
+        "my-table",
+        simple_schema,
+        max_wcu_per_sec=100000,
+        concurrency=4,
+        max_retries=50,
+        base_delay=0.001,
+        chunk_size=100,
+        key_attributes=["pk"],
+    )
+    records = ({"pk": f"pk{i}", "n": i} for i in range(300))
+    stats = writer.write(records)
+    assert len(client.table) == 300
+    assert stats.written == 300
+    assert stats.retried > 0
+    assert stats.failed == 0
+    assert stats.n_requests == client.n_batch_write_calls
+    assert stats.wcu >= 300
+
+    # the last item of each key in a chunk wins
+    stats = writer.write([{"pk": "pk0", "n": -1}, {"pk": "pk0", "n": -2}])
+    assert client.table['[{"S": "pk0"}]']["n"] == {"N": "-2"}
+    assert stats.written == 301
+
+    df = pl.DataFrame(
+        {"Data": [{"pk": f"pk{i}"} for i in range(100)]},
+        schema={"Data": compile_schema({"pk": String()}).polars_struct},
+    )
+    stats = writer.delete(df)
+    assert len(client.table) == 200
+    assert stats.written == 401
+
+
+def test_bulk_writer_failed():
+    client = FakeDynamoDBClient(unprocessed_rate=1.0)
+    writer = BulkWriter(client, "my-table", simple_schema, max_retries=2, base_delay=0)
+    records = [{"pk": f"pk{i}", "n": i} for i in range(30)]
+    records.append({"pk": "big" + "x" * MAX_ITEM_SIZE, "n": 0})
+    stats = writer.write(records)
+    assert stats.written == 0
+    assert stats.retried == 30 * 2
+    assert stats.failed == 31
+    assert stats.n_requests == 2 * 3
+    assert len(stats.failed_items) == 31
+
+    with pytest.raises(ValueError):
+        writer.delete([{"pk": "pk1"}])
+
+    # errors raised by the client are raised by write
+    def batch_write_item(**kwargs):
+        raise RuntimeError("ProvisionedThroughputExceededException")
+
+    client.batch_write_item = batch_write_item
+    with pytest.raises(RuntimeError):
+        writer.write(records)
+    with pytest.raises(ValueError):
+        BulkWriter(client, "my-table", simple_schema, concurrency=0)
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.bulk", preview=False)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+from fast_dynamodb_json.schema import (
+    Integer,
+    String,
+    List,
+    Struct,
+)
+from fast_dynamodb_json.compiled import (
+    SchemaCache,
+    compile_schema,
+)
+from fast_dynamodb_json.serialize import serialize
+from fast_dynamodb_json.deserialize import deserialize
+
+
+def make_schema(default_for_null: int = 0):
+    return {
+        "pk": String(),
+        "a_list": List(Integer(default_for_null=default_for_null)),
+        "a_struct": Struct({"a": Integer(default_for_null=default_for_null)}),
+    }
+
+
+def test_compile_schema():
+    compiled_schema = compile_schema(make_schema())
+    # the same structure always hit the cache
+    assert compile_schema(make_schema()) is compiled_schema
+    assert compile_schema(compiled_schema) is compiled_schema
+    # different structure is a different entry
+    assert compile_schema(make_schema(default_for_null=-1)) is not compiled_schema
+
+    selectors = compiled_schema.get_deserialize_selector_mapping("Item")
+    assert list(selectors) == ["pk", "a_list", "a_struct"]
+    assert compiled_schema.get_deserialize_selector_mapping("Item") is selectors
+    assert compiled_schema.get_deserialize_selector_mapping("Image") is not selectors
+    assert len(compiled_schema.get_deserialize_selectors("Item")) == 3
+    selectors = compiled_schema.get_serialize_selectors("Data")
+    assert len(selectors) == 3
+    assert compiled_schema.get_serialize_selectors("Data") is selectors
+
+    item = {"pk": "pk1", "a_list": [1, 2], "a_struct": {"a": 1}}
+    json = {
+        "pk": {"S": "pk1"},
+        "a_list": {"L": [{"N": "1"}, {"N": "2"}]},
+        "a_struct": {"M": {"a": {"N": "1"}}},
+    }
+    assert serialize([item], compiled_schema) == [json]
+    assert deserialize([json], compiled_schema) == [item]
+
+
+def test_mutate_schema_after_compile():
+    simple_schema = {"a": String()}
+    compiled_schema = compile_schema(simple_schema)
+    # changing the dict doesn't change the cached entry
+    simple_schema["b"] = Integer()
+    assert list(compiled_schema.simple_schema) == ["a"]
+    assert deserialize([{"a": {"S": "x"}}], {"a": String()}) == [{"a": "x"}]
+    assert compile_schema(simple_schema) is not compiled_schema
+
+
+def test_schema_cache():
+    cache = SchemaCache(maxsize=2)
+    c1 = cache.get(make_schema(1))
+    c2 = cache.get(make_schema(2))
+    assert cache.get(make_schema(1)) is c1  # now 2 is the least recently used
+    c3 = cache.get(make_schema(3))
+    assert len(cache) == 2
+    assert cache.get(make_schema(1)) is c1
+    assert cache.get(make_schema(3)) is c3
+    assert cache.get(make_schema(2)) is not c2  # evicted
+    assert cache.hits == 3
+    assert cache.misses == 4
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.compiled", preview=False)
@@ -1,5 +1,20 @@
 # -*- coding: utf-8 -*-
 
+import json
+
+import pytest
+import polars as pl
+
+from fast_dynamodb_json.paths import dir_tmp
+from fast_dynamodb_json.schema import Integer, String, List, Struct, Null
+from fast_dynamodb_json.compiled import compile_schema
+from fast_dynamodb_json.deserialize import (
+    deserialize,
+    deserialize_df,
+    deserialize_lazy,
+    iter_deserialize,
+    PresenceEnum,
+)
 from fast_dynamodb_json.tests.case import CaseEnum
 
 
@@ -19,6 +34,149 @@ def test():
     CaseEnum.case12.test_deserialize()
 
 
+def test_deserialize_lazy():
+    case = CaseEnum.case11
+    path = dir_tmp / "test_deserialize_lazy.json"
+    path.write_text(json.dumps({"Item": case.json}) + "\n")
+    path_parquet = dir_tmp / "test_deserialize_lazy.parquet"
+    lf = pl.scan_ndjson(
+        path,
+        schema={"Item": compile_schema(case.simple_schema).dynamodb_json_polars_struct},
+    ).pipe(deserialize_lazy, case.simple_schema)
+    assert isinstance(lf, pl.LazyFrame)
+    lf.sink_parquet(path_parquet)
+    assert pl.read_parquet(path_parquet).to_dicts() == [case.item]
+
+
+def test_deserialize_paths():
+    case = CaseEnum.case12
+    paths = [
+        "a_int",
+        "a_struct.a_str",
+        "a_list_of_struct[].a_int",
+        "a_list_of_list_of_struct[][].a_str",
+    ]
+    expected = {
+        "a_int": case.item["a_int"],
+        "a_struct": {"a_str": case.item["a_struct"]["a_str"]},
+        "a_list_of_struct": [
+            {"a_int": dct["a_int"]} for dct in case.item["a_list_of_struct"]
+        ],
+        "a_list_of_list_of_struct": [
+            [{"a_str": dct["a_str"]} for dct in lst]
+            for lst in case.item["a_list_of_list_of_struct"]
+        ],
+    }
+    assert deserialize([case.json], case.simple_schema, paths=paths) == [expected]
+
+    df = pl.DataFrame(
+        {"Item": [case.json]},
+        schema={"Item": compile_schema(case.simple_schema).dynamodb_json_polars_struct},
+    )
+    lf = deserialize_lazy(df.lazy(), case.simple_schema, paths=paths)
+    assert lf.collect().to_dicts() == [expected]
+    df = deserialize_df(df, case.simple_schema, paths=paths)
+    assert df.to_dicts() == [expected]
+
+
+def test_deserialize_filter():
+    simple_schema = {
+        "OrderID": String(),
+        "Status": String(),
+        "Total": Integer(),
+        "Items": List(Struct({"Name": String(), "Quantity": Integer()})),
+    }
+    records = [
+        {
+            "OrderID": {"S": f"order-{i}"},
+            "Status": {"S": "Shipped" if i % 2 else "Pending"},
+            "Total": {"N": str(i * 10)},
+            "Items": {"L": [{"M": {"Name": {"S": "a"}, "Quantity": {"N": str(i)}}}]},
+        }
+        for i in range(1, 5)
+    ]
+    df = pl.DataFrame(
+        {"Day": [1, 1, 2, 2], "Item": records},
+        schema={
+            "Day": pl.Int64(),
+            "Item": compile_schema(simple_schema).dynamodb_json_polars_struct,
+        },
+    )
+
+    res = deserialize_df(df, simple_schema, filter=pl.col("Status") == "Shipped")
+    assert res.columns == ["Day", "OrderID", "Status", "Total", "Items"]
+    assert res["OrderID"].to_list() == ["order-1", "order-3"]
+    assert res["Items"].to_list() == [
+        [{"Name": "a", "Quantity": 1}],
+        [{"Name": "a", "Quantity": 3}],
+    ]
+
+    # use more than one attribute, and a column that is not in the schema
+    res = deserialize_lazy(
+        df.lazy(),
+        simple_schema,
+        paths=["OrderID"],
+        filter=(pl.col("Status") == "Shipped")
+        & (pl.col("Total") > 10)
+        & (pl.col("Day") == 2),
+    ).collect()
+    assert res.to_dicts() == [{"Day": 2, "OrderID": "order-3"}]
+
+    # nested attribute
+    res = deserialize_df(
+        df,
+        simple_schema,
+        paths=["OrderID"],
+        filter=pl.col("Items").list.eval(pl.element().struct.field("Quantity")).list.sum() >= 4,
+    )
+    assert res["OrderID"].to_list() == ["order-4"]
+
+
+def test_iter_deserialize():
+    simple_schema = {"pk": String(), "n": Integer()}
+
+    def records():
+        for i in range(5):
+            yield {"pk": {"S": f"pk{i}"}, "n": {"N": str(i)}}
+
+    chunks = list(iter_deserialize(records(), simple_schema, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    rows = list(iter_deserialize(records(), simple_schema, chunk_size=2, per_row=True))
+    assert rows == [{"pk": f"pk{i}", "n": i} for i in range(5)]
+    dfs = list(
+        iter_deserialize(
+            records(), simple_schema, chunk_size=3, paths=["n"], output="polars"
+        )
+    )
+    assert [df.to_series().to_list() for df in dfs] == [[0, 1, 2], [3, 4]]
+    assert list(iter_deserialize([], simple_schema)) == []
+    with pytest.raises(ValueError):
+        list(iter_deserialize(records(), simple_schema, output="polars", per_row=True))
+
+
+def test_presence():
+    simple_schema = {"pk": String(), "n": Integer(), "nil": Null()}
+    records = [
+        {"pk": {"S": "pk1"}, "n": {"N": "1"}, "nil": {"NULL": True}},
+        {"pk": {"S": "pk2"}, "n": {"NULL": True}},
+        {"pk": {"S": "pk3"}},
+    ]
+    rows = deserialize(records, simple_schema, presence_col="Presence")
+    assert [row["n"] for row in rows] == [1, None, None]
+    assert [row["Presence"] for row in rows] == [
+        {"pk": PresenceEnum.value, "n": PresenceEnum.value, "nil": PresenceEnum.null},
+        {"pk": PresenceEnum.value, "n": PresenceEnum.null, "nil": PresenceEnum.missing},
+        {"pk": PresenceEnum.value, "n": PresenceEnum.missing, "nil": PresenceEnum.missing},
+    ]
+
+    df = pl.DataFrame(
+        {"Item": records},
+        schema={"Item": compile_schema(simple_schema).dynamodb_json_polars_struct},
+    )
+    lf = deserialize_lazy(df.lazy(), simple_schema, paths=["n"], presence_col="P")
+    assert lf.collect()["P"].struct.field("n").to_list() == [2, 1, 0]
+
+
 if __name__ == "__main__":
     from fast_dynamodb_json.tests import run_cov_test
 
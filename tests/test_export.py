@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+import polars as pl
+
+from fast_dynamodb_json.paths import dir_tmp
+from fast_dynamodb_json.schema import Integer, Float, String, List, Struct
+from fast_dynamodb_json.serialize import serialize
+from fast_dynamodb_json.export import (
+    ExportManifest,
+    get_data_file_paths,
+    read_dynamodb_export,
+    read_incremental_export,
+    compact_incremental_export,
+)
+from fast_dynamodb_json.tests.mock_export import (
+    create_full_export,
+    create_incremental_export,
+)
+
+simple_schema = {
+    "OrderID": String(),
+    "Status": String(),
+    "TotalAmount": Float(),
+    "ShippingAddress": Struct({"City": String(), "ZipCode": String()}),
+    "Items": List(Struct({"Name": String(), "Quantity": Integer()})),
+}
+items = [
+    {
+        "OrderID": f"ORD-{i}",
+        "Status": "Shipped" if i % 2 else "Pending",
+        "TotalAmount": i * 1.5,
+        "ShippingAddress": {"City": f"City-{i}", "ZipCode": "15728"},
+        "Items": [{"Name": "a", "Quantity": i}],
+    }
+    for i in range(10)
+]
+
+
+def test_read_dynamodb_export():
+    export_dir = dir_tmp / "test_read_dynamodb_export"
+    create_full_export(export_dir, serialize(items, simple_schema), n_files=3)
+
+    manifest = ExportManifest.read(export_dir)
+    assert manifest.export_type == "FULL_EXPORT"
+    assert manifest.output_format == "DYNAMODB_JSON"
+    assert manifest.item_count == 10
+    assert len(get_data_file_paths(export_dir)) == 3
+
+    df = read_dynamodb_export(export_dir, simple_schema)
+    assert isinstance(df, pl.DataFrame)
+    assert df.sort("OrderID").to_dicts() == sorted(items, key=lambda x: x["OrderID"])
+
+    lf = read_dynamodb_export(
+        export_dir,
+        simple_schema,
+        lazy=True,
+        paths=["OrderID", "ShippingAddress.City"],
+        filter=pl.col("Status") == "Shipped",
+    )
+    assert isinstance(lf, pl.LazyFrame)
+    df = lf.collect().sort("OrderID")
+    assert df.to_dicts() == [
+        {
+            "OrderID": item["OrderID"],
+            "ShippingAddress": {"City": item["ShippingAddress"]["City"]},
+        }
+        for item in items
+        if item["Status"] == "Shipped"
+    ]
+
+    # without manifest
+    (export_dir / "manifest-files.json").unlink()
+    assert len(read_dynamodb_export(export_dir, simple_schema)) == 10
+
+    with pytest.raises(FileNotFoundError):
+        get_data_file_paths(dir_tmp / "test_read_dynamodb_export_not_exists")
+
+
+def test_incremental_export():
+    schema = {"pk": String(), "value": Integer()}
+
+    def image(pk: str, value: int):
+        return {"pk": {"S": pk}, "value": {"N": str(value)}}
+
+    def keys(pk: str):
+        return {"pk": {"S": pk}}
+
+    export_dir = dir_tmp / "test_incremental_export_base"
+    create_full_export(export_dir, [image("pk1", 1), image("pk2", 2), image("pk3", 3)])
+    base = read_dynamodb_export(export_dir, schema)
+
+    export_dir = dir_tmp / "test_incremental_export_1"
+    create_incremental_export(
+        export_dir,
+        [
+            (200, keys("pk1"), image("pk1", 12), image("pk1", 11)),
+            (100, keys("pk1"), image("pk1", 11), image("pk1", 1)),
+            (100, keys("pk2"), None, image("pk2", 2)),  # delete
+            (100, keys("pk4"), image("pk4", 4), None),  # insert
+        ],
+        n_files=2,
+    )
+    changes1 = read_incremental_export(export_dir, schema, ["pk"])
+    assert changes1.columns == ["WriteTimestampMicros", "Keys", "NewImage", "OldImage"]
+    assert changes1.sort("WriteTimestampMicros", "Keys").to_dicts()[:2] == [
+        {
+            "WriteTimestampMicros": 100,
+            "Keys": {"pk": "pk1"},
+            "NewImage": {"pk": "pk1", "value": 11},
+            "OldImage": {"pk": "pk1", "value": 1},
+        },
+        {
+            "WriteTimestampMicros": 100,
+            "Keys": {"pk": "pk2"},
+            "NewImage": None,
+            "OldImage": {"pk": "pk2", "value": 2},
+        },
+    ]
+
+    export_dir = dir_tmp / "test_incremental_export_2"
+    create_incremental_export(
+        export_dir,
+        [
+            (300, keys("pk3"), None, image("pk3", 3)),  # delete
+            (300, keys("pk4"), image("pk4", 44), image("pk4", 4)),
+        ],
+    )
+    changes2 = read_incremental_export(export_dir, schema, ["pk"], lazy=True)
+
+    # the wrong export type or format
+    with pytest.raises(ValueError):
+        read_dynamodb_export(export_dir, schema)
+    with pytest.raises(ValueError):
+        read_incremental_export(dir_tmp / "test_incremental_export_base", schema, ["pk"])
+    path_summary = export_dir / "manifest-summary.json"
+    summary = json.loads(path_summary.read_text())
+    summary["outputFormat"] = "ION"
+    path_summary.write_text(json.dumps(summary))
+    with pytest.raises(ValueError):
+        read_incremental_export(export_dir, schema, ["pk"])
+
+    snapshot = compact_incremental_export(base, changes1, ["pk"])
+    assert snapshot.sort("pk").to_dicts() == [
+        {"pk": "pk1", "value": 12},
+        {"pk": "pk3", "value": 3},
+        {"pk": "pk4", "value": 4},
+    ]
+    snapshot = compact_incremental_export(
+        base.lazy(),
+        [changes1.lazy(), changes2],
+        ["pk"],
+    )
+    assert snapshot.collect().sort("pk").to_dicts() == [
+        {"pk": "pk1", "value": 12},
+        {"pk": "pk4", "value": 44},
+    ]
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.export", preview=False)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+import json
+import decimal
+
+import pytest
+import polars as pl
+
+from fast_dynamodb_json.schema import (
+    Integer,
+    Float,
+    String,
+    Binary,
+    Bool,
+    Null,
+    Set,
+    List,
+    Struct,
+)
+from fast_dynamodb_json.infer import infer_schema, infer_schema_from_items
+from fast_dynamodb_json.serialize import serialize
+from fast_dynamodb_json.deserialize import deserialize
+from fast_dynamodb_json.tests.case import CaseEnum
+
+
+def test_infer_schema():
+    records = [
+        {
+            "pk": {"S": "pk1"},
+            "price": {"N": "9.99"},
+            "qty": {"N": "3"},
+            "tags": {"SS": ["a", "b"]},
+            "scores": {"NS": ["1", "2"]},
+            "a_list": {"L": [{"N": "1"}, {"N": "2"}]},
+            "a_map": {
+                "M": {
+                    "a_bin": {"B": "aGVsbG8="},
+                    "a_list": {"L": [{"L": [{"N": "1.5"}]}]},
+                }
+            },
+        },
+        {
+            "pk": {"S": "pk2"},
+            "price": {"N": "10"},
+            "qty": {"NULL": True},
+            "scores": {"NS": ["1.5"]},
+            "a_bool": {"BOOL": True},
+            "a_null": {"NULL": True},
+            "a_empty_list": {"L": []},
+            "a_bin_set": {"BS": ["aGVsbG8="]},
+        },
+    ]
+    expected = {
+        "pk": String(),
+        "price": Float(),
+        "qty": Integer(),
+        "tags": Set(String()),
+        "scores": Set(Float()),
+        "a_list": List(Integer()),
+        "a_map": Struct(
+            {
+                "a_bin": Binary(),
+                "a_list": List(List(Float())),
+            }
+        ),
+        "a_bool": Bool(),
+        "a_null": Null(),
+        "a_empty_list": List(Null()),
+        "a_bin_set": Set(Binary()),
+    }
+    assert infer_schema(records) == expected
+
+    # json string column
+    df = pl.DataFrame({"Item": [json.dumps(record) for record in records]})
+    assert infer_schema(df) == expected
+    # struct column
+    df = pl.DataFrame(
+        [{"Item": record} for record in records],
+        infer_schema_length=None,
+    )
+    assert infer_schema(df) == expected
+
+    # only use the first record
+    schema = infer_schema(records, sample=1)
+    assert schema["price"] == Float()
+    assert schema["scores"] == Set(Integer())
+    assert "a_bool" not in schema
+
+    assert infer_schema([]) == {}
+
+    with pytest.raises(ValueError):
+        infer_schema([{"a": {"S": "1"}}, {"a": {"N": "1"}}])
+
+
+def test_infer_schema_round_trip():
+    for case in [
+        CaseEnum.case1,
+        CaseEnum.case5,
+        CaseEnum.case10,
+        CaseEnum.case11,
+        CaseEnum.case12,
+    ]:
+        simple_schema = infer_schema([case.json])
+        assert deserialize([case.json], simple_schema) == [case.item]
+
+
+def test_infer_schema_from_items():
+    items = [
+        {
+            "pk": "pk1",
+            "price": 9,
+            "qty": decimal.Decimal("3"),
+            "tags": {"a", "b"},
+            "empty_tags": frozenset(),
+            "a_bin": b"hello",
+            "a_bool": True,
+            "a_list": [1, 2.5],
+            "a_map": {"a_list": [[1]], "a_null": None},
+        },
+        {
+            "pk": "pk2",
+            "price": 9.99,
+            "a_null": None,
+            "a_empty_list": [],
+            "a_map": {"a_str": "alice"},
+        },
+    ]
+    expected = {
+        "pk": String(),
+        "price": Float(),
+        "qty": Integer(),
+        "tags": Set(String()),
+        "empty_tags": Set(String()),
+        "a_bin": Binary(),
+        "a_bool": Bool(),
+        "a_list": List(Float()),
+        "a_map": Struct(
+            {
+                "a_list": List(List(Integer())),
+                "a_null": Null(),
+                "a_str": String(),
+            }
+        ),
+        "a_null": Null(),
+        "a_empty_list": List(Null()),
+    }
+    assert infer_schema_from_items(items) == expected
+    assert infer_schema_from_items(items, sample=1)["price"] == Integer()
+    assert infer_schema_from_items([]) == {}
+
+    with pytest.raises(ValueError):
+        infer_schema_from_items([{"a": {"b": "1"}}, {"a": {"b": 1}}])
+    with pytest.raises(TypeError):
+        infer_schema_from_items([{"a": object()}])
+
+
+def test_infer_schema_from_items_round_trip():
+    for case in [
+        CaseEnum.case1,
+        CaseEnum.case10,
+        CaseEnum.case11,
+    ]:
+        simple_schema = infer_schema_from_items([case.item])
+        assert serialize([case.item], simple_schema) == [case.json]
+
+    # Python set and frozenset
+    items = [
+        {
+            "pk": "a",
+            "tags": {"y", "x"},
+            "nums": frozenset([2, 1]),
+            "nested": {"l": [{"s": {b"b", b"a"}}]},
+        },
+        {"pk": "b", "tags": set(), "nums": None, "nested": None},
+    ]
+    simple_schema = infer_schema_from_items(items)
+    assert simple_schema["tags"] == Set(String())
+    res = serialize(items, simple_schema)
+    assert res[0]["tags"] == {"SS": ["x", "y"]}
+    assert res[0]["nums"] == {"NS": ["1", "2"]}
+    assert res[0]["nested"]["M"]["l"]["L"][0]["M"]["s"] == {"BS": ["YQ==", "Yg=="]}
+    assert res[1]["tags"] == {"SS": []}
+    assert items[0]["tags"] == {"y", "x"}  # the input is not changed
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.infer", preview=False)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import polars as pl
+
+from fast_dynamodb_json.output import to_output, to_columns
+from fast_dynamodb_json.serialize import serialize, serialize_to_arrow
+from fast_dynamodb_json.deserialize import deserialize, deserialize_to_arrow
+from fast_dynamodb_json.tests.case import CaseEnum
+
+
+def test_to_output():
+    df = pl.DataFrame({"a": [1, 2]})
+    assert to_output(df, "dicts") == [{"a": 1}, {"a": 2}]
+    assert to_output(df, "polars") is df
+    with pytest.raises(ValueError):
+        to_output(df, "pandas")
+
+
+def test_output_polars():
+    case = CaseEnum.case109
+    df = deserialize([case.json], case.simple_schema, output="polars")
+    assert isinstance(df, pl.DataFrame)
+    assert df.to_dicts() == [case.item]
+    df = serialize([case.item], case.simple_schema, output="polars")
+    assert isinstance(df, pl.DataFrame)
+    assert df.to_dicts() == [case.json]
+
+
+def test_output_arrow():
+    pa = pytest.importorskip("pyarrow")
+    case = CaseEnum.case109
+    table = deserialize_to_arrow([case.json], case.simple_schema)
+    assert isinstance(table, pa.Table)
+    assert table.to_pylist() == [case.item]
+    table = serialize_to_arrow([case.item], case.simple_schema)
+    assert isinstance(table, pa.Table)
+    assert pl.from_arrow(table).to_dicts() == [case.json]
+
+
+def test_to_columns():
+    df = pl.DataFrame(
+        {
+            "tags": [["a"], ["b", "c"]],
+            "name": ["alice", None],
+            "age": [1, None],
+        }
+    )
+    assert to_columns(df) == {
+        "tags": [["a"], ["b", "c"]],
+        "name": ["alice", None],
+        "age": [1, None],
+    }
+
+
+def test_output_columns():
+    np = pytest.importorskip("numpy")
+    case = CaseEnum.case109
+    columns = deserialize([case.json, case.json], case.simple_schema, output="columns")
+    assert set(columns) == set(case.simple_schema)
+    df = pl.DataFrame({"n": [1, 2, 3], "f": [1.5, 2.5, 3.5], "b": [True, False, True]})
+    columns = to_columns(df)
+    for name in ["n", "f", "b"]:
+        assert isinstance(columns[name], np.ndarray)
+    assert columns["n"].tolist() == [1, 2, 3]
+    # zero-copy view of the polars buffer
+    assert not columns["n"].flags.writeable
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.output", preview=False)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+from fast_dynamodb_json.schema import String, Integer
+from fast_dynamodb_json.pages import deserialize_pages
+from fast_dynamodb_json.tests.fake_dynamodb import make_pages
+
+simple_schema = {"pk": String(), "n": Integer()}
+items = [{"pk": {"S": f"pk{i}"}, "n": {"N": str(i)}} for i in range(25)]
+
+
+def test_deserialize_pages():
+    pages = make_pages(items, page_size=4)
+    batches = list(deserialize_pages(iter(pages), simple_schema, target_rows=10))
+    assert [len(batch.data) for batch in batches] == [12, 12, 1]
+    assert [batch.n_pages for batch in batches] == [3, 3, 1]
+    assert [batch.count for batch in batches] == [12, 12, 1]
+    assert [batch.scanned_count for batch in batches] == [12, 12, 1]
+    assert [batch.last_evaluated_key for batch in batches] == [
+        {"pk": {"S": "pk11"}},
+        {"pk": {"S": "pk23"}},
+        None,
+    ]
+    assert [batch.is_last for batch in batches] == [False, False, True]
+    assert [row["n"] for batch in batches for row in batch.data] == list(range(25))
+
+    # resume from the checkpoint
+    start = int(batches[0].last_evaluated_key["pk"]["S"][2:]) + 1
+    batches = list(
+        deserialize_pages(
+            make_pages(items[start:], page_size=4),
+            simple_schema,
+            paths=["n"],
+            output="polars",
+        )
+    )
+    assert len(batches) == 1
+    assert batches[0].data["n"].to_list() == list(range(12, 25))
+
+    # empty result still has one page
+    batches = list(deserialize_pages(make_pages([], page_size=4), simple_schema))
+    assert len(batches) == 1
+    assert batches[0].data == []
+    assert list(deserialize_pages([], simple_schema)) == []
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.pages", preview=False)
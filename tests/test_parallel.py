@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+from fast_dynamodb_json.schema import Integer
+from fast_dynamodb_json.parallel import deserialize_parallel
+from fast_dynamodb_json.deserialize import deserialize
+from fast_dynamodb_json.tests.case import CaseEnum
+
+
+def test_deserialize_parallel():
+    case = CaseEnum.case109
+    records = [case.json] * 10
+    df = deserialize_parallel(records, case.simple_schema, workers=2, chunk_size=3)
+    assert df.to_dicts() == deserialize(records, case.simple_schema)
+
+    assert deserialize_parallel(
+        iter(records), case.simple_schema, workers=1, output="dicts"
+    ) == [case.item] * 10
+    assert deserialize_parallel([], case.simple_schema, workers=1).height == 0
+
+    # more chunks than the in flight limit, the order is kept
+    records = ({"n": {"N": str(i)}} for i in range(10))
+    df = deserialize_parallel(records, {"n": Integer()}, workers=1, chunk_size=1)
+    assert df["n"].to_list() == list(range(10))
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.parallel", preview=False)
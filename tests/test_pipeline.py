@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+import time
+import random
+
+import pytest
+import polars as pl
+
+from fast_dynamodb_json.paths import dir_tmp
+from fast_dynamodb_json.schema import String, Integer
+from fast_dynamodb_json.export import get_data_file_paths
+from fast_dynamodb_json.pipeline import Stage, run_pipeline, deserialize_files
+from fast_dynamodb_json.tests.mock_export import create_full_export
+
+
+def test_run_pipeline():
+    def slow(x):
+        time.sleep(random.random() / 100)
+        return x
+
+    stages = [
+        Stage(slow, workers=3),
+        Stage(lambda x: x * 2, workers=2),
+    ]
+    assert list(run_pipeline(range(20), stages)) == [i * 2 for i in range(20)]
+    assert sorted(run_pipeline(range(20), stages, ordered=False)) == [
+        i * 2 for i in range(20)
+    ]
+
+    def fail(x):
+        if x == 5:
+            raise ZeroDivisionError
+        return x
+
+    with pytest.raises(ZeroDivisionError):
+        list(run_pipeline(range(20), [Stage(fail, workers=2)], queue_size=1))
+
+    def failing_inputs():
+        yield 1
+        yield 2
+        raise OSError("can't list the files")
+
+    for ordered in [True, False]:
+        with pytest.raises(OSError):
+            list(run_pipeline(failing_inputs(), stages, ordered=ordered))
+
+    with pytest.raises(ValueError):
+        list(run_pipeline(range(20), []))
+
+
+def test_run_pipeline_ordered_backpressure():
+    # the first item is slow, the others can't pile up in the buffer
+    fed = list()
+
+    def inputs():
+        for i in range(100):
+            fed.append(i)
+            yield i
+
+    def slow_first(x):
+        if x == 0:
+            time.sleep(0.3)
+        return x
+
+    queue_size = 1
+    stages = [Stage(slow_first, workers=2)]
+    max_pending = queue_size * (len(stages) + 1) + 2
+    results = run_pipeline(inputs(), stages, queue_size=queue_size)
+    assert next(results) == 0
+    # one more item can be fed after the slow one is yielded
+    assert len(fed) <= max_pending + 1
+    assert list(results) == list(range(1, 100))
+
+
+def test_deserialize_files():
+    simple_schema = {"pk": String(), "n": Integer()}
+    records = [{"pk": {"S": f"pk{i}"}, "n": {"N": str(i)}} for i in range(10)]
+    export_dir = dir_tmp / "test_deserialize_files"
+    create_full_export(export_dir, records, n_files=3)
+    paths = get_data_file_paths(export_dir)
+
+    results = list(deserialize_files(paths, simple_schema))
+    assert [path for path, _ in results] == paths
+    df = pl.concat([df for _, df in results]).sort("n")
+    assert df.to_dicts() == [{"pk": f"pk{i}", "n": i} for i in range(10)]
+
+    def write(path, df):
+        return df.height
+
+    results = list(deserialize_files(paths, simple_schema, write=write, ordered=False))
+    assert sum(height for _, height in results) == 10
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.pipeline", preview=False)
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+from fast_dynamodb_json.schema import String, Integer
+from fast_dynamodb_json.scan import iter_scan_pages, parallel_scan
+from fast_dynamodb_json.tests.fake_dynamodb import FakeDynamoDBClient
+
+simple_schema = {"pk": String(), "n": Integer()}
+items = [{"pk": {"S": f"pk{i}"}, "n": {"N": str(i)}} for i in range(100)]
+
+
+def test_iter_scan_pages():
+    client = FakeDynamoDBClient(items, page_size=30)
+    pages = list(iter_scan_pages(client, "my-table"))
+    assert [page["Count"] for page in pages] == [30, 30, 30, 10]
+    assert client.scan_calls[1]["ExclusiveStartKey"] == {"pk": {"S": "pk29"}}
+
+
+def test_parallel_scan():
+    client = FakeDynamoDBClient(items, page_size=7)
+    res = parallel_scan(
+        client,
+        "my-table",
+        simple_schema,
+        total_segments=4,
+        target_rows=10,
+        scan_kwargs={"ConsistentRead": True},
+    )
+    assert sorted(res.df["n"].to_list()) == list(range(100))
+    assert [m.segment for m in res.metrics] == [0, 1, 2, 3]
+    assert [m.count for m in res.metrics] == [25, 25, 25, 25]
+    assert [m.n_pages for m in res.metrics] == [4, 4, 4, 4]
+    assert all(m.items_per_second > 0 for m in res.metrics)
+    assert all(call["ConsistentRead"] for call in client.scan_calls)
+    assert {call["TotalSegments"] for call in client.scan_calls} == {4}
+
+    res = parallel_scan(client, "my-table", simple_schema, paths=["n"])
+    assert res.df.columns == ["n"]
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.scan", preview=False)
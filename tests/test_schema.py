@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import pickle
+import dataclasses
+
+import pytest
 import polars as pl
 from fast_dynamodb_json.schema import (
     Integer,
@@ -11,7 +15,9 @@ from fast_dynamodb_json.schema import (
     Set,
     List,
     Struct,
+    select_paths,
 )
+from fast_dynamodb_json.sentinel import NOTHING
 
 
 def test():
@@ -191,6 +197,116 @@ def test():
     )
 
 
+def test_hashable():
+    def make_type():
+        return Struct(
+            {
+                "a_int": Integer(default_for_null=0),
+                "a_list": List(String()),
+                "a_set": Set(Binary()),
+                "a_struct": Struct({"a_bool": Bool(), "a_null": Null()}),
+            }
+        )
+
+    type1 = make_type()
+    type2 = make_type()
+    assert type1 is not type2
+    assert type1 == type2
+    assert hash(type1) == hash(type2)
+    assert type1.fingerprint == type2.fingerprint
+    assert len({type1, type2}) == 1
+    assert {type1: 1}[type2] == 1
+
+    # the fingerprint is the same across processes
+    assert Integer().fingerprint == (
+        "ed3d5a72986e964067e59c3378dd581e3167450cdfcfc75ef2c553a31deb3557"
+    )
+    assert pickle.loads(pickle.dumps(String())).fingerprint == String().fingerprint
+    # the NOTHING default is pickled by reference
+    assert pickle.loads(pickle.dumps(type1)) == type1
+    assert pickle.loads(pickle.dumps(Integer())).default_for_null is NOTHING
+
+    assert Integer() != Float()
+    assert Integer() != Integer(default_for_null=0)
+    assert Integer(default_for_null=0) != Integer(default_for_null=0.0)
+    assert List(String()) != Set(String())
+    assert Struct({"a": String(), "b": String()}) != Struct(
+        {"b": String(), "a": String()}
+    )
+
+    # immutable
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        type1.types = {}
+    types = {"a": String()}
+    struct = Struct(types)
+    fingerprint = struct.fingerprint
+    types["b"] = String()
+    assert struct.types == {"a": String()}
+    assert struct.fingerprint == fingerprint
+    with pytest.raises(TypeError):
+        struct.types["b"] = Integer()
+    list_type = List(Struct({"a": String()}), default_for_null=[{"a": "x"}])
+    assert list_type.default_for_null == ({"a": "x"},)
+    with pytest.raises(AttributeError):
+        list_type.default_for_null.append({"a": "y"})
+    with pytest.raises(TypeError):
+        list_type.default_for_null[0]["a"] = "y"
+    assert Set(String()).default_for_null == ()
+    set_type = Set(String(), default_for_null={"c", "a", "b"})
+    assert set_type.default_for_null == ("a", "b", "c")
+    assert set_type == Set(String(), default_for_null=["a", "b", "c"])
+    # the same across processes, whatever the PYTHONHASHSEED
+    assert set_type.fingerprint == (
+        "b792c2619dcf567f20cd25edbe46cb3a115fa73608af1f2db0e15574c224cf59"
+    )
+    assert pickle.loads(pickle.dumps(list_type)) == list_type
+
+
+def test_select_paths():
+    simple_schema = {
+        "OrderID": String(),
+        "Status": String(),
+        "ShippingAddress": Struct({"City": String(), "ZipCode": String()}),
+        "Items": List(
+            Struct({"Name": String(), "Price": Float()}),
+            default_for_null=[{"Name": "NA", "Price": 0.0}],
+        ),
+        "Matrix": List(List(Struct({"a": Integer(), "b": Integer()}))),
+    }
+    assert select_paths(
+        simple_schema,
+        ["Items[].Price", "ShippingAddress.City", "OrderID"],
+    ) == {
+        "OrderID": String(),
+        "ShippingAddress": Struct({"City": String()}),
+        "Items": List(
+            Struct({"Price": Float()}),
+            default_for_null=[{"Name": "NA", "Price": 0.0}],
+        ),
+    }
+    assert select_paths(simple_schema, ["Matrix[][].b", "ShippingAddress"]) == {
+        "ShippingAddress": Struct({"City": String(), "ZipCode": String()}),
+        "Matrix": List(List(Struct({"b": Integer()}))),
+    }
+    # select the whole value and a part of it
+    assert select_paths(simple_schema, ["Items", "Items[].Name"]) == {
+        "Items": simple_schema["Items"],
+    }
+
+    with pytest.raises(ValueError):
+        select_paths(simple_schema, [])
+    with pytest.raises(ValueError):
+        select_paths(simple_schema, ["NotExists"])
+    with pytest.raises(ValueError):
+        select_paths(simple_schema, ["ShippingAddress.NotExists"])
+    with pytest.raises(ValueError):
+        select_paths(simple_schema, ["Items.Price"])
+    with pytest.raises(ValueError):
+        select_paths(simple_schema, ["OrderID.Name"])
+    with pytest.raises(ValueError):
+        select_paths(simple_schema, ["Items..Price"])
+
+
 if __name__ == "__main__":
     from fast_dynamodb_json.tests import run_cov_test
 
@@ -1,5 +1,30 @@
 # -*- coding: utf-8 -*-
 
+import gzip
+import json
+
+import pytest
+import polars as pl
+
+from fast_dynamodb_json.compiled import compile_schema
+from fast_dynamodb_json.paths import dir_tmp
+from fast_dynamodb_json.schema import (
+    String,
+    Integer,
+    Float,
+    Bool,
+    Null,
+    Set,
+    List,
+    Struct,
+)
+from fast_dynamodb_json.serialize import (
+    serialize,
+    serialize_df,
+    serialize_lazy,
+    iter_serialize,
+    serialize_to_ndjson,
+)
 from fast_dynamodb_json.tests.case import CaseEnum
 
 
@@ -16,6 +41,164 @@ def test():
     CaseEnum.case109.test_serialize()
 
 
+def test_serialize_lazy():
+    case = CaseEnum.case109
+    lf = pl.LazyFrame(
+        {"Data": [case.item]},
+        schema={"Data": compile_schema(case.simple_schema).polars_struct},
+    ).pipe(serialize_lazy, case.simple_schema)
+    assert isinstance(lf, pl.LazyFrame)
+    assert lf.collect().to_dicts() == [case.json]
+
+
+def test_iter_serialize():
+    case = CaseEnum.case109
+    items = (case.item for _ in range(3))
+    chunks = list(iter_serialize(items, case.simple_schema, chunk_size=2))
+    assert chunks == [[case.json, case.json], [case.json]]
+    items = (case.item for _ in range(3))
+    rows = list(iter_serialize(items, case.simple_schema, chunk_size=2, per_row=True))
+    assert rows == [case.json] * 3
+
+
+def test_serialize_to_ndjson():
+    case = CaseEnum.case109
+    items = [case.item] * 5
+
+    def loads(data: bytes):
+        return [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+    data = serialize_to_ndjson(items, case.simple_schema, wrap_item=False)
+    assert loads(data) == [case.json] * 5
+
+    # multi member gzip file
+    data = serialize_to_ndjson(
+        items,
+        case.simple_schema,
+        compression="gzip",
+        chunk_size=2,
+    )
+    assert loads(gzip.decompress(data)) == [{"Item": case.json}] * 5
+
+    # DataFrame input, write to path, the other columns are not written
+    df = pl.DataFrame(
+        {"id": list(range(5)), "Data": items},
+        schema={
+            "id": pl.Int64,
+            "Data": compile_schema(case.simple_schema).polars_struct,
+        },
+    )
+    path = dir_tmp.joinpath("serialize_to_ndjson.json.gz")
+    assert (
+        serialize_to_ndjson(df, case.simple_schema, file=path, compression="gzip")
+        is None
+    )
+    assert loads(gzip.decompress(path.read_bytes())) == [{"Item": case.json}] * 5
+
+
+def test_null_policy():
+    simple_schema = {
+        "pk": String(),
+        "n": Integer(),
+        "l": List(Integer()),
+        "nil": Null(),
+    }
+    records = [
+        {"pk": "a", "n": 1, "l": None},
+        {"pk": "b", "n": None, "l": [1]},
+        {"pk": "c", "n": 2, "l": None},
+    ]
+    assert serialize(records, simple_schema, null_policy="omit") == [
+        {"pk": {"S": "a"}, "n": {"N": "1"}, "nil": {"NULL": True}},
+        {"pk": {"S": "b"}, "l": {"L": [{"N": "1"}]}, "nil": {"NULL": True}},
+        {"pk": {"S": "c"}, "n": {"N": "2"}, "nil": {"NULL": True}},
+    ]
+    assert serialize(records, simple_schema, null_policy="null")[0] == {
+        "pk": {"S": "a"},
+        "n": {"N": "1"},
+        "l": {"NULL": True},
+        "nil": {"NULL": True},
+    }
+    assert serialize(records, simple_schema)[0]["l"] == {"L": []}
+
+    df = pl.DataFrame(
+        {"Data": records},
+        schema={"Data": compile_schema(simple_schema).polars_struct},
+    )
+    df = serialize_df(df, simple_schema, null_policy="omit")
+    assert df["n"].to_list() == [{"N": "1"}, None, {"N": "2"}]
+
+    rows = list(
+        iter_serialize(records, simple_schema, per_row=True, null_policy="omit")
+    )
+    assert [list(row) for row in rows] == [
+        ["pk", "n", "nil"],
+        ["pk", "l", "nil"],
+        ["pk", "n", "nil"],
+    ]
+
+    with pytest.raises(ValueError):
+        serialize(records, simple_schema, null_policy="drop")
+
+
+def test_null_without_default():
+    # Integer, Float and Bool don't have default_for_null
+    simple_schema = {
+        "pk": String(),
+        "n": Integer(),
+        "b": Bool(),
+        "l": List(Integer()),
+        "m": Struct({"f": Float(), "s": String()}),
+        "ns": Set(Integer()),
+    }
+    records = [
+        {
+            "pk": "a",
+            "n": None,
+            "b": None,
+            "l": [1, None],
+            "m": {"f": None, "s": None},
+            "ns": [1, None],
+        },
+        {
+            "pk": "b",
+            "n": 1,
+            "b": True,
+            "l": [],
+            "m": {"f": 1.5, "s": "x"},
+            "ns": [2],
+        },
+    ]
+    item = {
+        "pk": {"S": "a"},
+        "n": {"NULL": True},
+        "b": {"NULL": True},
+        "l": {"L": [{"N": "1"}, {"NULL": True}]},
+        "m": {"M": {"f": {"NULL": True}, "s": {"S": ""}}},
+        "ns": {"NS": ["1"]},
+    }
+    valid_item = {
+        "pk": {"S": "b"},
+        "n": {"N": "1"},
+        "b": {"BOOL": True},
+        "l": {"L": []},
+        "m": {"M": {"f": {"N": "1.5"}, "s": {"S": "x"}}},
+        "ns": {"NS": ["2"]},
+    }
+    assert serialize(records, simple_schema) == [item, valid_item]
+    assert serialize(records, simple_schema, null_policy="null") == [item, valid_item]
+    item.pop("n")
+    item.pop("b")
+    assert serialize(records, simple_schema, null_policy="omit") == [item, valid_item]
+
+    data = serialize_to_ndjson(records, simple_schema, wrap_item=False)
+    lines = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+    assert lines[0]["n"] == {"NULL": True}
+    assert lines[0]["l"] == {"L": [{"N": "1"}, {"NULL": True}]}
+    assert lines[0]["m"] == {"M": {"f": {"NULL": True}, "s": {"S": ""}}}
+    assert lines[1] == valid_item
+
+
 if __name__ == "__main__":
     from fast_dynamodb_json.tests import run_cov_test
 
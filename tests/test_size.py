@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import polars as pl
+
+from fast_dynamodb_json.schema import (
+    Integer,
+    Float,
+    String,
+    Binary,
+    Bool,
+    Set,
+    List,
+    Struct,
+)
+from fast_dynamodb_json.serialize import serialize
+from fast_dynamodb_json.compiled import compile_schema
+from fast_dynamodb_json.size import get_item_size_selector, item_size
+
+
+def test_get_item_size_selector():
+    simple_schema = {
+        "pk": String(),
+        "n": Integer(),
+        "f": Float(),
+        "b": Binary(),
+        "ok": Bool(),
+        "ss": Set(String()),
+        "l": List(Integer()),
+        "m": Struct({"a": Integer(), "bb": String()}),
+    }
+    item = {
+        "pk": "héllo",  # 2 + 6
+        "n": -12300,  # 1 + (2 + 1 + 1)
+        "f": 0.5,  # 1 + (1 + 1)
+        "b": b"abcd",  # 1 + 4
+        "ok": True,  # 2 + 1
+        "ss": ["a", "bc"],  # 2 + (1 + 2)
+        "l": [1, 22, 333],  # 1 + 3 + (1 + 2) + (1 + 2) + (1 + 3)
+        "m": {"a": 1, "bb": "x"},  # 1 + 3 + (1 + 1 + 2) + (2 + 1 + 1)
+    }
+    df = serialize([item], simple_schema, output="polars")
+    assert df.select(get_item_size_selector(simple_schema)).item() == 55
+
+    # the size of the null attributes depends on the null policy
+    simple_schema = {"pk": String(), "n": Integer(), "s": String()}
+    records = [{"pk": "a", "n": None, "s": None}]
+    for null_policy, size in [
+        # n is {"NULL": true} because Integer has no default, s is {"S": ""}
+        ("default", 3 + 2 + 1),
+        # both are dropped
+        ("omit", 3),
+        # both are {"NULL": true}
+        ("null", 3 + 2 + 2),
+    ]:
+        df = serialize(
+            records,
+            simple_schema,
+            output="polars",
+            null_policy=null_policy,
+        )
+        selector = get_item_size_selector(simple_schema, null_policy=null_policy)
+        assert df.select(selector).item() == size
+
+    # nested null values without default are {"NULL": true}
+    simple_schema = {"l": List(Integer()), "m": Struct({"a": Integer()})}
+    records = [{"l": [None], "m": {"a": None}}]
+    df = serialize(records, simple_schema, output="polars")
+    # (1 + 3 + 1 + 1) + (1 + 3 + (1 + 1 + 1))
+    assert df.select(get_item_size_selector(simple_schema)).item() == 13
+
+
+def test_item_size():
+    simple_schema = {"pk": String(), "data": String()}
+    records = [
+        {"pk": "a", "data": "x"},  # 3 + 5 = 8
+        {"pk": "b", "data": "x" * 4088},  # 3 + 4 + 4088 = 4095
+        {"pk": "c", "data": "x" * 4089},  # 3 + 4 + 4089 = 4096
+        {"pk": "d", "data": "x" * 4090},  # 3 + 4 + 4090 = 4097
+    ]
+    df = pl.DataFrame(
+        {"id": [1, 2, 3, 4], "Data": records},
+        schema={"id": pl.Int64, "Data": compile_schema(simple_schema).polars_struct},
+    )
+    res = item_size(df, simple_schema)
+    assert res.columns == ["id", "ItemSize", "ReadCapacityUnits", "WriteCapacityUnits"]
+    assert res["ItemSize"].to_list() == [8, 4095, 4096, 4097]
+    assert res["ReadCapacityUnits"].to_list() == [1, 1, 1, 2]
+    assert res["WriteCapacityUnits"].to_list() == [1, 4, 4, 5]
+
+    lf = item_size(df.lazy(), simple_schema)
+    assert lf.select(pl.col("WriteCapacityUnits").sum()).collect().item() == 14
+
+    df = pl.DataFrame(
+        {"Data": [{"pk": "a", "data": None}]},
+        schema={"Data": compile_schema(simple_schema).polars_struct},
+    )
+    assert item_size(df, simple_schema)["ItemSize"].to_list() == [3 + 4]
+    assert item_size(df, simple_schema, null_policy="omit")["ItemSize"].item() == 3
+    assert item_size(df, simple_schema, null_policy="null")["ItemSize"].item() == 8
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.size", preview=False)
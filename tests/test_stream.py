@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import json
+import base64
+
+import polars as pl
+
+from fast_dynamodb_json.schema import Integer, String, List
+from fast_dynamodb_json.stream import (
+    deserialize_stream_records,
+    deserialize_kinesis_records,
+)
+
+simple_schema = {
+    "pk": String(),
+    "sk": String(),
+    "value": Integer(),
+    "tags": List(String()),
+}
+
+
+def image(pk: str, sk: str, value: int):
+    return {
+        "pk": {"S": pk},
+        "sk": {"S": sk},
+        "value": {"N": str(value)},
+        "tags": {"L": [{"S": "a"}]},
+    }
+
+
+def make_record(
+    event_name: str,
+    sequence_number: str,
+    pk: str,
+    sk: str,
+    new_value: int = None,
+    old_value: int = None,
+):
+    dynamodb = {
+        "ApproximateCreationDateTime": 1479499740,
+        "Keys": {"pk": {"S": pk}, "sk": {"S": sk}},
+        "SequenceNumber": sequence_number,
+        "SizeBytes": 26,
+        "StreamViewType": "NEW_AND_OLD_IMAGES",
+    }
+    if new_value is not None:
+        dynamodb["NewImage"] = image(pk, sk, new_value)
+    if old_value is not None:
+        dynamodb["OldImage"] = image(pk, sk, old_value)
+    return {
+        "eventID": f"event-{sequence_number}",
+        "eventName": event_name,
+        "eventVersion": "1.1",
+        "eventSource": "aws:dynamodb",
+        "awsRegion": "us-east-1",
+        "dynamodb": dynamodb,
+        "eventSourceARN": "arn:aws:dynamodb:us-east-1:111122223333:table/test/stream/2015-06-27T00:48:05.899",
+    }
+
+
+records = [
+    make_record("INSERT", "111", "pk1", "sk1", new_value=1),
+    make_record("MODIFY", "99", "pk1", "sk1", new_value=0),  # older
+    make_record("INSERT", "112", "pk1", "sk2", new_value=2),
+    make_record("MODIFY", "1000", "pk1", "sk1", new_value=11, old_value=1),
+    make_record("REMOVE", "1001", "pk1", "sk2", old_value=2),
+]
+
+
+def test_deserialize_stream_records():
+    df = deserialize_stream_records(records, simple_schema, ["pk", "sk"])
+    assert df.columns == [
+        "eventID",
+        "eventName",
+        "SequenceNumber",
+        "ApproximateCreationDateTime",
+        "SizeBytes",
+        "Keys",
+        "NewImage",
+        "OldImage",
+    ]
+    assert df.height == 5
+    row = df.row(3, named=True)
+    assert row["eventName"] == "MODIFY"
+    assert row["Keys"] == {"pk": "pk1", "sk": "sk1"}
+    assert row["NewImage"] == {"pk": "pk1", "sk": "sk1", "value": 11, "tags": ["a"]}
+    assert row["OldImage"] == {"pk": "pk1", "sk": "sk1", "value": 1, "tags": ["a"]}
+    row = df.row(4, named=True)
+    assert row["NewImage"] is None
+
+    df = deserialize_stream_records(
+        iter(records),
+        simple_schema,
+        ["pk", "sk"],
+        latest_only=True,
+    )
+    assert df.select("SequenceNumber", "eventName").rows() == [
+        ("1000", "MODIFY"),
+        ("1001", "REMOVE"),
+    ]
+
+
+def to_kinesis_payload(record: dict, ts: int) -> bytes:
+    record = copy.deepcopy(record)
+    record["recordFormat"] = "application/json"
+    record["tableName"] = "test"
+    record["dynamodb"].pop("SequenceNumber")
+    record["dynamodb"].pop("StreamViewType")
+    record["dynamodb"]["ApproximateCreationDateTime"] = ts
+    return base64.b64encode(json.dumps(record).encode("utf-8"))
+
+
+def test_deserialize_kinesis_records():
+    data = [
+        to_kinesis_payload(record, ts)
+        for record, ts in zip(records, [1000, 1000, 1001, 1002, 1003])
+    ]
+    df = deserialize_kinesis_records(data, simple_schema, ["pk", "sk"])
+    assert "SequenceNumber" not in df.columns
+    assert df.height == 5
+    assert df.row(3, named=True)["NewImage"] == {
+        "pk": "pk1",
+        "sk": "sk1",
+        "value": 11,
+        "tags": ["a"],
+    }
+    assert df.row(4, named=True)["NewImage"] is None
+
+    # str payloads, as in the Lambda event
+    df = deserialize_kinesis_records(
+        [payload.decode("utf-8") for payload in data[:2]],
+        simple_schema,
+        ["pk", "sk"],
+        latest_only=True,
+    )
+    # same timestamp, the later one in the batch wins
+    assert df.select("eventID").to_series().to_list() == ["event-99"]
+    assert df.row(0, named=True)["NewImage"]["value"] == 0
+
+    # empty batch
+    for data in [[], pl.Series([], dtype=pl.Utf8)]:
+        df = deserialize_kinesis_records(data, simple_schema, ["pk", "sk"])
+        assert df.height == 0
+        assert "NewImage" in df.columns
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.stream", preview=False)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+
+import pytest
+
+from fast_dynamodb_json.utils import iter_chunks, compress
+
+
+def test_iter_chunks():
+    assert list(iter_chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_chunks(iter(range(4)), 2)) == [[0, 1], [2, 3]]
+    assert list(iter_chunks([], 2)) == []
+    with pytest.raises(ValueError):
+        list(iter_chunks(range(5), 0))
+
+
+def test_compress():
+    assert compress(b"hello") == b"hello"
+    data = compress(b"hello", "gzip") + compress(b" world", "gzip")
+    assert gzip.decompress(data) == b"hello world"
+    with pytest.raises(ValueError):
+        compress(b"hello", "bz2")
+
+
+def test_compress_zstd():
+    zstandard = pytest.importorskip("zstandard")
+    data = compress(b"hello", "zstd") + compress(b" world", "zstd")
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        data, read_across_frames=True
+    )
+    assert reader.read() == b"hello world"
+
+
+if __name__ == "__main__":
+    from fast_dynamodb_json.tests import run_cov_test
+
+    run_cov_test(__file__, "fast_dynamodb_json.utils", preview=False)